@@ -8,16 +8,21 @@ import os
 import math
 import RPi.GPIO as GPIO
 from rpi_ws281x import *
-import board
-import busio
 import warnings
 from PIL import Image, ImageDraw
-import adafruit_ssd1306
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from modules.sprite_assets import load_spinner_animation
+from modules.frame_clock import FrameClock
 from modules.digit_display import show_exp_x_display
+from modules.oled_display import PartialRefreshDisplay, DisplayPipeline, create_oled
+from modules.page_canvas import PageCanvas
+from modules.led_strip import create_strip
+from modules.led_engine import LEDEngine
+from modules.quantum_deadline import DeadlineExecutor, SOURCE_QUANTUM, SOURCE_LABELS
+from modules.quantum_scheduler import get_scheduler, run_circuit_job, PRIORITY_INTERACTIVE
 from modules.hardware_config import PINS, LED_CONFIG, OLED_CONFIG, ANIMATION_CONFIG, TIMING_CONFIG
 from qiskit import QuantumCircuit, execute, Aer
 from qiskit.circuit.library import HGate
@@ -38,50 +43,46 @@ BUTTON_PIN     = PINS['BUTTON_CALC']  # GPIO 26 for button input
 # Suppress I2C frequency warning
 warnings.filterwarnings("ignore", message="I2C frequency is not settable in python, ignoring!")
 
-# I2C pins for OLED (using centralized config)
-i2c = busio.I2C(scl=board.D3, sda=board.D2)
-
+# create_oled() opens the I2C panel, or a headless VirtualOLED when OLED_CONFIG['BACKEND'] = 'virtual'
 # OLED display dimensions
 WIDTH = OLED_CONFIG['WIDTH']
 HEIGHT = OLED_CONFIG['HEIGHT']
-display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c)
+# show() hands the frame to a flush thread; only changed pages/columns go over I2C
+display = DisplayPipeline(PartialRefreshDisplay(create_oled(WIDTH, HEIGHT)))
+page_canvas = PageCanvas(WIDTH, HEIGHT)  # Result screen, drawn in SSD1306 page format
 
 # --- Probability Configuration ---
 BLUE_PROBABILITY = 50    # Percentage chance for blue (1)
 RED_PROBABILITY = 100 - BLUE_PROBABILITY   # Percentage chance for red (0)
 
 # --- Animation settings ---
-SPRITE_SIZE = (64, 64)  # Size of each animation frame
-FRAMES = 30  # Number of frames in the animation
+SPRITE_SIZE = ANIMATION_CONFIG['SPRITE_SIZE']  # Size of each animation frame
+FRAMES = ANIMATION_CONFIG['FRAMES']  # Number of frames in the animation
 animation_frames = []  # Will store loaded animation frames
+spinner_frames = []    # Complete display frames in SSD1306 page format, composed once
 animation_loaded = False
 
+# --- Loop timing (absolute frame deadlines, stats printed on exit) ---
+spinner_clock = FrameClock(TIMING_CONFIG['DISPLAY_REFRESH_RATE'], "OLED spinner")
+toggle_clock = FrameClock(0.5, "LED color toggle")
+
 # --- Global Variables ---
 alternating = True       # Controls the alternating pattern
 current_color = 0        # 0 = Red, 1 = Blue
 
+# --- Quantum latency budget (falls back to classical random when exceeded) ---
+quantum_deadline = DeadlineExecutor(TIMING_CONFIG['QUANTUM_BUDGET'])
+
 def clear_strip(strip):
     """Turns OFF all LEDs on the strip."""
     print("\nClearing strip...")
-    for i in range(strip.numPixels()):
-        strip.setPixelColor(i, Color(0, 0, 0))
-    strip.show()
+    strip.fill(Color(0, 0, 0))
     time.sleep(0.5)
 
-def clear_display():
-    """Clear the OLED display"""
-    try:
-        display.fill(0)
-        display.show()
-    except Exception as e:
-        print(f"⚠️  OLED clear error: {e}")
-
-def light_color(strip, color, binary_value):
+def light_color(engine, color, binary_value):
     """Lights up the entire strip with a specific color."""
     print(f"Result: {binary_value} ({'Blue' if binary_value == 1 else 'Red'})")
-    for i in range(strip.numPixels()):
-        strip.setPixelColor(i, color)
-    strip.show()
+    engine.play('solid', color=color)
 
 def draw_color(strip, color_value):
     """Draws a color on the strip without printing."""
@@ -90,9 +91,7 @@ def draw_color(strip, color_value):
     else:
         color = Color(255, 0, 0)  # Red
     
-    for i in range(strip.numPixels()):
-        strip.setPixelColor(i, color)
-    strip.show()
+    strip.fill(color)
 
 def alternate_colors(strip):
     """Continuously alternates between red and blue."""
@@ -100,37 +99,19 @@ def alternate_colors(strip):
     
     print("Starting color alternation... Press the button (GPIO 26) to stop and enter quantum hadamard mode.")
     
+    toggle_clock.start()
     while alternating:
         draw_color(strip, current_color)
-        current_color = 1 - current_color  # Toggle between 0 and 1
-        time.sleep(0.5)  # Half second between changes
+        # Half second between changes; a skipped slot still counts as a toggle
+        if toggle_clock.tick() % 2:
+            current_color = 1 - current_color  # Toggle between 0 and 1
 
-def mixed_alternating_colors(strip):
+def mixed_alternating_colors(engine):
     """Different LEDs alternate in different orders creating a mixed pattern."""
-    global alternating
-    
     print("Starting mixed alternation... Press the button (GPIO 26) to stop and enter quantum hadamard mode.")
     
-    # Create different starting colors for each LED
-    led_colors = []
-    for i in range(strip.numPixels()):
-        # Even LEDs start with red (0), odd LEDs start with blue (1)
-        led_colors.append(i % 2)
-    
-    while alternating:
-        # Draw current pattern
-        for i in range(strip.numPixels()):
-            if led_colors[i] == 1:
-                strip.setPixelColor(i, Color(0, 0, 255))  # Blue
-            else:
-                strip.setPixelColor(i, Color(255, 0, 0))  # Red
-        
-        strip.show()
-        time.sleep(0.2)  # Slower - 0.2 seconds between changes
-        
-        # Toggle each LED's color
-        for i in range(strip.numPixels()):
-            led_colors[i] = 1 - led_colors[i]  # Toggle between 0 and 1
+    # The LED engine thread animates it (0.2 seconds between changes) until the next pattern
+    engine.play('alternating')
 
 def restart_alternation():
     """Restarts the alternation mode."""
@@ -138,55 +119,19 @@ def restart_alternation():
     alternating = True
 
 def load_animation_frames():
-    """Load animation frames from sprite sheet bitmap - optimized for faster startup"""
-    global animation_frames, animation_loaded
+    """Load the atom animation (compiled asset, or the sprite sheet if it is missing or stale)"""
+    global animation_frames, spinner_frames, animation_loaded
     
     if animation_loaded:
         return
     
     try:
-        # Load the sprite sheet bitmap
-        sprite_path = "./assets/icons/atom.bmp"
+        sprite_path = ANIMATION_CONFIG['ATOM_ICON_PATH']
         if os.path.exists(sprite_path):
-            sprite_sheet = Image.open(sprite_path)
-            
-            # Convert to 1-bit (monochrome) if not already
-            if sprite_sheet.mode != '1':
-                sprite_sheet = sprite_sheet.convert('1')
-            
-            # Extract individual frames from the sprite sheet
-            frame_width = SPRITE_SIZE[0]
-            frame_height = SPRITE_SIZE[1]
-            
-            # Calculate how many frames we can actually extract from the sprite sheet
-            available_frames = min(FRAMES, sprite_sheet.size[0] // frame_width)
+            # Sprites for the fallback drawing, complete page-format frames for the spinner
+            animation_frames, spinner_frames = load_spinner_animation('exp1', WIDTH, HEIGHT)
             
-            # Pre-calculate display size once
-            display_size = int(HEIGHT * 0.95)  # Make it 95% of display height (about 51 pixels)
-            
-            for i in range(available_frames):
-                # Calculate frame position in sprite sheet
-                x = i * frame_width
-                y = 0
-                
-                # Extract frame
-                frame_box = (x, y, x + frame_width, y + frame_height)
-                frame = sprite_sheet.crop(frame_box)
-                
-                # Make the atom bigger - resize to take up more of the display
-                frame = frame.resize((display_size, display_size), Image.NEAREST)
-                
-                animation_frames.append(frame)
-            
-            # If we have fewer frames than requested, duplicate frames to reach 30
-            if len(animation_frames) < FRAMES and len(animation_frames) > 0:
-                original_frames = animation_frames.copy()
-                while len(animation_frames) < FRAMES:
-                    # Add frames by cycling through original frames
-                    frame_to_add = original_frames[len(animation_frames) % len(original_frames)]
-                    animation_frames.append(frame_to_add)
-            
-            animation_loaded = True
+            animation_loaded = bool(animation_frames)
             print(f"✅ Loaded {len(animation_frames)} animation frames (requested {FRAMES})")
             
         else:
@@ -227,19 +172,8 @@ def draw_quantum_spinner(draw, frame):
         center_x = (WIDTH - frame_width) // 2   # Center horizontally on 128px width
         center_y = ((HEIGHT - frame_height) // 2) + 10  # Center vertically but shifted down for text
         
-        # Draw the frame pixel by pixel
-        frame_pixels = list(current_frame.getdata())
-        
-        for y in range(frame_height):
-            for x in range(frame_width):
-                pixel_index = y * frame_width + x
-                if pixel_index < len(frame_pixels):
-                    # If pixel is white/on (1), draw it on the display
-                    if frame_pixels[pixel_index]:
-                        draw_x = center_x + x
-                        draw_y = center_y + y
-                        if 0 <= draw_x < WIDTH and 0 <= draw_y < HEIGHT:
-                            draw.point((draw_x, draw_y), fill=255)
+        # Draw the lit pixels of the frame in one call
+        draw.bitmap((center_x, center_y), current_frame, fill=255)
     
     else:
         # Fallback to original spinning circle if bitmap loading failed
@@ -267,14 +201,11 @@ def draw_quantum_spinner(draw, frame):
                 # Dimmer trailing segments
                 draw.point((x2, y2), fill=255)
 
-def show_quantum_result(result_value):
+def show_quantum_result(result_value, source=SOURCE_QUANTUM):
     """Show the quantum measurement result on OLED display"""
     try:
-        image = Image.new("1", (WIDTH, HEIGHT))
-        draw = ImageDraw.Draw(image)
-        
-        # Clear the display
-        draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+        # Clear the page canvas (no new image, no conversion)
+        draw = page_canvas.begin()
         
         # Draw "EXP. 1" at the top
         exp_text = "EXP. 1"
@@ -282,8 +213,8 @@ def show_quantum_result(result_value):
         exp_x = (WIDTH - exp_width) // 2
         draw.text((exp_x, 5), exp_text, fill=255)
         
-        # Draw "QUANTUM RESULT:" in the middle
-        result_text = "QUANTUM RESULT:"
+        # Draw "QUANTUM RESULT:" in the middle (labeled with the fallback source otherwise)
+        result_text = f"{SOURCE_LABELS[source]} RESULT:"
         result_width = len(result_text) * 6
         result_x = (WIDTH - result_width) // 2
         draw.text((result_x, 25), result_text, fill=255)
@@ -304,7 +235,7 @@ def show_quantum_result(result_value):
         draw.text((color_x, 55), color_text, fill=255)
         
         # Update display
-        display.image(image)
+        display.frame(page_canvas.buffer)
         display.show()
         
         
@@ -334,42 +265,52 @@ def quantum_measurement_with_animation():
             image = Image.new("1", (WIDTH, HEIGHT))
             draw = ImageDraw.Draw(image)
             
+            if not animation_loaded:
+                load_animation_frames()
+            
+            spinner_clock.start()
             while animation_active:
-                # Clear and draw current frame
-                draw_quantum_spinner(draw, animation_frame)
-                
-                # Update display
-                display.image(image)
+                if spinner_frames:
+                    # Prerendered frame: nothing to draw, just hand it to the display
+                    display.frame(spinner_frames[animation_frame % len(spinner_frames)])
+                else:
+                    # Fallback spinner is drawn every frame
+                    draw_quantum_spinner(draw, animation_frame)
+                    display.image(image)
                 display.show()
                 
-                # Next frame
-                animation_frame += 1
-                
-                # Control frame rate (30 FPS)
-                time.sleep(1.0 / 30)
+                # Wait for the next 30 FPS deadline; frames run late are skipped
+                animation_frame += spinner_clock.tick()
         
         # Start animation thread
         animation_thread = threading.Thread(target=animate_while_executing)
         animation_thread.daemon = True
         animation_thread.start()
         
-        # Execute the quantum circuit (this is where the delay happens)
-        backend = Aer.get_backend('qasm_simulator')
-        job = execute(qc, backend, shots=1)
-        result = job.result()
-        counts = result.get_counts(qc)
+        def measure():
+            # Execute the quantum circuit (this is where the delay happens)
+            backend = Aer.get_backend('qasm_simulator')
+            counts = run_circuit_job(
+                lambda: execute(qc, backend, shots=1).result().get_counts(qc),
+                PRIORITY_INTERACTIVE)
+            
+            # Get the measurement result (0 or 1)
+            return int(list(counts.keys())[0])
+        
+        # Classical random is served if the simulator misses the latency budget
+        quantum_result, source = quantum_deadline.run(measure, lambda: random.randint(0, 1))
         
         # Stop animation immediately after quantum execution completes
         animation_active = False
         animation_thread.join(timeout=0.1)  # Wait briefly for thread to finish
         
-        # Get the measurement result (0 or 1)
-        quantum_result = int(list(counts.keys())[0])
-        
-        print(f"🔬 Quantum measurement: {quantum_result}")
+        if source == SOURCE_QUANTUM:
+            print(f"🔬 Quantum measurement: {quantum_result}")
+        else:
+            print(f"🎲 {SOURCE_LABELS[source].capitalize()} fallback result: {quantum_result}")
         
         # Show quantum result on OLED display
-        show_quantum_result(quantum_result)
+        show_quantum_result(quantum_result, source)
         
         if quantum_result == 1:
             return Color(0, 0, 255), 1  # Blue = 1
@@ -420,9 +361,14 @@ if __name__ == '__main__':
     GPIO.setmode(GPIO.BCM)
     GPIO.setup(BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
     
-    # Initialize LED strip
-    strip = Adafruit_NeoPixel(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
+    # Initialize LED strip (rpi_ws281x, or a recording VirtualStrip when LED_CONFIG['BACKEND'] = 'virtual';
+    # frames are written in bulk with gamma and brightness correction)
+    strip = create_strip()
     strip.begin()
+    
+    # One LED engine thread animates the strip for the whole run
+    led_engine = LEDEngine(strip)
+    led_engine.start()
 
     print('=== EXP. 1 - LED Quantum Hadamard System ===')
     print('🔌 Wiring Instructions:')
@@ -463,7 +409,10 @@ if __name__ == '__main__':
             button_thread.start()
             
             # Start mixed alternating colors (each LED alternates individually)
-            mixed_alternating_colors(strip)
+            mixed_alternating_colors(led_engine)
+            
+            # Wait for the button press that ends the alternation
+            button_thread.join()
             
             # After alternating stops, enter quantum hadamard mode immediately
             print("\n=== Quantum Hadamard Mode ===")
@@ -472,7 +421,7 @@ if __name__ == '__main__':
             color, binary_value = quantum_measurement_with_animation()
             
             # Light up the strip with the drawn color
-            light_color(strip, color, binary_value)
+            light_color(led_engine, color, binary_value)
             
             
             print("Press the button (GPIO 26) to restart alternation or Ctrl-C to exit.")
@@ -490,10 +439,18 @@ if __name__ == '__main__':
         pass
     
     finally:
+        # Report latency budget misses and circuit queue times for tuning
+        quantum_deadline.print_stats()
+        get_scheduler().print_stats()
+        for clock in (spinner_clock, toggle_clock):
+            clock.print_stats()
+        led_engine.print_stats()
         # Ensure LEDs are always turned off at the end
+        led_engine.shutdown(clear=False)
         clear_strip(strip)
-        # Clear OLED display
-        clear_display()
+        # Send the last frame, stop the flush thread and clear the OLED display
+        display.shutdown()
+        display.print_stats()
         print("✅ Displays cleared")
         # Clean up GPIO
         GPIO.cleanup()
\ No newline at end of file
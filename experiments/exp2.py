@@ -1,21 +1,26 @@
 import time
-import board
-import busio
 import threading
 import os
 import sys
 import warnings
-from PIL import Image, ImageDraw
-import adafruit_ssd1306
 import RPi.GPIO as GPIO
 from rpi_ws281x import *
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from modules.calculator_quantum import calculate_sum, format_result, validate_inputs
+from modules.calculator_quantum import calculate_sum, format_result, validate_inputs, build_addition_table
+from modules.sprite_assets import load_spinner_animation
+from modules.frame_clock import FrameClock
 from modules.digit_display import draw_large_digit, draw_plus_sign, show_exp_x_display
+from modules.oled_display import PartialRefreshDisplay, DisplayPipeline, create_oled
+from modules.frame_buffer import DoubleBuffer
+from modules.page_canvas import PageCanvas
+from modules.led_strip import create_strip
+from modules.led_engine import LEDEngine
 from modules.hardware_config import PINS, LED_CONFIG, OLED_CONFIG, ANIMATION_CONFIG, TIMING_CONFIG
+from modules.quantum_deadline import DeadlineExecutor, SOURCE_QUANTUM, SOURCE_LABELS
+from modules.quantum_scheduler import get_scheduler
 
 # Suppress I2C frequency warning
 warnings.filterwarnings("ignore", message="I2C frequency is not settable in python, ignoring!")
@@ -26,7 +31,7 @@ warnings.filterwarnings("ignore", message="I2C frequency is not settable in pyth
 # OLED SDA pin → Raspberry Pi GPIO 2 (Physical pin 3)
 # OLED VCC → 3.3V or 5V
 # OLED GND → Ground
-i2c = busio.I2C(scl=board.D3, sda=board.D2)
+# The I2C bus is opened by create_oled() (OLED_CONFIG['BACKEND'] = 'virtual' runs headless)
 
 # LED Strip Configuration (from centralized config)
 LED_COUNT      = LED_CONFIG['COUNT']
@@ -56,6 +61,10 @@ DISPLAY_RESULT = 2
 current_display_state = DISPLAY_EQUATION
 result_display_time = 0
 current_result = 0
+current_result_source = SOURCE_QUANTUM  # quantum, cache or classical fallback
+
+# Quantum latency budget (cached or classical answer served when exceeded)
+quantum_deadline = DeadlineExecutor(TIMING_CONFIG['QUANTUM_BUDGET'])
 
 # OLED display configuration (from centralized config)
 WIDTH = OLED_CONFIG['WIDTH']
@@ -66,146 +75,69 @@ BORDER = 0
 SPRITE_SIZE = ANIMATION_CONFIG['SPRITE_SIZE']
 FRAMES = ANIMATION_CONFIG['FRAMES']
 animation_frames = []  # Will store loaded animation frames
+spinner_frames = []    # Complete display frames in SSD1306 page format, composed once
 animation_loaded = False
 
-# LED Strip Control
+# LED Strip Control (one engine thread animates the strip for the whole run)
 led_strip = None
-led_pattern_active = False
-led_thread = None
+led_engine = None
+
+# Loop timing (absolute frame deadlines, stats printed on exit)
+display_clock = FrameClock(TIMING_CONFIG['DISPLAY_REFRESH_RATE'], "OLED refresh")
 
-display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c)
+# OLED and canvases, created by setup_display() in main(): importing this module
+# (as carry-select 'pool' workers do) must not open the I2C bus or start threads
+display = None
+page_canvas = None
+frame_buffer = None
 
 def clear_led_strip():
     """Turns OFF all LEDs on the strip."""
     global led_strip
     if led_strip is not None:
-        for i in range(led_strip.numPixels()):
-            led_strip.setPixelColor(i, Color(0, 0, 0))
-        led_strip.show()
+        led_strip.fill(Color(0, 0, 0))
 
 def set_led_strip_color(color):
     """Sets the entire LED strip to a specific color."""
-    global led_strip
-    if led_strip is not None:
-        for i in range(led_strip.numPixels()):
-            led_strip.setPixelColor(i, color)
-        led_strip.show()
-
-def mixed_alternating_colors_thread():
-    """LED alternating pattern similar to exp1.py - runs in background thread."""
-    global led_pattern_active, led_strip
-    
-    if led_strip is None:
-        return
-    
-    # Create different starting colors for each LED
-    led_colors = []
-    for i in range(led_strip.numPixels()):
-        # Even LEDs start with red (0), odd LEDs start with blue (1)
-        led_colors.append(i % 2)
-    
-    while led_pattern_active:
-        # Draw current pattern
-        for i in range(led_strip.numPixels()):
-            if led_colors[i] == 1:
-                led_strip.setPixelColor(i, Color(0, 0, 255))  # Blue
-            else:
-                led_strip.setPixelColor(i, Color(255, 0, 0))  # Red
-        
-        led_strip.show()
-        time.sleep(0.2)  # 0.2 seconds between changes
-        
-        # Toggle each LED's color
-        for i in range(led_strip.numPixels()):
-            led_colors[i] = 1 - led_colors[i]  # Toggle between 0 and 1
-
-def equation_oscillation_thread():
-    """LED oscillation pattern for equation mode - sweeps red to blue across the strip."""
-    global led_pattern_active, led_strip
-    
-    if led_strip is None:
-        return
-    
-    import math
-    wave_position = 0.0  # Current position of the wave
-    
-    while led_pattern_active:
-        # Clear all LEDs first
-        for i in range(led_strip.numPixels()):
-            led_strip.setPixelColor(i, Color(0, 0, 0))
-        
-        # Create oscillating wave that moves from side to side
-        for i in range(led_strip.numPixels()):
-            # Calculate position relative to wave (0 to 1)
-            normalized_pos = i / float(led_strip.numPixels() - 1)
-            
-            # Create a sine wave that moves across the strip
-            wave_value = math.sin(wave_position + normalized_pos * math.pi * 2)
-            
-            # Map wave value (-1 to 1) to color intensity (0 to 255)
-            if wave_value > 0:
-                # Positive wave = Red intensity
-                red_intensity = int(wave_value * 255)
-                led_strip.setPixelColor(i, Color(red_intensity, 0, 0))
-            else:
-                # Negative wave = Blue intensity
-                blue_intensity = int(-wave_value * 255)
-                led_strip.setPixelColor(i, Color(0, 0, blue_intensity))
-        
-        led_strip.show()
-        time.sleep(0.05)  # Smooth animation at 20 FPS
-        
-        # Move the wave position
-        wave_position += 0.2  # Speed of oscillation
-        if wave_position > math.pi * 4:  # Reset after full cycle
-            wave_position = 0.0
+    if led_engine is not None:
+        led_engine.play('solid', color=color)
 
 def start_led_alternating_pattern():
-    """Start the LED alternating pattern in a background thread."""
-    global led_pattern_active, led_thread
-    
-    if led_strip is None:
-        return
-        
-    # Stop any existing pattern
-    stop_led_pattern()
-    
-    led_pattern_active = True
-    led_thread = threading.Thread(target=mixed_alternating_colors_thread)
-    led_thread.daemon = True
-    led_thread.start()
+    """Switch the LED engine to the alternating pattern (takes effect on its next frame)."""
+    if led_engine is not None:
+        led_engine.play('alternating')
 
 def start_equation_oscillation():
-    """Start the LED oscillation pattern for equation mode."""
-    global led_pattern_active, led_thread
-    
-    if led_strip is None:
-        return
-        
-    # Stop any existing pattern
-    stop_led_pattern()
-    
-    led_pattern_active = True
-    led_thread = threading.Thread(target=equation_oscillation_thread)
-    led_thread.daemon = True
-    led_thread.start()
+    """Switch the LED engine to the oscillating wave for equation mode."""
+    if led_engine is not None:
+        led_engine.play('wave')
 
 def stop_led_pattern():
-    """Stop the LED alternating pattern."""
-    global led_pattern_active, led_thread
+    """Stop the LED engine thread at exit (the only join, never on the UI path)."""
+    if led_engine is not None:
+        led_engine.shutdown(clear=False)
+
+def setup_display():
+    """Open the OLED and create the canvases the screens are drawn on."""
+    global display, page_canvas, frame_buffer
     
-    led_pattern_active = False
-    if led_thread is not None and led_thread.is_alive():
-        led_thread.join(timeout=1)  # Wait up to 1 second for thread to finish
+    # show() hands the frame to a flush thread; only changed pages/columns go over I2C
+    display = DisplayPipeline(PartialRefreshDisplay(create_oled(WIDTH, HEIGHT)))
+    page_canvas = PageCanvas(WIDTH, HEIGHT)     # Equation/result screens, drawn in page format
+    frame_buffer = DoubleBuffer(WIDTH, HEIGHT)  # Reused images for the fallback spinner
 
 def setup_led_strip():
-    """Initialize the LED strip."""
-    global led_strip
+    """Initialize the LED strip and start the LED engine."""
+    global led_strip, led_engine
     
     try:
-        led_strip = Adafruit_NeoPixel(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
+        # rpi_ws281x, or a recording VirtualStrip when LED_CONFIG['BACKEND'] = 'virtual';
+        # frames are written in bulk with gamma and brightness correction
+        led_strip = create_strip()
         led_strip.begin()
         clear_led_strip()  # Start with LEDs off
+        led_engine = LEDEngine(led_strip)
+        led_engine.start()
         print("✅ LED strip initialized successfully!")
         return True
     except Exception as e:
@@ -214,54 +146,19 @@ def setup_led_strip():
         return False
 
 def load_animation_frames():
-    """Load animation frames from sprite sheet bitmap"""
-    global animation_frames, animation_loaded
+    """Load the atom animation (compiled asset, or the sprite sheet if it is missing or stale)"""
+    global animation_frames, spinner_frames, animation_loaded
     
     if animation_loaded:
         return
     
     try:
-        # Load the sprite sheet bitmap
-        sprite_path = "./assets/icons/atom.bmp"
+        sprite_path = ANIMATION_CONFIG['ATOM_ICON_PATH']
         if os.path.exists(sprite_path):
-            sprite_sheet = Image.open(sprite_path)
-            
-            # Convert to 1-bit (monochrome) if not already
-            if sprite_sheet.mode != '1':
-                sprite_sheet = sprite_sheet.convert('1')
-            
-            # Extract individual frames from the sprite sheet
-            frame_width = SPRITE_SIZE[0]
-            frame_height = SPRITE_SIZE[1]
+            # Sprites for the fallback drawing, complete page-format frames for the spinner
+            animation_frames, spinner_frames = load_spinner_animation('exp2', WIDTH, HEIGHT)
             
-            # Calculate how many frames we can actually extract from the sprite sheet
-            available_frames = min(FRAMES, sprite_sheet.size[0] // frame_width)
-            
-            for i in range(available_frames):
-                # Calculate frame position in sprite sheet
-                x = i * frame_width
-                y = 0
-                
-                # Extract frame
-                frame_box = (x, y, x + frame_width, y + frame_height)
-                frame = sprite_sheet.crop(frame_box)
-                
-                # Make the atom bigger - resize to take up more of the display
-                # Use 95% of display height to make it prominent
-                display_size = int(HEIGHT * 0.95)  # Make it 95% of display height (about 51 pixels)
-                frame = frame.resize((display_size, display_size), Image.NEAREST)
-                
-                animation_frames.append(frame)
-            
-            # If we have fewer frames than requested, duplicate frames to reach 30
-            if len(animation_frames) < FRAMES and len(animation_frames) > 0:
-                original_frames = animation_frames.copy()
-                while len(animation_frames) < FRAMES:
-                    # Add frames by cycling through original frames
-                    frame_to_add = original_frames[len(animation_frames) % len(original_frames)]
-                    animation_frames.append(frame_to_add)
-            
-            animation_loaded = True
+            animation_loaded = bool(animation_frames)
             print(f"✅ Loaded {len(animation_frames)} animation frames (requested {FRAMES})")
             
         else:
@@ -294,19 +191,8 @@ def draw_loading_spinner(draw, frame):
         center_x = (WIDTH - frame_width) // 2   # Center horizontally on 128px width
         center_y = (HEIGHT - frame_height) // 2  # Center vertically on 64px height
         
-        # Draw the frame pixel by pixel
-        frame_pixels = list(current_frame.getdata())
-        
-        for y in range(frame_height):
-            for x in range(frame_width):
-                pixel_index = y * frame_width + x
-                if pixel_index < len(frame_pixels):
-                    # If pixel is white/on (1), draw it on the display
-                    if frame_pixels[pixel_index]:
-                        draw_x = center_x + x
-                        draw_y = center_y + y
-                        if 0 <= draw_x < WIDTH and 0 <= draw_y < HEIGHT:
-                            draw.point((draw_x, draw_y), fill=255)
+        # Draw the lit pixels of the frame in one call
+        draw.bitmap((center_x, center_y), current_frame, fill=255)
     
     else:
         # Fallback to original spinning circle if bitmap loading failed
@@ -335,11 +221,15 @@ def draw_loading_spinner(draw, frame):
                 # Dimmer trailing segments
                 draw.point((x2, y2), fill=255)
 
-def draw_result_display(draw, result):
+def draw_result_display(draw, result, source=SOURCE_QUANTUM):
     """Draw the calculation result"""
     # Clear the display
     draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
     
+    # Label results that did not come from the quantum circuit in time
+    if source != SOURCE_QUANTUM:
+        draw.text((0, 0), SOURCE_LABELS[source], fill=255)
+    
     # Get the current numbers
     left_number = left_counter % 10
     right_number = right_counter % 10
@@ -390,14 +280,13 @@ def display_equation():
     """Display the appropriate screen based on current state"""
     global current_display_state, result_display_time, current_result
     
-    # Clear the display
-    image = Image.new("1", (WIDTH, HEIGHT))
-    draw = ImageDraw.Draw(image)
+    # Clear the page canvas (no image and no conversion per tick)
+    draw = page_canvas.begin()
+    pages = page_canvas.buffer
     
     if current_display_state == DISPLAY_EQUATION:
-        # Show oscillating red-blue wave during equation mode
-        if not led_pattern_active:
-            start_equation_oscillation()
+        # Show oscillating red-blue wave during equation mode (no-op while already playing)
+        start_equation_oscillation()
         
         # Calculate numbers from counters (0-9 cycle)
         left_number = left_counter % 10
@@ -426,24 +315,58 @@ def display_equation():
         
     elif current_display_state == DISPLAY_LOADING:
         # Start LED alternating pattern during calculation
-        if not led_pattern_active:
-            start_led_alternating_pattern()
+        start_led_alternating_pattern()
         
         # Show loading animation at 30 FPS
         frame = int((time.time() * 30) % (30 * len(animation_frames) if animation_frames else 240))  # 30 FPS animation
-        draw_loading_spinner(draw, frame)
+        if not animation_loaded:
+            load_animation_frames()
+        
+        if spinner_frames:
+            # Prerendered frame: nothing to draw, just hand it to the display
+            pages = spinner_frames[frame % len(spinner_frames)]
+        else:
+            # Fallback spinner draws lines and points, so it stays on PIL images
+            draw_loading_spinner(frame_buffer.begin(), frame)
+            pages = None
         
     elif current_display_state == DISPLAY_RESULT:
-        # Stop LED pattern and show blue when calculation is complete
-        stop_led_pattern()
+        # Show blue when calculation is complete
         set_led_strip_color(Color(0, 0, 255))  # Blue for result
         
         # Show calculation result (stays until GPIO 26 pressed again)
-        draw_result_display(draw, current_result)
+        draw_result_display(draw, current_result, current_result_source)
     
     # Update display
-    display.image(image)
-    display.show()
+    if pages is None:
+        frame_buffer.present(display)
+    else:
+        display.frame(pages)
+        display.show()
+
+def reconcile_result(key, value, served_value, served_source):
+    """Replace a fallback answer on screen once the late quantum result arrives."""
+    global current_result, current_result_source
+    
+    left_number = left_counter % 10
+    right_number = right_counter % 10
+    
+    if current_display_state == DISPLAY_RESULT and key == (left_number, right_number):
+        if value != served_value:
+            print(f"⚠️  Quantum result {value} differs from {served_source} answer {served_value}")
+        current_result = value
+        current_result_source = SOURCE_QUANTUM
+
+def warm_result_cache():
+    """Fill the fallback cache from one superposed adder run (background priority)."""
+    try:
+        table = build_addition_table()
+        for left_number in range(10):
+            for right_number in range(10):
+                quantum_deadline.prime((left_number, right_number), table[(left_number, right_number)])
+        print("✅ Result cache warmed from superposed adder")
+    except Exception as e:
+        print(f"⚠️  Result cache warm-up failed: {e}")
 
 def check_buttons():
     """Check all button states with debouncing (polling method)"""
@@ -510,8 +433,12 @@ def check_buttons():
                     import threading
                     def do_calculation():
                         nonlocal calculation_done
-                        global current_result
-                        current_result = calculate_sum(left_number, right_number)
+                        global current_result, current_result_source
+                        current_result, current_result_source = quantum_deadline.run(
+                            lambda: calculate_sum(left_number, right_number),
+                            lambda: left_number + right_number,
+                            key=(left_number, right_number),
+                            on_reconcile=reconcile_result)
                         calculation_done = True
                     
                     calc_thread = threading.Thread(target=do_calculation)
@@ -520,7 +447,7 @@ def check_buttons():
                     # Show loading animation while calculation is running
                     while not calculation_done:
                         display_equation()  # This will show the loading animation
-                        time.sleep(0.033)  # 30 FPS refresh rate
+                        display_clock.tick()  # 30 FPS refresh rate
                     
                     calc_thread.join()
                     
@@ -559,6 +486,7 @@ def number_display():
     print("🧮 Press calculate button (GPIO 26) again to return to equation")
     print("Press Ctrl+C to stop")
     
+    display_clock.start()
     while True:
         # Check all button states
         check_buttons()
@@ -566,8 +494,8 @@ def number_display():
         # Display the appropriate screen
         display_equation()
         
-        # Higher refresh rate for 30 FPS animation
-        time.sleep(0.033)  # ~30 FPS (1/30 = 0.033 seconds)
+        # Higher refresh rate for 30 FPS animation (absolute deadlines, no drift)
+        display_clock.tick()
 
 def main():
     print("=== EXP. 2 - OLED Number Display with Calculator ===")
@@ -599,6 +527,7 @@ def main():
     
     try:
         # Initialize display and show EXP. 2 for 3 seconds
+        setup_display()
         display.fill(0)
         display.show()
         print("✅ Display initialized successfully!")
@@ -617,6 +546,11 @@ def main():
         setup_buttons()
         print("✅ Buttons setup complete!")
         
+        # Warm the fallback cache without delaying the calculator
+        warm_thread = threading.Thread(target=warm_result_cache)
+        warm_thread.daemon = True
+        warm_thread.start()
+        
         print("🧮 Starting calculator interface...")
         
         number_display()
@@ -625,8 +559,9 @@ def main():
         print("\n🛑 Stopping display...")
         stop_led_pattern()
         clear_led_strip()
-        display.fill(0)
-        display.show()
+        if display is not None:
+            display.fill(0)
+            display.show()
         print("✅ Display stopped. Goodbye!")
         
     except Exception as e:
@@ -642,6 +577,18 @@ def main():
         print("\n💬 Note: 'I2C frequency not settable' warnings are normal and harmless")
         
     finally:
+        # Report latency budget misses and circuit queue times for tuning
+        quantum_deadline.print_stats()
+        get_scheduler().print_stats()
+        display_clock.print_stats()
+        if led_engine is not None:
+            led_engine.print_stats()
+        
+        # Send the last frame, stop the flush thread and clear the OLED display
+        if display is not None:
+            display.shutdown()
+            display.print_stats()
+        
         # Stop LED patterns and clear strip
         stop_led_pattern()
         clear_led_strip()
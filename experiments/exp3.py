@@ -4,16 +4,19 @@ import time
 import os
 import sys
 from rpi_ws281x import *
-import board
-import busio
 import warnings
 from PIL import Image, ImageDraw
-import adafruit_ssd1306
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from modules.digit_display import show_exp_x_display
+from modules.oled_display import PartialRefreshDisplay, create_oled
+from modules.led_layout import create_layout
+from modules.led_transition import fade_fill
+from modules.frame_clock import FrameClock
+from modules.circuit_folding import fold_constants
+from modules.quantum_scheduler import get_scheduler, run_circuit_job, PRIORITY_INTERACTIVE
 from modules.hardware_config import PINS, LED_CONFIG, OLED_CONFIG
 
 # GPIO Configuration (from centralized config)
@@ -33,22 +36,25 @@ LED_CHANNEL    = LED_CONFIG['CHANNEL']
 # Suppress I2C frequency warning
 warnings.filterwarnings("ignore", message="I2C frequency is not settable in python, ignoring!")
 
-# I2C pins for OLED (using centralized config)
-i2c = busio.I2C(scl=board.D3, sda=board.D2)
-
+# create_oled() opens the I2C panel, or a headless VirtualOLED when OLED_CONFIG['BACKEND'] = 'virtual'
 # OLED display dimensions (from centralized config)
 WIDTH = OLED_CONFIG['WIDTH']
 HEIGHT = OLED_CONFIG['HEIGHT']
-display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c)
+# Only the changed pages/columns are sent on show()
+display = PartialRefreshDisplay(create_oled(WIDTH, HEIGHT))
+
+# Input polling at 10 Hz (absolute deadlines, stats printed on exit)
+poll_clock = FrameClock(0.1, "Button polling")
 
 # Initialize GPIO
 GPIO.setmode(GPIO.BCM)
 GPIO.setup(BUTTON_A_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 GPIO.setup(BUTTON_B_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
-# Initialize LED strip
-strip = Adafruit_NeoPixel(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
-strip.begin()
+# Initialize LED strips (every strip in LED_CONFIG, frames written in bulk with gamma and
+# brightness correction); inputs are shown on the 'input_a' / 'input_b' segments
+led_layout = create_layout()
+led_layout.begin()
 
 print("=== EXP. 3 - Raspberry Pi Quantum AND Gate with LED Strip ===")
 print("Using physical buttons to control Toffoli gate inputs")
@@ -77,9 +83,7 @@ def read_gpio_inputs():
 
 def clear_strip():
     """Turn OFF all LEDs on the strip."""
-    for i in range(strip.numPixels()):
-        strip.setPixelColor(i, Color(0, 0, 0))
-    strip.show()
+    led_layout.fill(Color(0, 0, 0))
 
 
 
@@ -100,10 +104,8 @@ def display_result_on_leds(binary_value):
         color = Color(255, 0, 0)  # Red for 0
         color_name = "Red"
     
-    # Light up all LEDs with the result color
-    for i in range(strip.numPixels()):
-        strip.setPixelColor(i, color)
-    strip.show()
+    # Crossfade all LEDs from the input pattern to the result color
+    fade_fill(led_layout.strips, color)
     
     print(f"LED Strip: {color_name} (Binary: {binary_value})")
 
@@ -113,26 +115,10 @@ def show_input_pattern(input_a, input_b):
     clear_strip()
     time.sleep(0.2)
     
-    # Show inputs on first few LEDs
-    if input_a:
-        # Show blue on first 30 LEDs for input A = 1
-        for i in range(30):
-            strip.setPixelColor(i, Color(0, 0, 255))
-    else:
-        # Show red on first 30 LEDs for input A = 0
-        for i in range(30):
-            strip.setPixelColor(i, Color(255, 0, 0))
-    
-    if input_b:
-        # Show blue on next 30 LEDs for input B = 1
-        for i in range(30, 60):
-            strip.setPixelColor(i, Color(0, 0, 255))
-    else:
-        # Show red on next 30 LEDs for input B = 0
-        for i in range(30, 60):
-            strip.setPixelColor(i, Color(255, 0, 0))
-    
-    strip.show()
+    # Input A and input B segments (LED_CONFIG['SEGMENTS']): blue for 1, red for 0
+    led_layout.segment('input_a').fill(Color(0, 0, 255) if input_a else Color(255, 0, 0), show=False)
+    led_layout.segment('input_b').fill(Color(0, 0, 255) if input_b else Color(255, 0, 0), show=False)
+    led_layout.show()
     time.sleep(0.5)
 
 def create_toffoli_circuit(input_a, input_b):
@@ -165,9 +151,11 @@ def create_toffoli_circuit(input_a, input_b):
 def run_quantum_circuit(circuit):
     """Execute the quantum circuit on simulator."""
     simulator = Aer.get_backend('qasm_simulator')
-    job = execute(circuit, simulator, shots=1000)
-    result = job.result()
-    counts = result.get_counts()
+    # Known button inputs are folded classically; the drawn circuit stays intact
+    folded = fold_constants(circuit)
+    counts = run_circuit_job(
+        lambda: execute(folded, simulator, shots=1000).result().get_counts(),
+        PRIORITY_INTERACTIVE)
     
     return counts
 
@@ -205,6 +193,7 @@ def main():
     try:
         last_state = (False, False)
         
+        poll_clock.start()
         while True:
             # Read current button states
             button_a, button_b = read_gpio_inputs()
@@ -244,8 +233,8 @@ def main():
                 
                 last_state = current_state
             
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.1)
+            # Poll at 10 Hz to prevent excessive CPU usage
+            poll_clock.tick()
             
     except KeyboardInterrupt:
         print("\n\nExiting...")
@@ -255,6 +244,10 @@ def main():
         clear_strip()
         clear_display()
         print("✅ Displays cleared")
+        get_scheduler().print_stats()
+        display.print_stats()
+        poll_clock.print_stats()
+        led_layout.print_stats()
         # Clean up GPIO
         GPIO.cleanup()
         print("🧹 GPIO cleanup completed.")
@@ -4,16 +4,33 @@ Calculator Module
 Handles quantum full adder mathematical operations for the OLED display
 """
 
+import atexit
+import multiprocessing
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from qiskit import QuantumCircuit, Aer, execute
 
-def calculate_sum(left_number, right_number):
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.circuit_folding import fold_constants
+from modules.hardware_config import QUANTUM_CONFIG
+from modules.quantum_scheduler import run_circuit_job, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+# Process pool for carry-select 'pool' mode (created on first use)
+_process_pool = None
+
+def calculate_sum(left_number, right_number, priority=PRIORITY_INTERACTIVE):
     # 1️⃣ Converte para binário de 4 bits
     left_bin = decimal_to_binary(left_number)
     right_bin = decimal_to_binary(right_number)
 
     # 2️⃣ Faz a soma de 4 bits, retorna já em binário como string
-    result_bin = add_4_bits(left_bin, right_bin)
+    if QUANTUM_CONFIG['CARRY_SELECT']:
+        result_bin = add_bits_carry_select(left_bin, right_bin, priority=priority)
+    else:
+        result_bin = add_4_bits(left_bin, right_bin, priority=priority)
 
     # 3️⃣ Converte resultado binário para decimal
     result_decimal = binary_to_decimal(result_bin)
@@ -167,7 +184,7 @@ def create_full_adder(input_a, input_b, carry_in):
 
     return qc
 
-def add_4_bits(input_a, input_b):
+def add_4_bits(input_a, input_b, priority=PRIORITY_INTERACTIVE):
     """
     Faz a soma de dois números de 4 bits (input como string '0101'), utilizando
     seu create_full_adder, mas reaproveitando os qubits para cada bit.
@@ -175,6 +192,16 @@ def add_4_bits(input_a, input_b):
     """
     assert len(input_a) == 4 and len(input_b) == 4, "Inputs devem ter 4 bits."
 
+    return add_n_bits(input_a, input_b, priority=priority)
+
+def add_n_bits(input_a, input_b, priority=PRIORITY_INTERACTIVE):
+    """
+    Soma ripple-carry de dois números de N bits: cada bit espera o carry
+    medido do bit anterior. Retorna a string binária com N+1 bits.
+    Cada bit é um job separado no scheduler de circuitos.
+    """
+    assert len(input_a) == len(input_b), "Inputs devem ter o mesmo número de bits."
+
     # Inverter bits para LSB first
     a_bits = input_a[::-1]
     b_bits = input_b[::-1]
@@ -186,21 +213,16 @@ def add_4_bits(input_a, input_b):
         a = int(a_bit)
         b = int(b_bit)
 
-        # Criar circuito para esse bit
-        qc = create_full_adder(a, b, carry)
+        # Criar circuito para esse bit (entradas conhecidas são propagadas antes de simular)
+        qc = fold_constants(create_full_adder(a, b, carry))
         qc.measure_all()
 
         simulator = Aer.get_backend('qasm_simulator')
-        job = execute(qc, simulator, shots=1000)
-        result = job.result()
-        counts = result.get_counts()
-
-        # Interpretar resultado (invertido pelo Qiskit)
-        most_common_result = max(counts, key=counts.get)
-        bits = most_common_result[::-1]
+        counts = run_circuit_job(
+            lambda: execute(qc, simulator, shots=QUANTUM_CONFIG['SHOTS']).result().get_counts(),
+            priority)
 
-        sum_bit = int(bits[5])
-        carry = int(bits[7])
+        sum_bit, carry = read_full_adder_counts(counts)
 
         sum_bits.append(str(sum_bit))
 
@@ -211,6 +233,237 @@ def add_4_bits(input_a, input_b):
     result_bits = ''.join(sum_bits[::-1])
     return result_bits
 
+def read_full_adder_counts(counts):
+    """
+    Interpret the measured counts of a full adder circuit
+
+    Args:
+        counts (dict): Measurement counts from the simulator
+
+    Returns:
+        tuple: (sum bit, carry out bit) of the most common result
+    """
+    # Interpretar resultado (invertido pelo Qiskit)
+    most_common_result = max(counts, key=counts.get)
+    bits = most_common_result[::-1]
+
+    return int(bits[5]), int(bits[7])
+
+def create_measured_full_adder(input_a, input_b, carry_in):
+    """Create a folded, measured full adder circuit ready for execution."""
+    qc = fold_constants(create_full_adder(input_a, input_b, carry_in))
+    qc.measure_all()
+    return qc
+
+def run_full_adder(inputs):
+    """
+    Simulate a single full adder (process pool worker)
+
+    Args:
+        inputs (tuple): (input_a, input_b, carry_in)
+
+    Returns:
+        tuple: (sum bit, carry out bit)
+    """
+    qc = create_measured_full_adder(*inputs)
+    simulator = Aer.get_backend('qasm_simulator')
+    counts = execute(qc, simulator, shots=QUANTUM_CONFIG['SHOTS']).result().get_counts()
+    return read_full_adder_counts(counts)
+
+def get_process_pool(workers=None):
+    """Get the shared process pool used by carry-select 'pool' mode."""
+    global _process_pool
+
+    if _process_pool is None:
+        # Spawn instead of fork: forking after Aer started its OpenMP threads can deadlock.
+        # Spawned workers re-import the caller's __main__, so entry points using 'pool'
+        # mode must keep hardware setup inside main() (see exp2's setup_display())
+        _process_pool = ProcessPoolExecutor(max_workers=workers or QUANTUM_CONFIG['WORKERS'],
+                                            mp_context=multiprocessing.get_context('spawn'))
+        atexit.register(_process_pool.shutdown)
+    return _process_pool
+
+def add_bits_carry_select(input_a, input_b, mode=None, workers=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Carry-select sum of two N-bit binary strings
+
+    Every bit position is simulated for carry-in 0 and carry-in 1 at the
+    same time (one batched Aer job, or a process pool), so the latency is
+    that of one circuit instead of N. The real carry chain is then resolved
+    classically by picking the candidate matching the incoming carry.
+
+    Args:
+        input_a (str): Binary string, MSB first
+        input_b (str): Binary string, MSB first (same length as input_a)
+        mode (str): 'batch' or 'pool' (default from QUANTUM_CONFIG)
+        workers (int): Parallel experiments / pool workers (default from QUANTUM_CONFIG)
+        priority (int): Circuit scheduler priority class
+
+    Returns:
+        str: Binary string of the result with N+1 bits
+    """
+    assert len(input_a) == len(input_b), "Inputs devem ter o mesmo número de bits."
+
+    mode = mode or QUANTUM_CONFIG['CARRY_SELECT_MODE']
+    workers = workers or QUANTUM_CONFIG['WORKERS']
+
+    # Inverter bits para LSB first
+    a_bits = [int(bit) for bit in input_a[::-1]]
+    b_bits = [int(bit) for bit in input_b[::-1]]
+
+    # Only 8 distinct full adders exist, so each one is simulated at most once
+    combinations = sorted({(a, b, carry_in)
+                           for a, b in zip(a_bits, b_bits)
+                           for carry_in in (0, 1)})
+
+    def simulate():
+        if mode == 'pool':
+            return list(get_process_pool(workers).map(run_full_adder, combinations))
+
+        circuits = [create_measured_full_adder(*inputs) for inputs in combinations]
+        simulator = Aer.get_backend('qasm_simulator')
+        # X/CX/CCX are native to Aer, so skip execute()'s multi-process transpile step
+        job = simulator.run(circuits, shots=QUANTUM_CONFIG['SHOTS'],
+                            max_parallel_experiments=workers)
+        result = job.result()
+        return [read_full_adder_counts(result.get_counts(index))
+                for index in range(len(circuits))]
+
+    outputs = run_circuit_job(simulate, priority)
+
+    candidates = dict(zip(combinations, outputs))
+
+    # Resolver a cadeia de carry classicamente
+    carry = 0
+    sum_bits = []
+    for a, b in zip(a_bits, b_bits):
+        sum_bit, carry = candidates[(a, b, carry)]
+        sum_bits.append(str(sum_bit))
+
+    sum_bits.append(str(carry))
+
+    return ''.join(sum_bits[::-1])
+
+def create_superposed_adder(n_bits=4, inputs=None):
+    """
+    Coherent N-bit ripple-carry adder where the carries stay quantum
+
+    With no inputs, the A and B registers are put in uniform superposition
+    with Hadamards, so every shot samples one random (A, B, A+B) triple.
+
+    Qubit mapping (LSB first inside each register):
+    0..N-1:    A
+    N..2N-1:   B
+    2N..3N-1:  S (soma de cada bit)
+    3N..4N-1:  C (carry out de cada bit)
+
+    Classical bits: A (N), B (N), S (N) and the final carry, so the top
+    N+1 bits read directly as the sum.
+
+    Args:
+        n_bits (int): Width of each input register
+        inputs (tuple): Optional (a, b) basis-state inputs instead of superposition
+
+    Returns:
+        QuantumCircuit: The measured adder circuit
+    """
+    n = n_bits
+    qc = QuantumCircuit(4 * n, 3 * n + 1)
+
+    if inputs is None:
+        qc.h(range(2 * n))
+    else:
+        for bit in range(n):
+            if (inputs[0] >> bit) & 1:
+                qc.x(bit)
+            if (inputs[1] >> bit) & 1:
+                qc.x(n + bit)
+
+    for bit in range(n):
+        a, b, s, carry_out = bit, n + bit, 2 * n + bit, 3 * n + bit
+        carry_in = carry_out - 1 if bit > 0 else None
+
+        # Soma: A XOR B XOR Cin
+        qc.cx(a, s)
+        qc.cx(b, s)
+        if carry_in is not None:
+            qc.cx(carry_in, s)
+
+        # Carry: MAJ(A, B, Cin) = AB XOR A·Cin XOR B·Cin
+        qc.ccx(a, b, carry_out)
+        if carry_in is not None:
+            qc.ccx(a, carry_in, carry_out)
+            qc.ccx(b, carry_in, carry_out)
+
+    qc.measure(range(3 * n), range(3 * n))
+    qc.measure(4 * n - 1, 3 * n)
+
+    return qc
+
+def read_adder_shot(shot, n_bits=4):
+    """
+    Decode one measured shot of create_superposed_adder
+
+    Args:
+        shot (str): Measured bitstring (Qiskit order, clbit 0 rightmost)
+        n_bits (int): Width of each input register
+
+    Returns:
+        tuple: (a, b, sum)
+    """
+    value = int(shot, 2)
+    mask = (1 << n_bits) - 1
+    return value & mask, (value >> n_bits) & mask, value >> (2 * n_bits)
+
+def build_addition_table(n_bits=4, shots=None, priority=PRIORITY_BACKGROUND):
+    """
+    Fill the complete addition table from one superposed adder run
+
+    The superposed circuit is run once with memory=True and every shot
+    gives one (A, B, A+B) entry. Entries that no shot happened to sample
+    are topped up with one batched job of basis-state adders.
+
+    Args:
+        n_bits (int): Width of each operand (4 -> 0..15 + 0..15)
+        shots (int): Shots for the superposed run (default from QUANTUM_CONFIG)
+        priority (int): Circuit scheduler priority class
+
+    Returns:
+        dict: {(a, b): a + b} for every pair of N-bit operands
+    """
+    shots = shots or QUANTUM_CONFIG['TABLE_SHOTS']
+    simulator = Aer.get_backend('qasm_simulator')
+    start_time = time.time()
+
+    # H/CX/CCX are native to Aer, so the circuits are run without transpiling
+    superposed = create_superposed_adder(n_bits)
+    memory = run_circuit_job(
+        lambda: simulator.run(superposed, shots=shots, memory=True).result().get_memory(),
+        priority)
+
+    table = {}
+    for shot in memory:
+        a, b, total = read_adder_shot(shot, n_bits)
+        table[(a, b)] = total
+    sampled = len(table)
+
+    missing = [(a, b) for a in range(1 << n_bits) for b in range(1 << n_bits)
+               if (a, b) not in table]
+    if missing:
+        circuits = [create_superposed_adder(n_bits, inputs) for inputs in missing]
+        result = run_circuit_job(
+            lambda: simulator.run(circuits, shots=QUANTUM_CONFIG['SHOTS']).result(),
+            priority)
+        for index, inputs in enumerate(missing):
+            counts = result.get_counts(index)
+            table[inputs] = read_adder_shot(max(counts, key=counts.get), n_bits)[2]
+
+    print(f"Tabela de soma ({n_bits} bits): {sampled} entradas de 1 circuito em superposição "
+          f"({shots} shots), {len(missing)} completadas com execuções dirigidas "
+          f"em {time.time() - start_time:.2f}s")
+
+    return table
+
 def extract_from_4_bits_sum(binary_result):
     binary = binary_result[0] + binary_result[4:8]
 
@@ -237,9 +490,9 @@ def binary_to_decimal(binary):
     """Convert binary string to decimal number."""
     return int(binary, 2)  # Convert binary string to decimal integer
 
-def decimal_to_binary(decimal):
+def decimal_to_binary(decimal, bits=4):
     """Convert decimal number to binary string."""
-    return bin(decimal)[2:].zfill(4)  # Convert to binary and pad to 4 bits
+    return bin(decimal)[2:].zfill(bits)  # Convert to binary and pad to `bits` digits
 
 if __name__ == "__main__":
     def test_and_gate():
@@ -389,5 +642,50 @@ if __name__ == "__main__":
             result = "OK!" if test else "FALHOU!"
             print(f"Teste {idx+1}: {result}")
 
+    def benchmark_carry_select(widths=(4, 8, 16), repeats=3):
+        """
+        Compara o tempo de parede do ripple-carry sequencial com o
+        carry-select (batch e pool) para somas de 4, 8 e 16 bits.
+        """
+        import random
+
+        for bits in widths:
+            input_a = decimal_to_binary(random.getrandbits(bits), bits)
+            input_b = decimal_to_binary(random.getrandbits(bits), bits)
+            expected = decimal_to_binary(int(input_a, 2) + int(input_b, 2), bits + 1)
+
+            timings = {}
+            for name, adder in (('ripple', add_n_bits),
+                                ('batch', lambda a, b: add_bits_carry_select(a, b, mode='batch')),
+                                ('pool', lambda a, b: add_bits_carry_select(a, b, mode='pool'))):
+                adder(input_a, input_b)  # Warm-up (pool start-up, Aer load)
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    assert adder(input_a, input_b) == expected, f"{name} falhou com {bits} bits"
+                timings[name] = (time.perf_counter() - start) / repeats
+
+            print(f"{bits:>2} bits: " + " | ".join(
+                f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+
+    testar_benchmark_carry_select = False
+    if testar_benchmark_carry_select:
+        benchmark_carry_select()
+
+    def test_addition_table(n_bits=4):
+        """
+        Constrói a tabela completa de soma com um único circuito em
+        superposição e confere todas as entradas.
+        """
+        table = build_addition_table(n_bits)
+        wrong = [(a, b) for (a, b), total in table.items() if total != a + b]
+        complete = len(table) == (1 << n_bits) ** 2
 
+        if complete and not wrong:
+            print("\033[92mTESTE OK!\033[0m ✅")
+            return True
+        print(f"\033[91mTESTE FALHOU!\033[0m ❌ ({len(table)} entradas, erradas: {wrong[:5]})")
+        return False
 
+    testar_tabela_superposicao = False
+    if testar_tabela_superposicao:
+        test_addition_table()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Circuit Folding Module
+Classical constant folding for circuits that start from known basis states
+"""
+
+from qiskit import QuantumCircuit
+
+# Gates that only permute computational basis states (X with 0, 1 or 2 controls)
+CLASSICAL_GATES = {'x': 0, 'cx': 1, 'ccx': 2}
+
+# Instructions that do not change the state of the qubits they touch
+PASSIVE_INSTRUCTIONS = {'barrier'}
+
+
+def fold_constants(circuit):
+    """
+    Propagate known classical qubit values through a circuit
+
+    Every qubit starts in |0⟩, so as long as only X/CX/CCX gates act on it
+    its value is known classically. Gates whose controls are known to be 0
+    are removed, controls known to be 1 are dropped (CCX -> CX -> X) and
+    X gates on known qubits are folded into the tracked value. Known values
+    are only written back to the circuit (as X gates) when a qubit meets an
+    instruction that needs its physical state, or at the end.
+
+    Args:
+        circuit (QuantumCircuit): Circuit to fold
+
+    Returns:
+        QuantumCircuit: Smaller circuit producing the same final state
+    """
+    folded = circuit.copy_empty_like()
+    known = {index: 0 for index in range(circuit.num_qubits)}
+
+    def materialize(index):
+        # Write a lazily tracked value back into the circuit
+        if known.pop(index, 0):
+            folded.x(index)
+
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+
+        if operation.name in CLASSICAL_GATES and not operation.condition:
+            num_controls = CLASSICAL_GATES[operation.name]
+            controls = qubits[:num_controls]
+            target = qubits[num_controls]
+
+            # Any control known to be |0⟩ means the gate never fires
+            if any(known.get(control) == 0 for control in controls):
+                continue
+
+            # Controls known to be |1⟩ are always satisfied
+            remaining = [control for control in controls if control not in known]
+
+            if not remaining and target in known:
+                known[target] ^= 1
+                continue
+
+            materialize(target)
+            if not remaining:
+                folded.x(target)
+            elif len(remaining) == 1:
+                folded.cx(remaining[0], target)
+            else:
+                folded.ccx(remaining[0], remaining[1], target)
+            continue
+
+        if operation.name not in PASSIVE_INSTRUCTIONS:
+            for index in qubits:
+                materialize(index)
+
+        folded.append(operation, instruction.qubits, instruction.clbits)
+
+    for index in sorted(known):
+        materialize(index)
+
+    return folded
+
+
+def folding_report(circuit, folded=None):
+    """
+    Compare gate counts before and after folding
+
+    Args:
+        circuit (QuantumCircuit): Original circuit
+        folded (QuantumCircuit): Folded circuit (computed if not given)
+
+    Returns:
+        dict: Gate counts, sizes and depth before and after folding
+    """
+    if folded is None:
+        folded = fold_constants(circuit)
+
+    return {
+        'before_ops': dict(circuit.count_ops()),
+        'after_ops': dict(folded.count_ops()),
+        'before_size': circuit.size(),
+        'after_size': folded.size(),
+        'before_depth': circuit.depth(),
+        'after_depth': folded.depth(),
+        'removed': circuit.size() - folded.size(),
+    }
+
+
+def print_folding_report(name, report):
+    """Print a gate-count reduction summary."""
+    before = report['before_size']
+    after = report['after_size']
+    reduction = 100.0 * report['removed'] / before if before else 0.0
+    print(f"{name}: {before} -> {after} gates ({reduction:.0f}% fewer), "
+          f"depth {report['before_depth']} -> {report['after_depth']}")
+    print(f"  before: {report['before_ops']}")
+    print(f"  after:  {report['after_ops']}")
+
+
+if __name__ == "__main__":
+    import itertools
+    import os
+    import sys
+
+    from qiskit.quantum_info import Statevector
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+    from modules.calculator_quantum import create_full_adder
+
+    def test_full_adder_folding():
+        """Check the folded full adder on every input combination."""
+        all_ok = True
+        for input_a, input_b, carry_in in itertools.product((0, 1), repeat=3):
+            circuit = create_full_adder(input_a, input_b, carry_in)
+            folded = fold_constants(circuit)
+
+            equivalent = Statevector(circuit).equiv(Statevector(folded))
+            all_ok = all_ok and equivalent
+
+            status = "\033[92mOK\033[0m" if equivalent else "\033[91mFALHOU\033[0m"
+            print(f"\nA={input_a} B={input_b} Cin={carry_in}: {status}")
+            print_folding_report("Full adder", folding_report(circuit, folded))
+        return all_ok
+
+    def test_toffoli_folding():
+        """Check the folded exp3 Toffoli circuit on every input combination."""
+        all_ok = True
+        for input_a, input_b in itertools.product((0, 1), repeat=2):
+            circuit = QuantumCircuit(3)
+            if input_a:
+                circuit.x(0)
+            if input_b:
+                circuit.x(1)
+            circuit.barrier()
+            circuit.ccx(0, 1, 2)
+            folded = fold_constants(circuit)
+
+            equivalent = Statevector(circuit).equiv(Statevector(folded))
+            all_ok = all_ok and equivalent
+
+            status = "\033[92mOK\033[0m" if equivalent else "\033[91mFALHOU\033[0m"
+            print(f"\nA={input_a} B={input_b}: {status}")
+            print_folding_report("Toffoli", folding_report(circuit, folded))
+        return all_ok
+
+    def test_superposed_input_kept():
+        """Gates driven by a qubit in superposition must survive folding."""
+        circuit = QuantumCircuit(3)
+        circuit.h(0)
+        circuit.x(1)
+        circuit.ccx(0, 1, 2)
+        folded = fold_constants(circuit)
+        equivalent = Statevector(circuit).equiv(Statevector(folded))
+        print(f"\nSuperposed control: {'OK' if equivalent else 'FALHOU'} -> {dict(folded.count_ops())}")
+        return equivalent
+
+    results = [test_full_adder_folding(), test_toffoli_folding(), test_superposed_input_kept()]
+    print("\nTodos os testes OK! ✅" if all(results) else "\nAlgum teste FALHOU! ❌")
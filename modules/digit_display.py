@@ -4,9 +4,25 @@ Digit Display Module
 Large, bold digit rendering for OLED displays
 """
 
-def draw_large_digit(draw, digit, x, y, size=6):
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import OLED_CONFIG
+
+# Rendered glyph bitmaps keyed by (glyph, size)
+_glyph_cache = {}
+
+# Finished 'EXP. X' splash page bytes keyed by (exp number, width, height, size)
+_splash_cache = {}
+
+# Bump when the splash layout changes, so persisted splashes are rebuilt
+SPLASH_VERSION = 1
+
+def _render_large_digit(draw, digit, x, y, size=6):
     """
-    Draw a large, bold digit using thick lines
+    Render a large, bold digit using thick lines
     
     Args:
         draw: PIL ImageDraw object
@@ -115,9 +131,9 @@ def draw_large_digit(draw, digit, x, y, size=6):
         # Right vertical (full)
         draw.rectangle([x + width - thick, y, x + width, y + height], fill=255)
 
-def draw_plus_sign(draw, x, y, size=6):
+def _render_plus_sign(draw, x, y, size=6):
     """
-    Draw a large, bold plus sign
+    Render a large, bold plus sign
     
     Args:
         draw: PIL ImageDraw object
@@ -134,8 +150,8 @@ def draw_plus_sign(draw, x, y, size=6):
     # Vertical line
     draw.rectangle([x + width//2 - thick//2, y, x + width//2 + thick//2, y + height], fill=255)
 
-def draw_letter_e(draw, x, y, size=6):
-    """Draw the letter E"""
+def _render_letter_e(draw, x, y, size=6):
+    """Render the letter E"""
     thick = size
     width = size * 3
     height = size * 5
@@ -149,8 +165,8 @@ def draw_letter_e(draw, x, y, size=6):
     # Bottom horizontal
     draw.rectangle([x, y + height - thick, x + width, y + height], fill=255)
 
-def draw_letter_x(draw, x, y, size=6):
-    """Draw the letter X"""
+def _render_letter_x(draw, x, y, size=6):
+    """Render the letter X"""
     thick = size
     width = size * 3
     height = size * 5
@@ -166,8 +182,8 @@ def draw_letter_x(draw, x, y, size=6):
         rect_x = x + width - thick - (i * width) // height
         draw.rectangle([rect_x, y + i, rect_x + thick, y + i + thick], fill=255)
 
-def draw_letter_p(draw, x, y, size=6):
-    """Draw the letter P"""
+def _render_letter_p(draw, x, y, size=6):
+    """Render the letter P"""
     thick = size
     width = size * 3
     height = size * 5
@@ -181,16 +197,224 @@ def draw_letter_p(draw, x, y, size=6):
     # Right vertical (top half only)
     draw.rectangle([x + width - thick, y, x + width, y + height//2 + thick//2], fill=255)
 
-def draw_dot(draw, x, y, size=6):
-    """Draw a dot/period"""
+def _render_dot(draw, x, y, size=6):
+    """Render a dot/period"""
     thick = size
     # Draw a small square for the dot
     draw.rectangle([x, y, x + thick, y + thick], fill=255)
 
+# Glyph renderers with bitmap size and left margin (multiples of size). The X
+# diagonals overhang its nominal 3-unit width on both sides, hence its margin.
+_GLYPH_RENDERERS = {
+    '+': (_render_plus_sign, 3, 3, 0),
+    'E': (_render_letter_e, 3, 5, 0),
+    'X': (_render_letter_x, 5, 5, 1),
+    'P': (_render_letter_p, 3, 5, 0),
+    '.': (_render_dot, 1, 1, 0),
+}
+
+def get_glyph(glyph, size=6):
+    """
+    Get the cached 1-bit bitmap of a glyph, rendering it on first use
+    
+    Args:
+        glyph: Digit (0-9) or one of '+', 'E', 'X', 'P', '.'
+        size (int): Size multiplier for the glyph
+    
+    Returns:
+        tuple: (PIL 1-bit bitmap with the glyph's lit pixels, left margin in pixels)
+    """
+    key = (glyph, size)
+    cached = _glyph_cache.get(key)
+    
+    if cached is None:
+        from PIL import Image, ImageDraw
+        
+        if glyph in _GLYPH_RENDERERS:
+            render, width, height, margin = _GLYPH_RENDERERS[glyph]
+            render_glyph = lambda draw, x: render(draw, x, 0, size)
+        else:
+            width, height, margin = 4, 6, 0
+            render_glyph = lambda draw, x: _render_large_digit(draw, glyph, x, 0, size)
+        
+        # +1 because rectangle corners are inclusive
+        bitmap = Image.new("1", (size * width + 1, size * height + 1))
+        render_glyph(ImageDraw.Draw(bitmap), size * margin)
+        cached = (bitmap, size * margin)
+        _glyph_cache[key] = cached
+    
+    return cached
+
+def draw_glyph(draw, glyph, x, y, size=6):
+    """Paste a cached glyph bitmap at (x, y), lighting only its pixels."""
+    bitmap, margin = get_glyph(glyph, size)
+    draw.bitmap((x - margin, y), bitmap, fill=255)
+
+def draw_large_digit(draw, digit, x, y, size=6):
+    """
+    Draw a large, bold digit using thick lines
+    
+    Args:
+        draw: PIL ImageDraw object
+        digit (int): The digit to draw (0-9)
+        x (int): X position to start drawing
+        y (int): Y position to start drawing
+        size (int): Size multiplier for the digit (default 3)
+    """
+    draw_glyph(draw, digit, x, y, size)
+
+def draw_plus_sign(draw, x, y, size=6):
+    """
+    Draw a large, bold plus sign
+    
+    Args:
+        draw: PIL ImageDraw object
+        x (int): X position to start drawing
+        y (int): Y position to start drawing
+        size (int): Size multiplier for the plus sign (default 3)
+    """
+    draw_glyph(draw, '+', x, y, size)
+
+def draw_letter_e(draw, x, y, size=6):
+    """Draw the letter E"""
+    draw_glyph(draw, 'E', x, y, size)
+
+def draw_letter_x(draw, x, y, size=6):
+    """Draw the letter X"""
+    draw_glyph(draw, 'X', x, y, size)
+
+def draw_letter_p(draw, x, y, size=6):
+    """Draw the letter P"""
+    draw_glyph(draw, 'P', x, y, size)
+
+def draw_dot(draw, x, y, size=6):
+    """Draw a dot/period"""
+    draw_glyph(draw, '.', x, y, size)
+
+def render_exp_x_splash(exp_number, width=128, height=64, size=4):
+    """
+    Draw the 'EXP. X' splash screen
+    
+    Args:
+        exp_number (int): Experiment number (1, 2, 3, etc.)
+        width (int): Display width in pixels (default 128)
+        height (int): Display height in pixels (default 64)
+        size (int): Size multiplier for the text (default 4)
+    
+    Returns:
+        Image: 1-bit PIL image of the whole screen
+    """
+    from PIL import Image, ImageDraw
+    
+    # Create image and draw object
+    image = Image.new("1", (width, height))
+    draw = ImageDraw.Draw(image)
+    
+    # Clear the display first
+    draw.rectangle([0, 0, width, height], fill=0)
+    
+    # Calculate dimensions
+    letter_width = size * 3
+    letter_height = size * 5
+    digit_width = size * 4
+    spacing = size * 2
+    dot_width = size
+    
+    # Calculate total width: E + X + P + . + (space) + digit
+    total_width = letter_width + spacing + letter_width + spacing + letter_width + spacing + dot_width + spacing + spacing + digit_width
+    
+    # Calculate starting position to center the text
+    start_x = (width // 2) - (total_width // 2)
+    start_y = (height // 2) - (letter_height // 2)
+    
+    # Draw each character
+    current_x = start_x
+    
+    # Draw "E"
+    draw_letter_e(draw, current_x, start_y, size)
+    current_x += letter_width + spacing
+    
+    # Draw "X"
+    draw_letter_x(draw, current_x, start_y, size)
+    current_x += letter_width + spacing
+    
+    # Draw "P"
+    draw_letter_p(draw, current_x, start_y, size)
+    current_x += letter_width + spacing
+    
+    # Draw "."
+    draw_dot(draw, current_x, start_y + letter_height - size, size)
+    current_x += dot_width + spacing
+    
+    # Add extra space before the number
+    current_x += spacing
+    
+    # Draw the experiment number
+    draw_large_digit(draw, exp_number, current_x, start_y - (size * 6 - letter_height) // 2, size)
+    
+    return image
+
+def _splash_path(cache_dir, key):
+    exp_number, width, height, size = key
+    return os.path.join(cache_dir, f"exp{exp_number}_{width}x{height}_s{size}_v{SPLASH_VERSION}.bin")
+
+def get_exp_x_splash(exp_number, width=128, height=64, size=4, persist=True):
+    """
+    Get the finished 'EXP. X' splash as SSD1306 page bytes
+    
+    Rendered once per (exp number, resolution, size) and kept in memory.
+    With persist and OLED_CONFIG['SPLASH_CACHE_DIR'] set, the page bytes
+    are also saved to disk, so later runs skip rendering entirely.
+    
+    Args:
+        exp_number (int): Experiment number (1, 2, 3, etc.)
+        width (int): Display width in pixels (default 128)
+        height (int): Display height in pixels (default 64)
+        size (int): Size multiplier for the text (default 4)
+        persist (bool): Load and save the splash in the cache directory (default True)
+    
+    Returns:
+        bytes: width * height // 8 bytes in page order
+    """
+    key = (exp_number, width, height, size)
+    pages = _splash_cache.get(key)
+    if pages is not None:
+        return pages
+    
+    cache_dir = OLED_CONFIG.get('SPLASH_CACHE_DIR') if persist else None
+    path = _splash_path(cache_dir, key) if cache_dir else None
+    
+    if path and os.path.exists(path):
+        with open(path, 'rb') as cached:
+            pages = cached.read()
+        if len(pages) != width * height // 8:
+            pages = None  # Truncated or foreign file: render again
+    
+    if pages is None:
+        from modules.page_canvas import image_to_pages
+        
+        pages = image_to_pages(render_exp_x_splash(exp_number, width, height, size))
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write then rename, so another run never reads a half-written file
+                with open(path + '.tmp', 'wb') as cached:
+                    cached.write(pages)
+                os.replace(path + '.tmp', path)
+            except OSError as e:
+                print(f"⚠️  Could not save splash cache {path}: {e}")
+    
+    _splash_cache[key] = pages
+    return pages
+
 def show_exp_x_display(display, exp_number, width=128, height=64, size=4, duration=None):
     """
     Generic function to display 'EXP. X' on the OLED screen for specified duration
     
+    The splash comes from get_exp_x_splash(), so after the first call it is
+    a single buffer push. Displays without frame() (a bare driver) get the
+    rendered image instead.
+    
     Args:
         display: OLED display object
         exp_number (int): Experiment number (1, 2, 3, etc.)
@@ -200,57 +424,13 @@ def show_exp_x_display(display, exp_number, width=128, height=64, size=4, durati
         duration (int): Duration to show in seconds (default 3)
     """
     try:
-        from PIL import Image, ImageDraw
         import time
         
-        # Create image and draw object
-        image = Image.new("1", (width, height))
-        draw = ImageDraw.Draw(image)
-        
-        # Clear the display first
-        draw.rectangle([0, 0, width, height], fill=0)
-        
-        # Calculate dimensions
-        letter_width = size * 3
-        letter_height = size * 5
-        digit_width = size * 4
-        spacing = size * 2
-        dot_width = size
-        
-        # Calculate total width: E + X + P + . + (space) + digit
-        total_width = letter_width + spacing + letter_width + spacing + letter_width + spacing + dot_width + spacing + spacing + digit_width
-        
-        # Calculate starting position to center the text
-        start_x = (width // 2) - (total_width // 2)
-        start_y = (height // 2) - (letter_height // 2)
-        
-        # Draw each character
-        current_x = start_x
-        
-        # Draw "E"
-        draw_letter_e(draw, current_x, start_y, size)
-        current_x += letter_width + spacing
-        
-        # Draw "X"
-        draw_letter_x(draw, current_x, start_y, size)
-        current_x += letter_width + spacing
-        
-        # Draw "P"
-        draw_letter_p(draw, current_x, start_y, size)
-        current_x += letter_width + spacing
-        
-        # Draw "."
-        draw_dot(draw, current_x, start_y + letter_height - size, size)
-        current_x += dot_width + spacing
-        
-        # Add extra space before the number
-        current_x += spacing
-        
-        # Draw the experiment number
-        draw_large_digit(draw, exp_number, current_x, start_y - (size * 6 - letter_height) // 2, size)
-        
         # Update display
-        display.image(image)
+        if hasattr(display, 'frame'):
+            display.frame(get_exp_x_splash(exp_number, width, height, size))
+        else:
+            display.image(render_exp_x_splash(exp_number, width, height, size))
         display.show()
         print(f"✅ 'EXP. {exp_number}' displayed on OLED")
         
@@ -267,3 +447,103 @@ def show_exp_x_display(display, exp_number, width=128, height=64, size=4, durati
     except Exception as e:
         print(f"⚠️  OLED display error: {e}")
         print("  - Check OLED wiring and I2C configuration")
+
+if __name__ == '__main__':
+    import time
+    from PIL import Image, ImageDraw
+    
+    WIDTH, HEIGHT = 128, 64
+    
+    def draw_equation(draw, left_number, right_number, digit_fn, plus_fn, clear=True):
+        """Equation frame as drawn by exp2's display_equation (size 4)."""
+        if clear:
+            draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+        start_x = (WIDTH - (16 + 6 + 12 + 6 + 16)) // 2
+        start_y = (HEIGHT - 24) // 2
+        digit_fn(draw, left_number, start_x, start_y, size=4)
+        plus_fn(draw, start_x + 22, start_y + 6, size=4)
+        digit_fn(draw, right_number, start_x + 40, start_y, size=4)
+    
+    # Cached glyphs must produce exactly the same pixels as the rectangle renderers
+    mismatches = []
+    renderers = [(digit, _render_large_digit, draw_large_digit) for digit in range(10)]
+    renderers += [(name, lambda d, g, x, y, size, r=render: r(d, x, y, size),
+                   lambda d, g, x, y, size, f=fn: f(d, x, y, size))
+                  for name, render, fn in (('+', _render_plus_sign, draw_plus_sign),
+                                           ('E', _render_letter_e, draw_letter_e),
+                                           ('X', _render_letter_x, draw_letter_x),
+                                           ('P', _render_letter_p, draw_letter_p),
+                                           ('.', _render_dot, draw_dot))]
+    for glyph, render, cached in renderers:
+        for size in (2, 3, 4, 6):
+            for x, y in ((0, 0), (50, 20), (-3, -2), (120, 60)):
+                expected = Image.new("1", (WIDTH, HEIGHT))
+                actual = Image.new("1", (WIDTH, HEIGHT))
+                render(ImageDraw.Draw(expected), glyph, x, y, size)
+                cached(ImageDraw.Draw(actual), glyph, x, y, size)
+                if expected.tobytes() != actual.tobytes():
+                    mismatches.append((glyph, size, x, y))
+    print(f"Glyph cache identical to rectangle rendering: {not mismatches} {mismatches[:5]}")
+    
+    # Microbenchmark: equation frame render time. Both variants run interleaved and
+    # the best of several rounds is kept, so machine noise does not decide the result;
+    # the glyphs are also timed without the full-screen clear that both paths share.
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    frames = 2000
+    variants = (("rectangles", _render_large_digit, _render_plus_sign),
+                ("glyph cache", draw_large_digit, draw_plus_sign))
+    best = {}
+    for _ in range(7):
+        for name, digit_fn, plus_fn in variants:
+            for clear in (True, False):
+                start = time.perf_counter()
+                for frame in range(frames):
+                    if clear:
+                        draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+                    draw_equation(draw, frame % 10, (frame // 10) % 10, digit_fn, plus_fn, clear=False)
+                elapsed = (time.perf_counter() - start) / frames
+                key = (name, clear)
+                best[key] = min(best.get(key, elapsed), elapsed)
+    for name, _, _ in variants:
+        print(f"Equation frame ({name}): {best[(name, True)] * 1e6:.1f} µs "
+              f"(glyphs only {best[(name, False)] * 1e6:.1f} µs)")
+    
+    # 'EXP. X' letters, where X costs one rectangle per row on each diagonal
+    for name, letter_fns in (("rectangles", (_render_letter_e, _render_letter_x, _render_letter_p)),
+                             ("glyph cache", (draw_letter_e, draw_letter_x, draw_letter_p))):
+        start = time.perf_counter()
+        for frame in range(frames):
+            for index, letter_fn in enumerate(letter_fns):
+                letter_fn(draw, index * 20, 10, 4)
+        elapsed = (time.perf_counter() - start) / frames
+        print(f"EXP letters ({name}): {elapsed * 1e6:.1f} µs")
+    
+    # 'EXP. X' splash: full render per call vs cached page bytes
+    import tempfile
+    from modules.oled_display import FakeI2C, PartialRefreshDisplay
+    import adafruit_ssd1306
+    from modules.page_canvas import image_to_pages
+    
+    OLED_CONFIG['SPLASH_CACHE_DIR'] = tempfile.mkdtemp()
+    oled = PartialRefreshDisplay(adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, FakeI2C()))
+    calls = 200
+    start = time.perf_counter()
+    for _ in range(calls):
+        oled.image(render_exp_x_splash(1, WIDTH, HEIGHT))
+    rendered = (time.perf_counter() - start) / calls
+    get_exp_x_splash(1, WIDTH, HEIGHT)
+    start = time.perf_counter()
+    for _ in range(calls):
+        oled.frame(get_exp_x_splash(1, WIDTH, HEIGHT))
+    cached = (time.perf_counter() - start) / calls
+    print(f"Splash render + convert: {rendered * 1e6:,.0f} µs | cached push: {cached * 1e6:.2f} µs")
+    
+    # A fresh process (empty memory cache) reads the persisted file
+    expected = image_to_pages(render_exp_x_splash(1, WIDTH, HEIGHT))
+    _splash_cache.clear()
+    start = time.perf_counter()
+    persisted = get_exp_x_splash(1, WIDTH, HEIGHT)
+    loaded = time.perf_counter() - start
+    print(f"Persisted splash load: {loaded * 1e6:.0f} µs, identical: {persisted == expected}, "
+          f"files: {os.listdir(OLED_CONFIG['SPLASH_CACHE_DIR'])}")
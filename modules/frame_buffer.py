@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Frame Buffer Module
+Preallocated double-buffered images for per-tick OLED frame composition
+"""
+
+from PIL import Image, ImageDraw
+
+
+class DoubleBuffer:
+    """
+    Two preallocated 1-bit images with their draw contexts, used in turn
+
+    begin() clears the back image and returns its draw context; present()
+    hands the finished image to the display and flips to the other image.
+    Nothing is allocated per frame, and the image just presented is left
+    untouched until the frame after next.
+    """
+
+    def __init__(self, width=128, height=64):
+        """
+        Args:
+            width (int): Display width in pixels (default 128)
+            height (int): Display height in pixels (default 64)
+        """
+        self.width = width
+        self.height = height
+        self.images = [Image.new("1", (width, height)) for _ in range(2)]
+        self.draws = [ImageDraw.Draw(image) for image in self.images]
+        self.box = (0, 0, width, height)
+        self.back = 0
+
+    @property
+    def image(self):
+        """Image currently being composed."""
+        return self.images[self.back]
+
+    def begin(self):
+        """
+        Start a new frame on the back buffer
+
+        Returns:
+            ImageDraw: Draw context of the cleared back image
+        """
+        self.images[self.back].paste(0, self.box)
+        return self.draws[self.back]
+
+    def present(self, display, image=None):
+        """
+        Send a frame to the display and flip buffers
+
+        Args:
+            display: Object with image() and show() (driver, wrapper or pipeline)
+            image (Image): Frame to send instead of the back buffer, e.g. a
+                prerendered one (default: the back buffer)
+        """
+        display.image(self.images[self.back] if image is None else image)
+        display.show()
+        self.back ^= 1
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tracemalloc
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+    from modules.digit_display import draw_large_digit, draw_plus_sign
+
+    WIDTH, HEIGHT = 128, 64
+    TICKS = 900  # 30 seconds at 30 FPS
+
+    class NullDisplay:
+        """Takes frames like the display pipeline and keeps the last one."""
+        def image(self, image):
+            self.last = image
+
+        def show(self):
+            pass
+
+    def draw_equation(draw, tick):
+        """exp2's equation screen, digits changing every second."""
+        draw_large_digit(draw, (tick // 30) % 10, 39, 20, size=4)
+        draw_plus_sign(draw, 61, 26, size=4)
+        draw_large_digit(draw, 7, 79, 20, size=4)
+
+    def measure(compose_tick):
+        """Average Python heap allocated per tick, from tracemalloc's peak above baseline."""
+        display = NullDisplay()
+        for tick in range(30):  # Warm up the glyph cache
+            compose_tick(display, tick)
+
+        tracemalloc.start()
+        total = 0
+        for tick in range(TICKS):
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            compose_tick(display, tick)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - baseline
+        tracemalloc.stop()
+        return total / TICKS
+
+    def per_tick_allocation(display, tick):
+        """Original path: new image and draw context on every tick."""
+        image = Image.new("1", (WIDTH, HEIGHT))
+        draw = ImageDraw.Draw(image)
+        draw_equation(draw, tick)
+        display.image(image)
+        display.show()
+
+    frames = DoubleBuffer(WIDTH, HEIGHT)
+
+    def double_buffered(display, tick):
+        draw = frames.begin()
+        draw_equation(draw, tick)
+        frames.present(display)
+
+    before = measure(per_tick_allocation)
+    after = measure(double_buffered)
+    print(f"Image.new per tick: {before:,.0f} B/tick ({before * 30 / 1024:,.1f} KiB/s at 30 FPS)")
+    print(f"double buffered:    {after:,.0f} B/tick ({after * 30 / 1024:,.1f} KiB/s at 30 FPS)")
+    print(f"(plus the {WIDTH * HEIGHT // 8} B pixel buffer Pillow mallocs per Image.new, "
+          f"invisible to tracemalloc)")
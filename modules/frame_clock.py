@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Frame Clock Module
+Fixed-rate loop timing against absolute deadlines, with frame skipping and stats
+"""
+
+import time
+
+
+class FrameClock:
+    """
+    Pace an animation loop at a fixed frame period without drift
+
+    A loop that works and then sleeps a fixed period runs slower than its
+    target by the work time, and the error adds up. The frame clock keeps
+    a grid of absolute deadlines (start + n * period) instead: tick()
+    sleeps only for what is left of the current frame. When a frame runs
+    past its deadline the next one starts at once, and if whole frame slots
+    were missed they are skipped rather than replayed in a burst. tick()
+    returns how many frame slots passed, so animations can advance by
+    elapsed time instead of by loop iterations. A sleep that another thread
+    cuts short (Event.wait) is not a frame: tick() returns 0, keeps the
+    deadline and leaves the timing stats alone.
+
+    Stats accumulate across start() calls, so one clock per loop can be
+    reported when the program exits.
+    """
+
+    def __init__(self, period, name="loop", sleep=time.sleep):
+        """
+        Args:
+            period (float): Frame period in seconds (e.g. 1 / 30)
+            name (str): Loop name used in print_stats()
+            sleep (callable): Waits for a timeout in seconds (default time.sleep);
+                pass threading.Event.wait to let another thread end a frame early
+        """
+        self.period = period
+        self.name = name
+        self.sleep = sleep
+        self.deadline = None
+        self.last_tick = None
+        self.stats = {
+            'frames': 0,         # Completed frames (tick() calls not interrupted)
+            'skipped': 0,        # Frame slots dropped because the loop was behind
+            'overruns': 0,       # Frames that ended after their deadline
+            'interrupted': 0,    # Waits ended early by another thread (not frames)
+            'active_time': 0.0,  # Seconds spent inside started loops
+            'jitter_total': 0.0, # Wake-up error on on-time frames, summed
+            'max_jitter': 0.0
+        }
+
+    def start(self):
+        """Start a new run of the loop; the first deadline is one period from now."""
+        self.last_tick = time.perf_counter()
+        self.deadline = self.last_tick + self.period
+
+    def tick(self):
+        """
+        Wait for the end of the current frame
+
+        Returns:
+            int: Frame slots that passed (1 when on time, more after skipping,
+                0 when the wait was interrupted before the deadline)
+        """
+        if self.deadline is None:
+            self.start()
+
+        stats = self.stats
+        now = time.perf_counter()
+
+        if now <= self.deadline:
+            self.sleep(self.deadline - now)
+            woke = time.perf_counter()
+            if woke < self.deadline:
+                # Woken early: the frame is not over, and the partial wait is not counted
+                stats['interrupted'] += 1
+                return 0
+            jitter = woke - self.deadline
+            stats['jitter_total'] += jitter
+            stats['max_jitter'] = max(stats['max_jitter'], jitter)
+            self.deadline += self.period
+            advanced = 1
+        else:
+            # Behind: start the next frame right away and drop any slots already missed
+            missed = int((now - self.deadline) // self.period)
+            stats['overruns'] += 1
+            stats['skipped'] += missed
+            self.deadline += (missed + 1) * self.period
+            advanced = missed + 1
+            woke = now
+
+        stats['frames'] += 1
+        stats['active_time'] += woke - self.last_tick
+        self.last_tick = woke
+        return advanced
+
+    def get_stats(self):
+        """
+        Get timing stats
+
+        Returns:
+            dict: Counters plus target and actual FPS and average jitter
+        """
+        stats = dict(self.stats)
+        frames = stats['frames']
+        on_time = frames - stats['overruns']
+        stats['target_fps'] = 1.0 / self.period
+        stats['fps'] = frames / stats['active_time'] if stats['active_time'] > 0 else 0.0
+        stats['avg_jitter'] = stats['jitter_total'] / on_time if on_time else 0.0
+        return stats
+
+    def print_stats(self):
+        """Print achieved rate, jitter and overruns."""
+        stats = self.get_stats()
+        if stats['frames'] == 0:
+            return
+        print(f"⏲️  {self.name}: {stats['fps']:.1f}/{stats['target_fps']:.1f} FPS, "
+              f"jitter avg {stats['avg_jitter'] * 1000:.2f} ms (max {stats['max_jitter'] * 1000:.2f}), "
+              f"{stats['overruns']} overruns, {stats['skipped']} frames skipped"
+              + (f", {stats['interrupted']} waits interrupted" if stats['interrupted'] else ""))
+
+
+if __name__ == "__main__":
+    import random
+
+    PERIOD = 1 / 30
+    FRAMES = 90
+
+    def work():
+        """Render time between 5 and 25 ms, with an occasional 80 ms stall."""
+        time.sleep(0.08 if random.random() < 0.05 else random.uniform(0.005, 0.025))
+
+    random.seed(1)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        work()
+        time.sleep(PERIOD)
+    fixed_fps = FRAMES / (time.perf_counter() - start)
+    print(f"work + sleep(1/30): {fixed_fps:.1f} FPS")
+
+    random.seed(1)
+    clock = FrameClock(PERIOD, "frame clock")
+    clock.start()
+    slots = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        work()
+        slots += clock.tick()
+    elapsed = time.perf_counter() - start
+    print(f"{slots} frame slots in {elapsed:.2f} s (expected {elapsed / PERIOD:.0f})")
+    clock.print_stats()
@@ -26,9 +26,29 @@ LED_CONFIG = {
     'PIN': PINS['LED_STRIP'],
     'FREQ_HZ': 800000,
     'DMA': 10,
-    'BRIGHTNESS': 200,
+    'BRIGHTNESS': 200,            # Applied through the color correction tables (led_color)
+    'GAMMA': 2.8,                 # Gamma exponent, or (red, green, blue) exponents
     'INVERT': False,
-    'CHANNEL': 0
+    'CHANNEL': 0,
+    'FRAME_CACHE_BYTES': 1 << 20,  # Precomputed pattern cycles kept in memory (1 MiB)
+    'FADE_TIME': 0.3,              # Crossfade between LED states in seconds (0: hard cut)
+    'FADE_PERIOD': 0.02,           # Seconds per crossfade frame (50 FPS)
+    'EXTRA_STRIPS': [],            # More physical strips, each overriding COUNT/PIN/DMA/CHANNEL above,
+                                   # e.g. {'COUNT': 300, 'PIN': 13, 'DMA': 11, 'CHANNEL': 1}
+    'BACKEND': 'ws281x',           # 'ws281x' (rpi_ws281x on the GPIO pin) or 'virtual' (headless, frames recorded)
+    'VIRTUAL': {
+        'SIMULATE_TIMING': True,   # show() takes as long as the WS2812B transfer would
+        'MAX_FRAMES': 10000,       # Recorded frames kept in memory per strip
+        'TIMELINE_PATH': None      # Save the recording as an image on exit (one per strip: _<channel> added)
+    }
+}
+
+# Logical LED segments: name -> (strip index, first LED, LED count). Every strip is also
+# a segment of its own, 'strip0', 'strip1', ...
+_half = LED_CONFIG['COUNT'] // 2
+LED_CONFIG['SEGMENTS'] = {
+    'input_a': (0, 0, _half),                             # exp3 input A: first half
+    'input_b': (0, _half, LED_CONFIG['COUNT'] - _half)    # exp3 input B: second half
 }
 
 # OLED Display Configuration
@@ -36,7 +56,16 @@ OLED_CONFIG = {
     'WIDTH': 128,
     'HEIGHT': 64,
     'I2C_SCL': PINS['I2C_SCL'],
-    'I2C_SDA': PINS['I2C_SDA']
+    'I2C_SDA': PINS['I2C_SDA'],
+    'FULL_REFRESH_RATIO': 0.5,  # Send a full frame when more than this fraction changed
+    'SPLASH_CACHE_DIR': './assets/compiled/splash',  # Persisted 'EXP. X' splashes (None: memory only)
+    'BACKEND': 'ssd1306',       # 'ssd1306' (I2C panel) or 'virtual' (headless, frames recorded)
+    'VIRTUAL': {
+        'I2C_FREQUENCY': None,  # Simulated bus clock in Hz (e.g. 400000), None for full speed
+        'MAX_FRAMES': 3000,     # Recorded frames kept in memory (about 1 KB each)
+        'SNAPSHOT_DIR': None,   # Write every frame as a PNG here
+        'GIF_PATH': None        # Save the recorded frames as an animated GIF on exit
+    }
 }
 
 # Experiment-specific configurations
@@ -65,7 +94,8 @@ EXPERIMENT_CONFIG = {
 ANIMATION_CONFIG = {
     'SPRITE_SIZE': (64, 64),
     'FRAMES': 30,
-    'ATOM_ICON_PATH': './assets/icons/atom.bmp'
+    'ATOM_ICON_PATH': './assets/icons/atom.bmp',
+    'ATOM_ASSET_PATH': './assets/compiled/atom.spr'  # Built by scripts/build_assets.py
 }
 
 # Timing configurations (in seconds)
@@ -75,7 +105,18 @@ TIMING_CONFIG = {
     'CONTROLLER_BUTTON_DEBOUNCE': 0.5,
     'CONTROLLER_HOLD_DURATION': 5.0,
     'LED_ANIMATION_SPEED': 0.05,  # 20 FPS
-    'DISPLAY_REFRESH_RATE': 0.033  # ~30 FPS
+    'DISPLAY_REFRESH_RATE': 1 / 30,  # 30 FPS
+    'QUANTUM_BUDGET': 2.0          # Max wait for a quantum result before falling back
+}
+
+# Quantum execution settings
+QUANTUM_CONFIG = {
+    'SHOTS': 1000,
+    'CARRY_SELECT': True,          # Evaluate carry-in 0 and 1 for every bit at once
+    'CARRY_SELECT_MODE': 'batch',  # 'batch' (one Aer job) or 'pool' (process pool)
+    'WORKERS': 4,                  # Raspberry Pi 3 has four cores
+    'SCHEDULER_QUEUE': 16,         # Max circuit jobs waiting in the scheduler
+    'TABLE_SHOTS': 2048            # Shots for the superposed addition table run
 }
 
 def get_experiment_info(exp_num):
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+LED Color Module
+Gamma and brightness correction for LED frames through per-channel lookup tables
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import LED_CONFIG
+
+# Byte of each channel inside a native uint32 Color() value (0xWWRRGGBB)
+if sys.byteorder == 'little':
+    PACKED_LANES = ('blue', 'green', 'red', 'white')
+else:
+    PACKED_LANES = ('white', 'red', 'green', 'blue')
+
+RGB = ('red', 'green', 'blue')
+
+
+def channel_lut(gamma, brightness):
+    """
+    Build one channel's table: input level -> corrected output level
+
+    Args:
+        gamma (float): Gamma exponent (1.0 for linear)
+        brightness (int): Global brightness 0-255, the output for full input
+
+    Returns:
+        ndarray: 256 uint8 values
+    """
+    levels = np.arange(256) / 255.0
+    return np.round(levels ** gamma * brightness).astype(np.uint8)
+
+
+class ColorCorrection:
+    """
+    Gamma curve and global brightness as per-channel lookup tables
+
+    WS2812B LEDs are linear in PWM duty, but the eye is not: a linear ramp
+    such as exp2's int(wave * 255) rushes through the dark end and flattens
+    out near full brightness. Raising every level to a gamma exponent evens
+    the fade out, and scaling by brightness replaces the driver's own
+    brightness. Both are folded into one 256-entry table per channel, so
+    correcting a frame is a single array lookup, with no Python math per LED.
+
+    Changing the brightness rebuilds the tables (768 bytes) and does not touch
+    the driver, so it can change at runtime.
+    """
+
+    def __init__(self, gamma=None, brightness=None):
+        """
+        Args:
+            gamma (float or tuple): Exponent, or (red, green, blue) exponents
+                (default LED_CONFIG['GAMMA'])
+            brightness (int): Global brightness 0-255 (default LED_CONFIG['BRIGHTNESS'])
+        """
+        gamma = LED_CONFIG['GAMMA'] if gamma is None else gamma
+        self.gamma = dict(zip(RGB, gamma if isinstance(gamma, (tuple, list)) else (gamma,) * 3))
+        self.brightness = None
+        self.rgb_lut = np.zeros((3, 256), dtype=np.uint8)
+        self.packed_lut = np.zeros((4, 256), dtype=np.uint8)
+        self.set_brightness(LED_CONFIG['BRIGHTNESS'] if brightness is None else brightness)
+
+    def set_brightness(self, brightness):
+        """
+        Change the global brightness
+
+        Args:
+            brightness (int): 0 (off) to 255 (full)
+        """
+        brightness = max(0, min(255, int(brightness)))
+        if brightness == self.brightness:
+            return
+        self.brightness = brightness
+        luts = {name: channel_lut(self.gamma[name], brightness) for name in RGB}
+        luts['white'] = np.arange(256, dtype=np.uint8)  # No white LED on WS2812B: passed through
+        self.rgb_lut[:] = [luts[name] for name in RGB]
+        self.packed_lut[:] = [luts[name] for name in PACKED_LANES]
+
+    def apply(self, frame, out=None):
+        """
+        Correct an N x 3 uint8 frame (led_frames layout)
+
+        Args:
+            frame (ndarray): count x 3 uint8 frame
+            out (ndarray): Frame to fill instead of allocating one
+
+        Returns:
+            ndarray: Corrected count x 3 uint8 frame
+        """
+        corrected = self.rgb_lut[np.arange(3), frame]
+        if out is None:
+            return corrected
+        out[:] = corrected
+        return out
+
+    def apply_packed(self, colors, out=None):
+        """
+        Correct packed Color() values, as LEDStrip keeps them
+
+        The uint32 array is viewed as four bytes per LED and every byte goes
+        through its channel's table in one indexing operation.
+
+        Args:
+            colors (ndarray): count uint32 values
+            out (ndarray): uint32 array to fill instead of allocating one
+
+        Returns:
+            ndarray: Corrected count uint32 values
+        """
+        lanes = colors.view(np.uint8).reshape(-1, 4)
+        corrected = self.packed_lut[np.arange(4), lanes]
+        if out is None:
+            out = np.empty_like(colors)
+        out.view(np.uint8).reshape(-1, 4)[:] = corrected
+        return out
+
+
+if __name__ == "__main__":
+    import time
+
+    from modules.led_frames import pack_frame, wave_frame
+
+    def python_correct(colors, gamma, brightness):
+        """What correcting per pixel in the strip helpers would cost."""
+        corrected = []
+        for color in colors:
+            red, green, blue = (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+            red, green, blue = (round((level / 255.0) ** gamma * brightness)
+                                for level in (red, green, blue))
+            corrected.append((red << 16) | (green << 8) | blue)
+        return corrected
+
+    correction = ColorCorrection()
+    gamma = correction.gamma['red']
+    print(f"Gamma {gamma}, brightness {correction.brightness}")
+    print("  wave level:  " + " ".join(f"{level:4}" for level in (0, 32, 64, 96, 128, 160, 192, 224, 255)))
+    print("  corrected:   " + " ".join(f"{correction.rgb_lut[0][level]:4}"
+                                       for level in (0, 32, 64, 96, 128, 160, 192, 224, 255)))
+
+    # Table lookups match the per-pixel formula, in both frame layouts
+    frames = [wave_frame(60, step * 0.2) for step in range(63)]
+    matches = all(correction.apply_packed(pack_frame(frame)).tolist() ==
+                  python_correct(pack_frame(frame).tolist(), gamma, correction.brightness) and
+                  np.array_equal(pack_frame(correction.apply(frame)), correction.apply_packed(pack_frame(frame)))
+                  for frame in frames)
+    print(f"LUT output identical to per-pixel math: {matches}")
+
+    # Runtime brightness: tables rebuilt in place
+    start = time.perf_counter()
+    for level in range(256):
+        correction.set_brightness(level)
+    rebuild = (time.perf_counter() - start) / 256 * 1e6
+    correction.set_brightness(LED_CONFIG['BRIGHTNESS'])
+    print(f"Brightness change: {rebuild:.1f} µs to rebuild the tables")
+
+    print("Per-frame correction cost (µs):")
+    for count in (60, 300, 1000):
+        colors = pack_frame(wave_frame(count, 1.0))
+        out = np.empty_like(colors)
+        timings = []
+        for fn, runs in ((lambda: python_correct(colors.tolist(), gamma, correction.brightness), 50),
+                         (lambda: correction.apply_packed(colors, out=out), 2000)):
+            start = time.perf_counter()
+            for _ in range(runs):
+                fn()
+            timings.append((time.perf_counter() - start) / runs * 1e6)
+        print(f"  {count:>4} LEDs: Python {timings[0]:8.1f} | LUT {timings[1]:5.1f}")
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+LED Engine Module
+One persistent LED animation thread with a registry of named patterns
+"""
+
+import collections
+import math
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.frame_clock import FrameClock
+from modules.hardware_config import LED_CONFIG, TIMING_CONFIG
+from modules.led_frames import (BLUE, OFF, RED, alternating_frame, new_frame, pack_frame,
+                                solid_frame, wave_frame)
+from modules.led_transition import Crossfade
+
+# Pattern classes by name, filled by @register_pattern
+PATTERNS = {}
+
+# exp2's equation wave: +0.2 rad per frame, back to 0 once past 4 pi
+WAVE_STEP = 0.2
+WAVE_CYCLE = int(math.pi * 4 / WAVE_STEP) + 1  # 63 frames
+
+
+def register_pattern(name):
+    """Class decorator adding a pattern to PATTERNS under name."""
+    def register(cls):
+        cls.name = name
+        PATTERNS[name] = cls
+        return cls
+    return register
+
+
+class Pattern:
+    """
+    Base class of LED patterns
+
+    A pattern renders frame number `step` into a preallocated frame.
+    Animated patterns set period (seconds per step); static ones leave it
+    None and are rendered once per play(). Patterns that repeat declare
+    cycle, the number of steps after which frames repeat exactly, so the
+    engine can precompute them once (None: render every frame).
+    """
+
+    period = None
+    cycle = None
+
+    def __init__(self, count):
+        """
+        Args:
+            count (int): Number of LEDs
+        """
+        self.count = count
+
+    def render(self, step, out):
+        """
+        Args:
+            step (int): Frame number since the pattern started
+            out (ndarray): count x 3 frame to draw into
+
+        Returns:
+            ndarray: The rendered frame
+        """
+        raise NotImplementedError
+
+
+@register_pattern('solid')
+class SolidPattern(Pattern):
+    """Whole strip in one color (off by default)."""
+
+    cycle = 1
+
+    def __init__(self, count, color=OFF):
+        super().__init__(count)
+        self.color = color
+
+    def render(self, step, out):
+        return solid_frame(self.count, self.color, out)
+
+
+@register_pattern('alternating')
+class AlternatingPattern(Pattern):
+    """Neighboring LEDs red/blue, swapping every 0.2 s (exp1/exp2 idle and loading)."""
+
+    period = 0.2
+    cycle = 2
+
+    def render(self, step, out):
+        return alternating_frame(self.count, step, out=out)
+
+
+@register_pattern('wave')
+class WavePattern(Pattern):
+    """exp2's equation-mode sine wave, moving 0.2 rad per animation tick."""
+
+    period = TIMING_CONFIG['LED_ANIMATION_SPEED']
+    cycle = WAVE_CYCLE
+
+    def render(self, step, out):
+        return wave_frame(self.count, WAVE_STEP * (step % WAVE_CYCLE), out=out)
+
+
+@register_pattern('input_split')
+class InputSplitPattern(Pattern):
+    """exp3's inputs: first half shows input A, second half input B (blue 1, red 0)."""
+
+    cycle = 1
+
+    def __init__(self, count, input_a=False, input_b=False):
+        super().__init__(count)
+        self.input_a = input_a
+        self.input_b = input_b
+
+    def render(self, step, out):
+        half = self.count // 2
+        out[:half] = BLUE if self.input_a else RED
+        out[half:] = BLUE if self.input_b else RED
+        return out
+
+
+class FrameCache:
+    """
+    Precomputed cycles of periodic patterns, replayed from a ring
+
+    The first play of a pattern (name, parameters, LED count) renders its
+    whole cycle once into a cycle x count array of packed Color() values.
+    From then on a frame is a row lookup, handed to the strip as is.
+    Cycles are kept least-recently-used first within max_bytes; a cycle
+    bigger than the whole budget is not cached and renders live.
+    """
+
+    def __init__(self, max_bytes=None):
+        """
+        Args:
+            max_bytes (int): Memory budget (default LED_CONFIG['FRAME_CACHE_BYTES'])
+        """
+        self.max_bytes = LED_CONFIG['FRAME_CACHE_BYTES'] if max_bytes is None else max_bytes
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.stats = {'hits': 0, 'builds': 0, 'evictions': 0, 'uncached': 0}
+
+    def get(self, pattern, params):
+        """
+        Get the precomputed cycle of a pattern, building it on first use
+
+        Args:
+            pattern (Pattern): Pattern instance
+            params (dict): Parameters it was created with
+
+        Returns:
+            ndarray: cycle x count uint32 frames, or None to render live
+        """
+        key = (pattern.name, tuple(sorted(params.items())), pattern.count)
+        frames = self.entries.get(key)
+        if frames is not None:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return frames
+
+        size = (pattern.cycle or 0) * pattern.count * 4
+        if not pattern.cycle or size > self.max_bytes:
+            self.stats['uncached'] += 1
+            return None
+
+        while self.bytes + size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.stats['evictions'] += 1
+
+        frames = np.empty((pattern.cycle, pattern.count), dtype=np.uint32)
+        scratch = new_frame(pattern.count)
+        for step in range(pattern.cycle):
+            frames[step] = pack_frame(pattern.render(step, scratch))
+        self.entries[key] = frames
+        self.bytes += frames.nbytes
+        self.stats['builds'] += 1
+        return frames
+
+    def print_stats(self):
+        """Print cache memory and hit counts."""
+        stats = self.stats
+        print(f"🗃️  LED frame cache: {len(self.entries)} cycles, {self.bytes / 1024:.1f} of "
+              f"{self.max_bytes / 1024:.0f} KiB, {stats['hits']} hits, {stats['builds']} built, "
+              f"{stats['evictions']} evicted, {stats['uncached']} rendered live")
+
+
+class LEDEngine:
+    """
+    Long-lived thread that animates the strip with the current pattern
+
+    play() only records the requested pattern and wakes the thread, which
+    switches on its next frame: no thread is created or joined when the
+    display state changes. Frame waits use the pattern's FrameClock with an
+    interruptible sleep, so a switch never waits out the old pattern's
+    frame period. Static patterns are drawn once and the thread sleeps
+    until the next command. Periodic patterns are replayed from the frame
+    cache, so a steady-state frame is one row handed to the strip.
+
+    Pattern changes crossfade from what the strip shows into the new
+    pattern (which keeps animating underneath) on the fade clock. A command
+    arriving mid-fade starts a new fade from the half-blended frame.
+    """
+
+    def __init__(self, strip, cache=None):
+        """
+        Args:
+            strip (LEDStrip): Strip adapter the engine writes frames to
+            cache (FrameCache): Cache of pattern cycles (default: a new one
+                with the LED_CONFIG budget)
+        """
+        self.strip = strip
+        self.cache = FrameCache() if cache is None else cache
+        self.count = strip.numPixels()
+        self.frame = solid_frame(self.count, OFF)
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.pending = None   # (name, params, fade) requested, not yet picked up
+        self.current = None   # (name, params, fade) being played
+        self.clocks = {}      # One FrameClock per animated pattern, for stats
+        self.running = False
+        self.thread = None
+        self.stats = {'commands': 0, 'switches': 0, 'frames': 0, 'fade_frames': 0}
+
+    @property
+    def pattern_name(self):
+        """Name of the pattern requested last (None before the first play())."""
+        with self.lock:
+            command = self.pending or self.current
+        return command[0] if command else None
+
+    def start(self):
+        """Start the engine thread (once per process)."""
+        if self.thread is not None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="led-engine", daemon=True)
+        self.thread.start()
+
+    def play(self, name, fade=None, **params):
+        """
+        Switch to a pattern on the next frame (returns immediately)
+
+        Requesting the pattern that is already playing, with the same
+        parameters, is a no-op, so state loops can call this on every tick.
+
+        Args:
+            name (str): Key of PATTERNS
+            fade (float): Crossfade length in seconds, 0 for a hard cut
+                (default LED_CONFIG['FADE_TIME'])
+            **params: Pattern parameters (e.g. color=..., input_a=...)
+        """
+        if name not in PATTERNS:
+            raise ValueError(f"Unknown LED pattern '{name}' (known: {', '.join(PATTERNS)})")
+        fade = LED_CONFIG['FADE_TIME'] if fade is None else fade
+        with self.lock:
+            requested = self.pending or self.current
+            if requested is not None and requested[:2] == (name, params):
+                return
+            self.pending = (name, params, fade)
+            self.stats['commands'] += 1
+        self.wake.set()
+
+    def _run(self):
+        pattern = None
+        ring = None
+        clock = None
+        transition = None
+        step = 0
+
+        while self.running:
+            # Clear before taking the command, so a play() racing with us still wakes the next wait
+            self.wake.clear()
+            with self.lock:
+                command, self.pending = self.pending, None
+                if command is not None:
+                    self.current = command
+
+            if command is not None:
+                name, params, fade = command
+                pattern = PATTERNS[name](self.count, **params)
+                ring = self.cache.get(pattern, params)
+                step = 0
+                if fade > 0 and self.stats['frames']:
+                    # Start from what the LEDs show now, including a fade cut short
+                    transition = Crossfade(self.strip.colors, fade)
+                    clock = self._fade_clock()
+                else:
+                    transition = None
+                    clock = self._clock(pattern)
+                if clock is not None:
+                    clock.start()
+                self.stats['switches'] += 1
+
+            if pattern is None:
+                self.wake.wait()
+                continue
+
+            if transition is not None:
+                # The new pattern runs on its own time underneath the fade
+                if pattern.period is not None:
+                    step = int(transition.elapsed() / pattern.period)
+                if ring is not None:
+                    target = ring[step % len(ring)]
+                else:
+                    target = pack_frame(pattern.render(step, self.frame))
+                self.strip.write_frame(transition.blend(target))
+                self.stats['frames'] += 1
+                self.stats['fade_frames'] += 1
+                transition.advance(clock.tick())
+                if transition.done:
+                    transition = None
+                    clock = self._clock(pattern)
+                    if clock is not None:
+                        clock.start()
+                continue
+
+            if ring is not None:
+                self.strip.write_frame(ring[step % len(ring)])
+            else:
+                self.strip.write_frame(pattern.render(step, self.frame))
+            self.stats['frames'] += 1
+
+            if clock is None:
+                self.wake.wait()  # Static frame: nothing to do until the next command
+            else:
+                step += clock.tick()  # Skipped slots keep the animation on time
+
+    def _clock(self, pattern):
+        if pattern.period is None:
+            return None
+        clock = self.clocks.get(pattern.name)
+        if clock is None:
+            clock = FrameClock(pattern.period, f"LED {pattern.name}", sleep=self.wake.wait)
+            self.clocks[pattern.name] = clock
+        return clock
+
+    def _fade_clock(self):
+        clock = self.clocks.get('fade')
+        if clock is None:
+            clock = FrameClock(LED_CONFIG['FADE_PERIOD'], "LED fade", sleep=self.wake.wait)
+            self.clocks['fade'] = clock
+        return clock
+
+    def shutdown(self, clear=True):
+        """
+        Stop the engine thread (at exit) and optionally turn the LEDs off
+
+        Args:
+            clear (bool): Turn all LEDs off afterwards (default True)
+        """
+        self.running = False
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if clear:
+            self.strip.fill(OFF)
+
+    def print_stats(self):
+        """Print pattern switches, frames and per-pattern frame timing."""
+        stats = self.stats
+        print(f"🎛️  LED engine: {stats['frames']} frames ({stats['fade_frames']} crossfading), "
+              f"{stats['switches']} pattern switches ({stats['commands']} commands)")
+        self.strip.print_stats()
+        self.cache.print_stats()
+        for clock in self.clocks.values():
+            clock.print_stats()
+
+
+if __name__ == "__main__":
+    import time
+
+    from modules.led_strip import CountingStrip, LEDStrip
+
+    strip = LEDStrip(CountingStrip(60))
+    engine = LEDEngine(strip)
+    engine.start()
+
+    # exp2's state changes: equation -> loading -> result -> equation, played every display tick
+    worst = 0.0
+    for name, params, ticks in (('wave', {}, 30), ('alternating', {}, 30),
+                                ('solid', {'color': BLUE}, 20), ('wave', {}, 20)):
+        for _ in range(ticks):
+            start = time.perf_counter()
+            engine.play(name, **params)
+            worst = max(worst, time.perf_counter() - start)
+            time.sleep(1 / 30)
+
+    # Switching takes effect on the next frame, even in the middle of a 0.2 s frame (hard cut)
+    engine.play('alternating', fade=0)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    engine.play('input_split', fade=0, input_a=True, input_b=False)
+    while strip.strip.leds[0] != 0x0000FF or strip.strip.leds[59] != 0xFF0000:
+        time.sleep(0.0005)
+    switch_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+
+    # Crossfade to the result color, cut short halfway by a newer state
+    engine.play('solid', color=BLUE)
+    time.sleep(LED_CONFIG['FADE_TIME'] / 2)
+    halfway = strip.strip.leds[59]  # Red in the input split
+    engine.play('solid', color=RED)
+    while strip.strip.leds[59] != 0xFF0000 or strip.strip.leds[0] != 0xFF0000:
+        time.sleep(0.001)
+    fade_ms = (time.perf_counter() - start) * 1000
+
+    threads = threading.active_count()
+    engine.shutdown()
+    print(f"play() blocks at most {worst * 1e6:.0f} µs; switch seen on the strip after "
+          f"{switch_ms:.1f} ms; {threads} threads alive (main + engine)")
+    print(f"Fade red -> blue interrupted at #{halfway:06X}, back on red after {fade_ms:.0f} ms "
+          f"(fade time {LED_CONFIG['FADE_TIME'] * 1000:.0f} ms)")
+    engine.print_stats()
+
+    # Declared cycles must repeat exactly
+    exact = True
+    for name, params in (('solid', {'color': RED}), ('alternating', {}), ('wave', {}),
+                         ('input_split', {'input_a': True})):
+        pattern = PATTERNS[name](60, **params)
+        for step in range(pattern.cycle):
+            first = pattern.render(step, new_frame(60))
+            exact &= bool((first == pattern.render(step + pattern.cycle, new_frame(60))).all())
+    print(f"Declared pattern cycles repeat exactly: {exact}")
+
+    # Steady-state cost per tick: render + pack + write vs ring row + write
+    print("Wave tick cost (µs):")
+    for count in (60, 300, 1000):
+        cache = FrameCache()
+        target = LEDStrip(CountingStrip(count))
+        pattern = PATTERNS['wave'](count)
+        frame = new_frame(count)
+        build_start = time.perf_counter()
+        ring = cache.get(pattern, {})
+        build_ms = (time.perf_counter() - build_start) * 1000
+        ticks = 2000
+        start = time.perf_counter()
+        for step in range(ticks):
+            target.write_frame(pattern.render(step, frame))
+        live = (time.perf_counter() - start) / ticks * 1e6
+        start = time.perf_counter()
+        for step in range(ticks):
+            target.write_frame(ring[step % len(ring)])
+        cached = (time.perf_counter() - start) / ticks * 1e6
+        print(f"  {count:>4} LEDs: live {live:5.1f} | cached {cached:5.1f} "
+              f"(cycle of {len(ring)} frames: {ring.nbytes / 1024:.0f} KiB, built in {build_ms:.1f} ms)")
+
+    # Bounded memory: a 1000-LED wave cycle (246 KiB) does not fit a 128 KiB budget
+    cache = FrameCache(max_bytes=128 * 1024)
+    for count in (60, 300, 1000):
+        cache.get(PATTERNS['wave'](count), {})
+        cache.get(PATTERNS['alternating'](count), {})
+    cache.print_stats()
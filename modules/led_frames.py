@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+LED Frames Module
+NumPy frame generation for LED strip animations (one array per frame)
+"""
+
+import numpy as np
+
+# Frames are N x 3 uint8 arrays of (red, green, blue), one row per LED
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+OFF = (0, 0, 0)
+
+# Per-strip-length constants, built on first use
+_wave_offsets = {}
+_parity = {}
+
+
+def new_frame(count):
+    """
+    Allocate a dark frame
+
+    Args:
+        count (int): Number of LEDs
+
+    Returns:
+        ndarray: count x 3 uint8 array
+    """
+    return np.zeros((count, 3), dtype=np.uint8)
+
+
+def color_to_rgb(color):
+    """Split a packed Color() value (0xWWRRGGBB) into an (r, g, b) tuple."""
+    return ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+
+
+def solid_frame(count, color, out=None):
+    """
+    Every LED the same color
+
+    Args:
+        count (int): Number of LEDs
+        color (tuple): (r, g, b), or a packed Color() value
+        out (ndarray): Frame to fill instead of allocating one
+
+    Returns:
+        ndarray: count x 3 uint8 frame
+    """
+    frame = new_frame(count) if out is None else out
+    frame[:] = color_to_rgb(color) if isinstance(color, int) else color
+    return frame
+
+
+def alternating_frame(count, phase, even=RED, odd=BLUE, out=None):
+    """
+    Neighboring LEDs in opposite colors, swapped on every phase step
+
+    Phase 0 is the starting pattern of mixed_alternating_colors: even
+    LEDs red, odd LEDs blue. Phase 1 swaps them.
+
+    Args:
+        count (int): Number of LEDs
+        phase (int): Pattern phase (only its parity matters)
+        even (tuple): Color of even LEDs at phase 0 (default red)
+        odd (tuple): Color of odd LEDs at phase 0 (default blue)
+        out (ndarray): Frame to fill instead of allocating one
+
+    Returns:
+        ndarray: count x 3 uint8 frame
+    """
+    parity = _parity.get(count)
+    if parity is None:
+        parity = np.arange(count) % 2 == 1
+        _parity[count] = parity
+
+    frame = new_frame(count) if out is None else out
+    odd_lit = parity if phase % 2 == 0 else ~parity
+    frame[~odd_lit] = even
+    frame[odd_lit] = odd
+    return frame
+
+
+def wave_frame(count, position, out=None):
+    """
+    exp2's equation wave: a sine across the strip, red where positive, blue where negative
+
+    LED i shows sin(position + i / (count - 1) * 2 pi); the magnitude
+    (0-255, truncated like int()) drives the red or blue channel.
+
+    Args:
+        count (int): Number of LEDs
+        position (float): Wave phase in radians
+        out (ndarray): Frame to fill instead of allocating one
+
+    Returns:
+        ndarray: count x 3 uint8 frame
+    """
+    offsets = _wave_offsets.get(count)
+    if offsets is None:
+        offsets = np.arange(count) / float(max(count - 1, 1)) * np.pi * 2
+        _wave_offsets[count] = offsets
+
+    wave = np.sin(position + offsets)
+    intensity = (np.abs(wave) * 255).astype(np.uint8)
+    positive = wave > 0
+
+    frame = new_frame(count) if out is None else out
+    frame[:, 0] = np.where(positive, intensity, 0)
+    frame[:, 1] = 0
+    frame[:, 2] = np.where(positive, 0, intensity)
+    return frame
+
+
+def pack_frame(frame):
+    """
+    Pack a frame into Color() values (0x00RRGGBB), as rpi_ws281x stores them
+
+    Args:
+        frame (ndarray): count x 3 uint8 frame
+
+    Returns:
+        ndarray: count uint32 values
+    """
+    channels = frame.astype(np.uint32)
+    return (channels[:, 0] << 16) | (channels[:, 1] << 8) | channels[:, 2]
+
+
+if __name__ == "__main__":
+    import math
+    import time
+
+    def Color(red, green, blue, white=0):
+        """rpi_ws281x's Color(), so the benchmark runs off the Pi."""
+        return (white << 24) | (red << 16) | (green << 8) | blue
+
+    def python_wave(count, wave_position):
+        """Original equation_oscillation_thread body, minus the strip calls."""
+        colors = []
+        for i in range(count):
+            normalized_pos = i / float(count - 1)
+            wave_value = math.sin(wave_position + normalized_pos * math.pi * 2)
+            if wave_value > 0:
+                colors.append(Color(int(wave_value * 255), 0, 0))
+            else:
+                colors.append(Color(0, 0, int(-wave_value * 255)))
+        return colors
+
+    def python_alternating(count, led_colors):
+        """Original mixed_alternating_colors draw + toggle."""
+        colors = [Color(0, 0, 255) if led_colors[i] == 1 else Color(255, 0, 0)
+                  for i in range(count)]
+        for i in range(count):
+            led_colors[i] = 1 - led_colors[i]
+        return colors
+
+    def timed(fn, frames=500):
+        start = time.perf_counter()
+        for frame in range(frames):
+            fn(frame)
+        return (time.perf_counter() - start) / frames * 1e6
+
+    # Same colors as the pure-Python loops, frame for frame
+    mismatched = 0
+    for count in (60, 300):
+        led_colors = [i % 2 for i in range(count)]
+        for step in range(63):
+            position = step * 0.2
+            mismatched += python_wave(count, position) != pack_frame(wave_frame(count, position)).tolist()
+            mismatched += python_alternating(count, led_colors) != pack_frame(alternating_frame(count, step)).tolist()
+    print(f"NumPy frames identical to the Python loops: {mismatched == 0}")
+
+    print("Per-frame generation cost (µs):")
+    for count in (60, 300, 1000):
+        frame = new_frame(count)
+        led_colors = [i % 2 for i in range(count)]
+        results = (timed(lambda f: python_wave(count, f * 0.2)),
+                   timed(lambda f: pack_frame(wave_frame(count, f * 0.2, out=frame))),
+                   timed(lambda f: python_alternating(count, led_colors)),
+                   timed(lambda f: pack_frame(alternating_frame(count, f, out=frame))))
+        print(f"  {count:>4} LEDs: wave Python {results[0]:7.1f} | NumPy {results[1]:5.1f} || "
+              f"alternating Python {results[2]:7.1f} | NumPy {results[3]:5.1f}")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+LED Layout Module
+Logical LED segments mapped onto one or more physical strips (PWM channels)
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import LED_CONFIG
+from modules.led_frames import pack_frame
+from modules.led_strip import create_strip, packed_color, strip_configs
+
+
+class Segment:
+    """
+    A run of LEDs on one strip, used as if it were a strip of its own
+
+    The segment's colors are a view into the strip's frame, so writing a
+    segment costs nothing extra and show() pushes the whole strip once.
+    It has the strip interface the LED engine uses (numPixels, fill,
+    write_frame, show), so patterns sized by the segment length play on
+    any part of any strip.
+    """
+
+    def __init__(self, name, strip, start, count):
+        """
+        Args:
+            name (str): Segment name
+            strip (LEDStrip): Strip the LEDs belong to
+            start (int): First LED on the strip
+            count (int): Number of LEDs
+        """
+        if start < 0 or count <= 0 or start + count > strip.count:
+            raise ValueError(f"LED segment '{name}' ({start}..{start + count - 1}) "
+                             f"does not fit a {strip.count}-LED strip")
+        self.name = name
+        self.strip = strip
+        self.start = start
+        self.count = count
+        self.colors = strip.colors[start:start + count]
+
+    def numPixels(self):
+        return self.count
+
+    def fill(self, color, show=True):
+        """Set every LED of the segment to one color (Color() value or (r, g, b))."""
+        self.colors[:] = packed_color(color)
+        if show:
+            self.show()
+
+    def write_frame(self, frame, show=True):
+        """Load a segment-sized frame (N x 3 uint8 or N packed uint32 values)."""
+        colors = pack_frame(frame) if frame.ndim == 2 else frame
+        self.colors[:len(colors)] = colors
+        if show:
+            self.show()
+
+    def show(self):
+        self.strip.show()
+
+    def print_stats(self):
+        self.strip.print_stats()
+
+
+class LEDLayout:
+    """
+    Physical strips plus the named segments drawn on them
+
+    Each strip (one per PWM channel) is an LEDStrip and is available as
+    the segment 'strip<index>'. LED_CONFIG['SEGMENTS'] adds named ranges
+    on top, so the experiments address 'input_a' instead of LED numbers.
+    """
+
+    def __init__(self, strips, segments=None):
+        """
+        Args:
+            strips (list): LEDStrip per physical strip
+            segments (dict): name -> (strip index, first LED, count)
+                (default LED_CONFIG['SEGMENTS'])
+        """
+        self.strips = list(strips)
+        self.segments = {f"strip{index}": Segment(f"strip{index}", strip, 0, strip.count)
+                         for index, strip in enumerate(self.strips)}
+        segments = LED_CONFIG['SEGMENTS'] if segments is None else segments
+        for name, (index, start, count) in segments.items():
+            if index >= len(self.strips):
+                raise ValueError(f"LED segment '{name}' is on strip {index}, "
+                                 f"but only {len(self.strips)} strips are configured")
+            self.segments[name] = Segment(name, self.strips[index], start, count)
+
+    def segment(self, name):
+        """
+        Get a segment by name
+
+        Returns:
+            Segment: The segment
+        """
+        try:
+            return self.segments[name]
+        except KeyError:
+            raise ValueError(f"Unknown LED segment '{name}' (known: {', '.join(self.segments)})")
+
+    def begin(self):
+        for strip in self.strips:
+            strip.begin()
+
+    def fill(self, color, show=True):
+        """Set every LED on every strip to one color."""
+        for strip in self.strips:
+            strip.fill(color, show=show)
+
+    def show(self):
+        """Push every strip whose frame changed."""
+        for strip in self.strips:
+            strip.show()
+
+    def print_stats(self):
+        for strip in self.strips:
+            strip.print_stats()
+
+
+def create_layout(segments=None):
+    """
+    Open every configured strip (on LED_CONFIG['BACKEND']) and build the layout
+
+    Args:
+        segments (dict): Segment map (default LED_CONFIG['SEGMENTS'])
+
+    Returns:
+        LEDLayout: Strips not yet begun
+    """
+    return LEDLayout([create_strip(config) for config in strip_configs()], segments)
+
+
+if __name__ == "__main__":
+    import time
+
+    from modules.led_color import ColorCorrection
+    from modules.led_engine import PATTERNS, LEDEngine
+    from modules.led_frames import BLUE, RED, new_frame
+    from modules.led_strip import CountingStrip, LEDStrip
+
+    # Two channels: the 60-LED strip with exp3's input halves, and a 300-LED strip on channel 1
+    layout = LEDLayout([LEDStrip(CountingStrip(60)), LEDStrip(CountingStrip(300))],
+                       {**LED_CONFIG['SEGMENTS'], 'ring': (1, 100, 200)})
+    layout.segment('input_a').fill(BLUE, show=False)
+    layout.segment('input_b').fill(RED, show=False)
+    layout.show()
+    first = list(layout.strips[0].strip.leds)
+    split = first[:30] == [0x0000FF] * 30 and first[30:] == [0xFF0000] * 30
+
+    # A pattern on a segment is sized by the segment: the wave spans LEDs 100-299 of channel 1
+    engine = LEDEngine(layout.segment('ring'))
+    engine.start()
+    engine.play('wave')
+    time.sleep(0.2)
+    engine.shutdown(clear=False)
+    second = np.frombuffer(layout.strips[1].strip.leds, dtype=np.uint32)
+    wave_fits = not second[:100].any() and second[100:].any()
+    print(f"Input halves on channel 0: {split}; wave confined to its segment on channel 1: {wave_fits}")
+
+    # Cost per frame as the installation grows: render + pack, correction + push, and time on the wire
+    print("Wave frame cost by LED count (µs; wire = WS2812B transfer at 800 kHz):")
+    for count in (60, 150, 300, 600, 1200):
+        strip = LEDStrip(CountingStrip(count), correction=ColorCorrection())
+        pattern = PATTERNS['wave'](count)
+        frame = new_frame(count)
+        frames = 500
+        start = time.perf_counter()
+        packed = [pack_frame(pattern.render(step, frame)) for step in range(frames)]
+        render = (time.perf_counter() - start) / frames * 1e6
+        start = time.perf_counter()
+        for colors in packed:
+            strip.write_frame(colors)
+        push = (time.perf_counter() - start) / frames * 1e6
+        wire = strip.transfer_time() * 1e6
+        print(f"  {count:>5} LEDs: render {render:6.1f} | push {push:5.1f} | wire {wire:7.0f} "
+              f"-> max {1e6 / (render + push + wire):5.0f} FPS")
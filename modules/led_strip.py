@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+LED Strip Module
+Strip adapter with bulk LED buffer writes, plus a call-counting fake strip
+"""
+
+import ctypes
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import LED_CONFIG
+from modules.led_frames import color_to_rgb, pack_frame
+
+# WS2812B latch: the line held low for at least 50 us after the data
+RESET_TIME = 50e-6
+
+
+def packed_color(color):
+    """Color() value of a packed int or an (r, g, b) tuple."""
+    if isinstance(color, int):
+        return color
+    red, green, blue = color
+    return (red << 16) | (green << 8) | blue
+
+
+def led_buffer_address(strip):
+    """
+    Find the address of the strip's LED color array (uint32 per LED)
+
+    Strips that own a plain buffer (the fakes) report it with
+    buffer_address(). For rpi_ws281x the array belongs to the C channel
+    struct, whose SWIG pointer converts to an address with int().
+
+    Returns:
+        int: Address, or None when only setPixelColor() is available
+    """
+    if hasattr(strip, 'buffer_address'):
+        return strip.buffer_address()
+    try:
+        from rpi_ws281x import ws
+        return int(ws.ws2811_channel_t_leds_get(strip._channel)) or None
+    except (ImportError, AttributeError, TypeError):
+        return None
+
+
+class LEDStrip:
+    """
+    Adafruit_NeoPixel wrapper that writes whole frames at once
+
+    Each setPixelColor() is a call into the rpi_ws281x C extension, so
+    lighting a strip pixel by pixel costs one boundary crossing per LED.
+    The adapter keeps the frame in a NumPy uint32 array (Color() values)
+    and copies it into the driver's LED array with a single memmove before
+    show(). When the LED array cannot be located it falls back to one
+    setPixelColor() per LED.
+
+    show() also compares the frame with the last one pushed and skips the
+    transfer when nothing changed, so state loops can re-set a solid
+    color on every tick for free.
+
+    With a ColorCorrection the frame goes through its gamma/brightness
+    tables on the way to the driver. The frame itself stays uncorrected,
+    so brightness can change without re-rendering anything, and the driver
+    should then be opened at brightness 255.
+
+    Other calls (begin, numPixels, setBrightness, ...) go to the wrapped
+    strip, so it can replace the strip object as is.
+    """
+
+    def __init__(self, strip, correction=None):
+        """
+        Args:
+            strip: Adafruit_NeoPixel (or a fake with the same interface)
+            correction (ColorCorrection): Gamma/brightness stage (default none)
+        """
+        self.strip = strip
+        self.count = strip.numPixels()
+        self.colors = np.zeros(self.count, dtype=np.uint32)
+        self.correction = correction
+        self.output = np.zeros(self.count, dtype=np.uint32)  # Corrected frame sent to the driver
+        self.last = None     # Frame the LEDs show now (unknown at start)
+        self.address = None  # LED array, located after begin() on first write
+        self.lock = threading.Lock()  # Segments of one strip may be shown from several threads
+        self.stats = {
+            'pushed': 0,        # Frames sent to the LEDs
+            'skipped': 0,       # show() calls with an unchanged frame
+            'bulk_writes': 0,   # Frames copied with one memmove
+            'pixel_writes': 0   # setPixelColor() calls on the fallback path
+        }
+
+    def __getattr__(self, name):
+        # Everything not overridden goes to the wrapped strip
+        return getattr(self.strip, name)
+
+    def fill(self, color, show=True):
+        """
+        Set every LED to one color
+
+        Args:
+            color: Color() value or (r, g, b)
+            show (bool): Latch the frame right away (default True)
+        """
+        self.colors[:] = packed_color(color)
+        if show:
+            self.show()
+
+    def set_range(self, start, stop, color, show=True):
+        """Set LEDs start..stop-1 to one color (the rest keep theirs)."""
+        self.colors[start:stop] = packed_color(color)
+        if show:
+            self.show()
+
+    def write_frame(self, frame, show=True):
+        """
+        Load a whole frame
+
+        Args:
+            frame (ndarray): N x 3 uint8 (led_frames) or N packed uint32 values;
+                shorter frames leave the remaining LEDs unchanged
+            show (bool): Latch the frame right away (default True)
+        """
+        colors = pack_frame(frame) if frame.ndim == 2 else frame
+        self.colors[:len(colors)] = colors
+        if show:
+            self.show()
+
+    def setPixelColor(self, n, color):
+        """Single-LED update, kept in the frame like the bulk writes."""
+        self.colors[n] = color
+
+    def setPixelColorRGB(self, n, red, green, blue, white=0):
+        self.colors[n] = (white << 24) | (red << 16) | (green << 8) | blue
+
+    def getPixelColor(self, n):
+        return int(self.colors[n])
+
+    def getPixelColorRGB(self, n):
+        return color_to_rgb(int(self.colors[n]))
+
+    def setBrightness(self, brightness):
+        """Change the global brightness (correction tables or driver); the next show() is always sent."""
+        if self.correction is not None:
+            self.correction.set_brightness(brightness)
+        else:
+            self.strip.setBrightness(brightness)
+        self.invalidate()
+
+    def getBrightness(self):
+        if self.correction is not None:
+            return self.correction.brightness
+        return self.strip.getBrightness()
+
+    def invalidate(self):
+        """Forget what the LEDs show, so the next show() pushes the frame."""
+        self.last = None
+
+    def show(self):
+        """Copy the frame into the driver's LED array and latch it, unless unchanged."""
+        with self.lock:
+            if self.last is not None and np.array_equal(self.colors, self.last):
+                self.stats['skipped'] += 1
+                return
+            self._write()
+            self.strip.show()
+            if self.last is None:
+                self.last = self.colors.copy()
+            else:
+                self.last[:] = self.colors
+            self.stats['pushed'] += 1
+
+    def _write(self):
+        colors = self.colors
+        if self.correction is not None:
+            colors = self.correction.apply_packed(colors, out=self.output)
+        if self.address is None:
+            self.address = led_buffer_address(self.strip) or 0
+        if self.address:
+            ctypes.memmove(self.address, colors.ctypes.data, colors.nbytes)
+            self.stats['bulk_writes'] += 1
+        else:
+            set_pixel = self.strip.setPixelColor
+            for index, color in enumerate(colors.tolist()):
+                set_pixel(index, color)
+            self.stats['pixel_writes'] += self.count
+
+    def transfer_time(self):
+        """Seconds one show() keeps the data line busy: 24 bits per LED plus the reset latch."""
+        return self.count * 24 / LED_CONFIG['FREQ_HZ'] + RESET_TIME
+
+    def print_stats(self):
+        """Print pushed and skipped frames and how frames reached the driver."""
+        stats = self.stats
+        total = stats['pushed'] + stats['skipped']
+        share = stats['skipped'] / total * 100 if total else 0.0
+        print(f"💡 LED strip: {stats['pushed']} frames pushed, {stats['skipped']} unchanged skipped "
+              f"({share:.0f}%, {stats['skipped'] * self.transfer_time() * 1000:.0f} ms of transfers "
+              f"saved), {stats['bulk_writes']} bulk writes, {stats['pixel_writes']} setPixelColor calls")
+
+
+def strip_configs():
+    """
+    Settings of every physical strip: LED_CONFIG, then each EXTRA_STRIPS entry on top of it
+
+    Returns:
+        list: One dict per strip (COUNT, PIN, FREQ_HZ, DMA, BRIGHTNESS, INVERT, CHANNEL)
+    """
+    base = {key: LED_CONFIG[key] for key in
+            ('COUNT', 'PIN', 'FREQ_HZ', 'DMA', 'BRIGHTNESS', 'INVERT', 'CHANNEL')}
+    return [base] + [{**base, **extra} for extra in LED_CONFIG['EXTRA_STRIPS']]
+
+
+def create_strip(config=None):
+    """
+    Open one strip on the configured backend, wrapped in LEDStrip
+
+    LED_CONFIG['BACKEND'] selects 'ws281x' (rpi_ws281x on the GPIO pin) or
+    'virtual' (a VirtualStrip that records frames, so LED code runs off the
+    Pi). rpi_ws281x is only imported for the real strip. Brightness goes
+    through the gamma/brightness correction tables, so the driver is opened
+    at full scale.
+
+    Args:
+        config (dict): Strip settings, one of strip_configs() (default the first)
+
+    Returns:
+        LEDStrip: Strip, not yet begun
+    """
+    from modules.led_color import ColorCorrection
+
+    config = strip_configs()[0] if config is None else config
+    args = (config['COUNT'], config['PIN'], config['FREQ_HZ'], config['DMA'], config['INVERT'],
+            255, config['CHANNEL'])
+
+    if LED_CONFIG['BACKEND'] == 'virtual':
+        import atexit
+        from modules.virtual_strip import VirtualStrip
+
+        virtual = LED_CONFIG['VIRTUAL']
+        driver = VirtualStrip(*args, simulate_timing=virtual['SIMULATE_TIMING'],
+                              max_frames=virtual['MAX_FRAMES'])
+        if virtual['TIMELINE_PATH']:
+            root, ext = os.path.splitext(virtual['TIMELINE_PATH'])
+            atexit.register(driver.save_timeline, f"{root}_{config['CHANNEL']}{ext}")
+        atexit.register(driver.print_stats)
+    else:
+        from rpi_ws281x import Adafruit_NeoPixel
+        driver = Adafruit_NeoPixel(*args)
+
+    return LEDStrip(driver, correction=ColorCorrection(brightness=config['BRIGHTNESS']))
+
+
+class CountingStrip:
+    """
+    Fake Adafruit_NeoPixel that counts calls into the "C extension"
+
+    The LED array is a ctypes buffer, like the one rpi_ws281x allocates in
+    C, and buffer_address() exposes it for bulk writes. Every method call
+    counts as one boundary crossing.
+    """
+
+    def __init__(self, num, *args, bulk=True, **kwargs):
+        """
+        Args:
+            num (int): Number of LEDs
+            bulk (bool): Expose the LED array for bulk writes (default True)
+        """
+        self.num = num
+        self.leds = (ctypes.c_uint32 * num)()
+        self.bulk = bulk
+        self.calls = {'setPixelColor': 0, 'show': 0, 'other': 0}
+
+    def begin(self):
+        self.calls['other'] += 1
+
+    def numPixels(self):
+        self.calls['other'] += 1
+        return self.num
+
+    def setPixelColor(self, n, color):
+        self.calls['setPixelColor'] += 1
+        self.leds[n] = color
+
+    def getPixelColor(self, n):
+        self.calls['other'] += 1
+        return self.leds[n]
+
+    def show(self):
+        self.calls['show'] += 1
+
+    def setBrightness(self, brightness):
+        self.calls['other'] += 1
+
+    def buffer_address(self):
+        self.calls['other'] += 1
+        return ctypes.addressof(self.leds) if self.bulk else None
+
+    def crossings(self):
+        """Total calls made into the strip."""
+        return sum(self.calls.values())
+
+
+if __name__ == "__main__":
+    import time
+
+    from modules.led_frames import wave_frame
+
+    RED, BLUE, OFF = 0xFF0000, 0x0000FF, 0
+
+    def per_pixel_session(strip, frames):
+        """Original helpers: one setPixelColor per LED for every update."""
+        count = strip.numPixels()
+        for i in range(count):                     # clear_strip
+            strip.setPixelColor(i, OFF)
+        strip.show()
+        for i in range(30):                        # show_input_pattern
+            strip.setPixelColor(i, BLUE)
+        for i in range(30, 60):
+            strip.setPixelColor(i, RED)
+        strip.show()
+        for frame in frames:                       # wave ticks
+            for i, color in enumerate(pack_frame(frame).tolist()):
+                strip.setPixelColor(i, color)
+            strip.show()
+        for i in range(count):                     # display_result_on_leds
+            strip.setPixelColor(i, BLUE)
+        strip.show()
+
+    def adapter_session(strip, frames):
+        strip.fill(OFF)
+        strip.set_range(0, 30, BLUE, show=False)
+        strip.set_range(30, 60, RED)
+        for frame in frames:
+            strip.write_frame(frame)
+        strip.fill(BLUE)
+
+    frames = [wave_frame(60, step * 0.2) for step in range(63)]
+    results = {}
+    for name, make, session in (("per-pixel", lambda: CountingStrip(60), per_pixel_session),
+                                ("adapter bulk", lambda: LEDStrip(CountingStrip(60)), adapter_session),
+                                ("adapter fallback", lambda: LEDStrip(CountingStrip(60, bulk=False)),
+                                 adapter_session)):
+        strip = make()
+        fake = getattr(strip, 'strip', strip)
+        fake.calls = dict.fromkeys(fake.calls, 0)
+        start = time.perf_counter()
+        session(strip, frames)
+        elapsed = (time.perf_counter() - start) * 1000
+        results[name] = list(fake.leds)
+        print(f"{name:>16}: {fake.crossings():5} strip calls ({fake.calls['setPixelColor']} "
+              f"setPixelColor, {fake.calls['show']} show) in {elapsed:.2f} ms")
+    print(f"Final LED buffers identical: {len({tuple(leds) for leds in results.values()}) == 1}")
+
+    # exp2's DISPLAY_RESULT state: the loop re-sets solid blue on every 33 ms tick
+    strip = LEDStrip(CountingStrip(60))
+    strip.write_frame(frames[-1])
+    for tick in range(90):
+        strip.fill(BLUE)
+    fake = strip.strip
+    print(f"90 result ticks: {fake.calls['show']} show() reached the strip")
+    strip.print_stats()
+
+    # Gamma/brightness stage: the driver gets corrected values, the frame stays linear
+    from modules.led_color import ColorCorrection
+
+    strip = LEDStrip(CountingStrip(60), correction=ColorCorrection(brightness=255))
+    strip.write_frame(frames[15])
+    shown = list(strip.strip.leds)
+    strip.setBrightness(100)
+    strip.show()
+    print(f"Brightness 255 -> 100 without re-rendering: peak {max(shown) >> 16} -> "
+          f"{max(strip.strip.leds) >> 16}, frame unchanged: {np.array_equal(strip.colors, pack_frame(frames[15]))}")
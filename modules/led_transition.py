@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+LED Transition Module
+Crossfades between LED frames with precomputed weights and whole-frame array math
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.frame_clock import FrameClock
+from modules.hardware_config import LED_CONFIG
+from modules.led_strip import packed_color
+
+# Eased blend weights (0-256) per fade length in frames, built on first use
+_fade_weights = {}
+
+
+def fade_weights(steps):
+    """
+    Blend weight of the target for each frame of a fade
+
+    The curve is smoothstep, so a fade starts and ends gently. The last
+    weight is exactly 256, so the fade ends on the target frame.
+
+    Args:
+        steps (int): Frames in the fade
+
+    Returns:
+        ndarray: steps int32 weights, 0-256
+    """
+    weights = _fade_weights.get(steps)
+    if weights is None:
+        progress = np.arange(1, steps + 1) / steps
+        weights = np.round(progress * progress * (3 - 2 * progress) * 256).astype(np.int32)
+        _fade_weights[steps] = weights
+    return weights
+
+
+class Crossfade:
+    """
+    Blend from a snapshot of the LEDs into a target frame over a duration
+
+    Frames are packed Color() values, viewed as bytes, so each channel is
+    blended as source + (target - source) * weight / 256 over the whole
+    frame at once. The target is passed on every blend(), so it can keep
+    animating while the fade runs. Starting a new fade from whatever is on
+    the strip, even halfway through a fade, is how an interruption blends in.
+    """
+
+    def __init__(self, source, duration, period=None):
+        """
+        Args:
+            source (ndarray): Packed uint32 frame shown now (copied)
+            duration (float): Fade length in seconds
+            period (float): Seconds per fade frame (default LED_CONFIG['FADE_PERIOD'])
+        """
+        self.period = LED_CONFIG['FADE_PERIOD'] if period is None else period
+        self.steps = max(1, round(duration / self.period))
+        self.weights = fade_weights(self.steps)
+        self.step = 0
+        self.source = source.view(np.uint8).astype(np.int32)
+        self.scratch = np.empty_like(self.source)
+        self.out = np.empty_like(source)
+
+    @property
+    def done(self):
+        return self.step >= self.steps
+
+    def elapsed(self):
+        """Seconds of the fade played so far."""
+        return self.step * self.period
+
+    def advance(self, frames=1):
+        """Move on by frames (a FrameClock.tick() result)."""
+        self.step += frames
+
+    def blend(self, target):
+        """
+        Blend the current fade frame
+
+        Args:
+            target (ndarray): Packed uint32 frame being faded to
+
+        Returns:
+            ndarray: Packed uint32 frame (reused between calls)
+        """
+        weight = self.weights[min(self.step, self.steps - 1)]
+        scratch = self.scratch
+        np.subtract(target.view(np.uint8), self.source, out=scratch)
+        scratch *= weight
+        scratch >>= 8
+        scratch += self.source
+        self.out.view(np.uint8)[:] = scratch
+        return self.out
+
+
+def fade_fill(strips, color, duration=None, name="LED fade"):
+    """
+    Fade strips (or segments) to one color, blocking until done
+
+    For code without an LED engine, such as exp3's result display. The
+    fade frames are paced by a FrameClock.
+
+    Args:
+        strips (list): LEDStrip or Segment objects
+        color: Color() value or (r, g, b)
+        duration (float): Fade length in seconds (default LED_CONFIG['FADE_TIME'])
+        name (str): Clock name for stats
+
+    Returns:
+        FrameClock: The clock used, for print_stats()
+    """
+    duration = LED_CONFIG['FADE_TIME'] if duration is None else duration
+    fades = [(strip, Crossfade(strip.colors, duration),
+              np.full(len(strip.colors), packed_color(color), dtype=np.uint32)) for strip in strips]
+    clock = FrameClock(LED_CONFIG['FADE_PERIOD'], name)
+    clock.start()
+    while not all(fade.done for _, fade, _ in fades):
+        for strip, fade, target in fades:
+            strip.write_frame(fade.blend(target))
+        advanced = clock.tick()
+        for _, fade, _ in fades:
+            fade.advance(advanced)
+    return clock
+
+
+if __name__ == "__main__":
+    import time
+
+    from modules.led_frames import pack_frame, wave_frame
+    from modules.led_strip import CountingStrip, LEDStrip
+
+    def python_blend(source, target, weight):
+        """Per-pixel, per-channel blend in Python, what a naive fade loop would do."""
+        out = []
+        for src, dst in zip(source, target):
+            color = 0
+            for shift in (0, 8, 16, 24):
+                a, b = (src >> shift) & 0xFF, (dst >> shift) & 0xFF
+                color |= (a + (((b - a) * weight) >> 8)) << shift
+            out.append(color)
+        return out
+
+    red = np.full(60, 0xFF0000, dtype=np.uint32)
+    blue = np.full(60, 0x0000FF, dtype=np.uint32)
+
+    # Fades end exactly on the target and match the per-pixel formula on the way
+    fade = Crossfade(red, 0.3)
+    exact = True
+    while not fade.done:
+        wave = pack_frame(wave_frame(60, fade.step * 0.2))
+        exact &= fade.blend(wave).tolist() == python_blend(red.tolist(), wave.tolist(),
+                                                           fade.weights[fade.step])
+        fade.advance()
+    print(f"{fade.steps}-frame fade matches per-pixel math and lands on the target: "
+          f"{exact and fade.out.tolist() == wave.tolist()}")
+
+    # Interrupting: a new fade starts from the half-blended frame, no jump back
+    fade = Crossfade(red, 0.3)
+    for _ in range(fade.steps // 2):
+        middle = fade.blend(blue).copy()
+        fade.advance()
+    restart = Crossfade(middle, 0.3)
+    first = restart.blend(red)
+    jump = int(np.abs(first.view(np.uint8).astype(int) - middle.view(np.uint8).astype(int)).max())
+    print(f"Interrupted fade: largest channel step on restart {jump}/255")
+
+    # Paced by the frame clock
+    strip = LEDStrip(CountingStrip(60))
+    strip.write_frame(red)
+    start = time.perf_counter()
+    clock = fade_fill([strip], 0x0000FF, duration=0.3)
+    print(f"fade_fill: {(time.perf_counter() - start) * 1000:.0f} ms for 0.3 s, "
+          f"ends blue: {strip.strip.leds[0] == 0x0000FF}")
+    clock.print_stats()
+
+    print("Blend cost per frame (µs):")
+    for count in (60, 300, 1000):
+        source = np.full(count, 0xFF0000, dtype=np.uint32)
+        target = pack_frame(wave_frame(count, 1.0))
+        fade = Crossfade(source, 1.0)
+        timings = []
+        for fn, runs in ((lambda: python_blend(source.tolist(), target.tolist(), 128), 20),
+                         (lambda: fade.blend(target), 2000)):
+            start = time.perf_counter()
+            for _ in range(runs):
+                fn()
+            timings.append((time.perf_counter() - start) / runs * 1e6)
+        print(f"  {count:>4} LEDs: Python {timings[0]:8.1f} | NumPy {timings[1]:5.1f}")
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+OLED Display Module
+SSD1306 partial refresh wrapper and asynchronous flush pipeline
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import OLED_CONFIG
+from modules.page_canvas import image_to_pages
+
+# SSD1306 addressing commands (horizontal addressing mode)
+SET_COL_ADDR = 0x21
+SET_PAGE_ADDR = 0x22
+
+# Bytes on the wire for one addressing window: six 2-byte commands + data control byte
+WINDOW_OVERHEAD = 6 * 2 + 1
+
+
+class PartialRefreshDisplay:
+    """
+    Send only the changed SSD1306 pages and columns on show()
+
+    Frames are loaded either as PIL images (converted with image_to_pages
+    instead of the driver's per-pixel walk) or as ready page bytes with
+    frame(). A frame identical to the one already on the panel is skipped
+    outright: show() sends nothing.
+
+    The wrapper keeps a copy of the last frame that reached the panel. On
+    show() every 8-pixel-high page is compared with it; for each page that
+    differs, the column range between the first and last changed byte is
+    sent through the controller's column/page address window. When the
+    changed windows would cost more than full_refresh_ratio of a full frame,
+    the driver's regular full show() is used instead.
+
+    Drawing calls (image, fill, pixel, ...) go straight to the wrapped
+    adafruit_ssd1306.SSD1306_I2C, so it can replace the display object as is.
+    """
+
+    def __init__(self, display, full_refresh_ratio=None):
+        """
+        Args:
+            display (SSD1306_I2C): Initialized adafruit display driver
+            full_refresh_ratio (float): Fraction of a full frame above which a
+                full refresh is sent (default OLED_CONFIG['FULL_REFRESH_RATIO'])
+        """
+        if full_refresh_ratio is None:
+            full_refresh_ratio = OLED_CONFIG['FULL_REFRESH_RATIO']
+
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.pages = display.height // 8
+        self.full_refresh_ratio = full_refresh_ratio
+        # I2C buffers start with the 0x40 data control byte
+        self.offset = len(display.buffer) - self.width * self.pages
+        # Narrow panels are centered in the controller's 128 columns
+        self.col_offset = (128 - self.width) // 2 if self.width != 128 else 0
+        self.full_frame_bytes = WINDOW_OVERHEAD + self.width * self.pages
+        self.last_frame = None  # What the panel currently shows (unknown at start)
+        self.stats = {
+            'frames': 0,
+            'skipped': 0,           # Identical frames, nothing sent
+            'full': 0,
+            'partial': 0,
+            'windows': 0,
+            'bytes_sent': 0,
+            'start_time': None
+        }
+
+    def __getattr__(self, name):
+        # Everything not overridden (pixel, text, poweroff, contrast...) goes to the driver
+        return getattr(self.display, name)
+
+    def image(self, image):
+        """Copy a PIL image into the framebuffer (nothing is sent yet)."""
+        if (image.mode != "1" or image.size != (self.width, self.height)
+                or getattr(self.display, 'rotation', 0)):
+            # The driver validates the image and handles rotation
+            self.display.image(image)
+            return
+        self.frame(image_to_pages(image))
+
+    def frame(self, pages):
+        """Copy page-format bytes (PageCanvas buffer, prerendered frame) into the framebuffer."""
+        if len(pages) != self.width * self.pages:
+            raise ValueError(f"Frame must be {self.width * self.pages} bytes, got {len(pages)}")
+        self.display.buffer[self.offset:] = pages
+
+    def fill(self, color):
+        """Fill the framebuffer (nothing is sent yet)."""
+        self.display.fill(color)
+
+    def dirty_windows(self, frame):
+        """
+        Find the changed column range of every page
+
+        Args:
+            frame (bytes): Framebuffer in SSD1306 page order
+
+        Returns:
+            list: (page, first_column, last_column) for each page that changed
+        """
+        windows = []
+        width = self.width
+        last = self.last_frame
+
+        for page in range(self.pages):
+            start = page * width
+            new = frame[start:start + width]
+            old = last[start:start + width]
+            if new == old:
+                continue
+
+            # XOR of the page as one integer: lowest/highest set bit give the changed columns
+            diff = int.from_bytes(new, 'little') ^ int.from_bytes(old, 'little')
+            first = ((diff & -diff).bit_length() - 1) // 8
+            last_column = (diff.bit_length() - 1) // 8
+            windows.append((page, first, last_column))
+
+        return windows
+
+    def show(self):
+        """Send the changed part of the framebuffer to the panel."""
+        display = self.display
+        frame = bytes(display.buffer[self.offset:])
+        stats = self.stats
+
+        if stats['start_time'] is None:
+            stats['start_time'] = time.perf_counter()
+        stats['frames'] += 1
+
+        if frame == self.last_frame:
+            stats['skipped'] += 1
+            return
+
+        windows = None
+        if self.last_frame is not None and not getattr(display, 'page_addressing', False):
+            windows = self.dirty_windows(frame)
+            cost = sum(WINDOW_OVERHEAD + last - first + 1 for _, first, last in windows)
+            if cost > self.full_refresh_ratio * self.full_frame_bytes:
+                windows = None
+
+        if windows is None:
+            display.show()
+            stats['full'] += 1
+            stats['bytes_sent'] += self.full_frame_bytes
+        elif windows:
+            for page, first, last in windows:
+                self.write_window(frame, page, first, last)
+                stats['bytes_sent'] += WINDOW_OVERHEAD + last - first + 1
+            stats['partial'] += 1
+            stats['windows'] += len(windows)
+            if hasattr(display, 'refreshed'):
+                display.refreshed()  # Lets a recording backend see the update as one frame
+
+        self.last_frame = frame
+
+    def write_window(self, frame, page, first, last):
+        """Send columns first..last of one page through the address window."""
+        display = self.display
+        display.write_cmd(SET_COL_ADDR)
+        display.write_cmd(first + self.col_offset)
+        display.write_cmd(last + self.col_offset)
+        display.write_cmd(SET_PAGE_ADDR)
+        display.write_cmd(page)
+        display.write_cmd(page)
+
+        start = page * self.width
+        with display.i2c_device:
+            display.i2c_device.write(b'\x40' + frame[start + first:start + last + 1])
+
+    def invalidate(self):
+        """Forget the panel contents so the next show() is a full refresh."""
+        self.last_frame = None
+
+    def get_stats(self):
+        """
+        Get refresh counters
+
+        Returns:
+            dict: Counters plus average bytes per frame and achieved FPS
+        """
+        stats = dict(self.stats)
+        frames = stats['frames']
+        elapsed = time.perf_counter() - stats['start_time'] if frames else 0.0
+        stats['bytes_per_frame'] = stats['bytes_sent'] / frames if frames else 0.0
+        stats['fps'] = frames / elapsed if elapsed > 0 else 0.0
+        return stats
+
+    def print_stats(self):
+        """Print refresh counters."""
+        stats = self.get_stats()
+        print(f"📺 OLED refresh: {stats['frames']} frames ({stats['full']} full, "
+              f"{stats['partial']} partial, {stats['skipped']} unchanged skipped), "
+              f"{stats['bytes_per_frame']:.0f} bytes/frame, {stats['fps']:.1f} FPS")
+
+
+class DisplayPipeline:
+    """
+    Flush frames to the display on a dedicated worker thread
+
+    Producers keep the display API (image, fill, show) but show() only
+    hands the staged frame to the worker and returns at once. There is a
+    single pending slot: a frame submitted while the previous one is still
+    waiting replaces it (latest frame wins), so a slow I2C write never
+    builds up a backlog or delays the caller. Dropped frames and frame age
+    (submit to panel) are counted for tuning.
+
+    Frames are copied in page format into three preallocated buffers
+    (staged, pending and flushing) that swap roles, so submitting a
+    PageCanvas or prerendered frame allocates nothing. Staging takes the
+    same lock as the buffer swap in show(), so producers on several threads
+    (exp1's spinner and main loop) never tear a frame: each show() submits
+    one whole staged frame.
+    """
+
+    def __init__(self, display):
+        """
+        Args:
+            display (PartialRefreshDisplay): Display to flush to
+        """
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        size = self.width * (self.height // 8)
+        self.blank = bytes(size)
+        self.lit = b'\xff' * size
+        self.staged = bytearray(size)
+        self.pending = bytearray(size)
+        self.flushing = bytearray(size)
+        self.pending_time = None    # Submit time of the frame waiting for the worker
+        self.condition = threading.Condition()
+        self.running = True
+        self.worker = threading.Thread(target=self._flush_frames)
+        self.worker.daemon = True
+        self.worker.start()
+        self.stats = {
+            'submitted': 0,
+            'flushed': 0,
+            'dropped': 0,           # Replaced by a newer frame before being sent
+            'errors': 0,
+            'age_total': 0.0,       # Seconds from show() to panel, summed
+            'max_age': 0.0,
+            'flush_time': 0.0
+        }
+
+    def image(self, image):
+        """Stage a copy of a PIL image (the caller may keep drawing on it)."""
+        if image.mode != "1" or image.size != (self.width, self.height):
+            raise ValueError(f"Image must be 1-bit and {self.width}x{self.height}")
+        pages = image_to_pages(image)
+        with self.condition:
+            self.staged[:] = pages
+
+    def frame(self, pages):
+        """Stage a copy of page-format bytes (PageCanvas buffer, prerendered frame)."""
+        if len(pages) != len(self.staged):
+            raise ValueError(f"Frame must be {len(self.staged)} bytes, got {len(pages)}")
+        with self.condition:
+            self.staged[:] = pages
+
+    def fill(self, color):
+        """Stage a blank (0) or fully lit (1) frame."""
+        with self.condition:
+            self.staged[:] = self.lit if color else self.blank
+
+    def show(self):
+        """Submit the staged frame to the flush worker without waiting."""
+        with self.condition:
+            if not self.running:
+                return
+            if self.pending_time is not None:
+                self.stats['dropped'] += 1
+            self.staged, self.pending = self.pending, self.staged
+            # Keep the staged image equal to what was just submitted, so another
+            # show() without a new image() resends the same frame
+            self.staged[:] = self.pending
+            self.pending_time = time.perf_counter()
+            self.stats['submitted'] += 1
+            self.condition.notify()
+
+    def _flush_frames(self):
+        """Worker loop: always send the newest pending frame."""
+        while True:
+            with self.condition:
+                while self.pending_time is None and self.running:
+                    self.condition.wait()
+                if self.pending_time is None:
+                    return
+                self.pending, self.flushing = self.flushing, self.pending
+                submitted = self.pending_time
+                self.pending_time = None
+                pages = self.flushing
+
+            started = time.perf_counter()
+            try:
+                self.display.frame(pages)
+                self.display.show()
+                failed = False
+            except Exception as e:
+                print(f"⚠️  OLED flush error: {e}")
+                failed = True
+            finished = time.perf_counter()
+
+            with self.condition:
+                stats = self.stats
+                if failed:
+                    stats['errors'] += 1
+                    continue
+                stats['flushed'] += 1
+                stats['age_total'] += finished - submitted
+                stats['max_age'] = max(stats['max_age'], finished - submitted)
+                stats['flush_time'] += finished - started
+
+    def shutdown(self, clear=True):
+        """
+        Stop the worker after it sends the last pending frame
+
+        Args:
+            clear (bool): Blank the panel once the worker has stopped
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.worker.join()
+
+        if clear:
+            try:
+                self.display.fill(0)
+                self.display.show()
+            except Exception as e:
+                print(f"⚠️  OLED clear error: {e}")
+
+    def get_stats(self):
+        """
+        Get pipeline counters
+
+        Returns:
+            dict: Counters plus average frame age and flush time
+        """
+        with self.condition:
+            stats = dict(self.stats)
+        flushed = stats['flushed']
+        stats['avg_age'] = stats['age_total'] / flushed if flushed else 0.0
+        stats['avg_flush'] = stats['flush_time'] / flushed if flushed else 0.0
+        return stats
+
+    def print_stats(self):
+        """Print pipeline counters, then the display's own refresh counters."""
+        stats = self.get_stats()
+        print(f"🖼️  OLED pipeline: {stats['flushed']}/{stats['submitted']} frames sent, "
+              f"{stats['dropped']} dropped, age avg {stats['avg_age'] * 1000:.1f} ms "
+              f"(max {stats['max_age'] * 1000:.1f}), flush avg {stats['avg_flush'] * 1000:.1f} ms")
+        if hasattr(self.display, 'print_stats'):
+            self.display.print_stats()
+
+
+def create_oled(width=None, height=None):
+    """
+    Create the SSD1306 driver for the configured backend
+
+    OLED_CONFIG['BACKEND'] selects 'ssd1306' (the panel on the I2C pins)
+    or 'virtual' (a VirtualOLED that records frames, so experiments run
+    headless). The board libraries are only imported for the real panel.
+
+    Args:
+        width (int): Display width (default OLED_CONFIG['WIDTH'])
+        height (int): Display height (default OLED_CONFIG['HEIGHT'])
+
+    Returns:
+        SSD1306_I2C: Driver, ready to wrap in PartialRefreshDisplay
+    """
+    width = OLED_CONFIG['WIDTH'] if width is None else width
+    height = OLED_CONFIG['HEIGHT'] if height is None else height
+
+    if OLED_CONFIG['BACKEND'] == 'virtual':
+        import atexit
+        from modules.virtual_oled import VirtualOLED
+
+        virtual = OLED_CONFIG['VIRTUAL']
+        oled = VirtualOLED(width, height, frequency=virtual['I2C_FREQUENCY'],
+                           max_frames=virtual['MAX_FRAMES'], snapshot_dir=virtual['SNAPSHOT_DIR'])
+        if virtual['GIF_PATH']:
+            atexit.register(oled.save_gif, virtual['GIF_PATH'])
+        atexit.register(oled.print_stats)
+        return oled
+
+    import adafruit_ssd1306
+    import board
+    import busio
+
+    i2c = busio.I2C(scl=getattr(board, f"D{OLED_CONFIG['I2C_SCL']}"),
+                    sda=getattr(board, f"D{OLED_CONFIG['I2C_SDA']}"))
+    return adafruit_ssd1306.SSD1306_I2C(width, height, i2c)
+
+
+class FakeI2C:
+    """
+    In-memory stand-in for busio.I2C that counts bus traffic
+
+    Accepts the calls adafruit_bus_device makes, so the real SSD1306 driver
+    can run on a machine without an OLED attached. With a frequency set,
+    every write also sleeps for as long as it would take on a real bus.
+    """
+
+    def __init__(self, address=0x3C, frequency=None):
+        """
+        Args:
+            address (int): Device address reported by scan()
+            frequency (int): Simulated I2C clock in Hz (default none: no delay)
+        """
+        self.address = address
+        self.frequency = frequency
+        self.transactions = 0
+        self.bytes_written = 0
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def scan(self):
+        return [self.address]
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        end = len(buffer) if end is None else end
+        self.transactions += 1
+        self.bytes_written += end - start
+        if self.frequency:
+            time.sleep((9 * (end - start + 1) + 2) / self.frequency)
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        pass
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        self.writeto(address, buffer_out, start=out_start, end=out_end)
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes_written = 0
+
+    def bus_time(self, frequency=400000):
+        """
+        Estimate the time the counted traffic takes on a real bus
+
+        Every byte takes 9 clocks (8 data bits + ACK); each transaction adds
+        the address byte plus start/stop conditions.
+
+        Args:
+            frequency (int): I2C clock in Hz (default 400 kHz fast mode)
+
+        Returns:
+            float: Seconds on the wire
+        """
+        clocks = 9 * (self.bytes_written + self.transactions) + 2 * self.transactions
+        return clocks / frequency
+
+
+if __name__ == "__main__":
+    import adafruit_ssd1306
+    from PIL import Image, ImageDraw
+
+    from modules.digit_display import draw_large_digit, draw_plus_sign
+
+    WIDTH, HEIGHT = OLED_CONFIG['WIDTH'], OLED_CONFIG['HEIGHT']
+
+    def equation_frames(count):
+        """exp2-style equation screens where one digit changes every 10 frames."""
+        frames = []
+        for i in range(count):
+            image = Image.new("1", (WIDTH, HEIGHT))
+            draw = ImageDraw.Draw(image)
+            draw_large_digit(draw, (i // 10) % 10, 10, 10, 8)
+            draw_plus_sign(draw, 54, 22, 6)
+            draw_large_digit(draw, 3, 86, 10, 8)
+            frames.append(image)
+        return frames
+
+    def counter_frames(count):
+        """exp1-style screens where only a small text line changes."""
+        frames = []
+        for i in range(count):
+            image = Image.new("1", (WIDTH, HEIGHT))
+            draw = ImageDraw.Draw(image)
+            draw.text((40, 5), "EXP. 1", fill=255)
+            draw.text((30, 40), f"RESULT: {i % 2}", fill=255)
+            frames.append(image)
+        return frames
+
+    def noise_frames(count):
+        """Every pixel changes: the wrapper must fall back to full refreshes."""
+        return [Image.frombytes("1", (WIDTH, HEIGHT), os.urandom(WIDTH * HEIGHT // 8))
+                for _ in range(count)]
+
+    def run(frames, partial):
+        bus = FakeI2C()
+        display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, bus)
+        if partial:
+            display = PartialRefreshDisplay(display)
+        bus.reset_counters()
+
+        start = time.perf_counter()
+        for image in frames:
+            display.image(image)
+            display.show()
+        cpu = time.perf_counter() - start
+
+        wire = bus.bus_time()
+        count = len(frames)
+        return bus.bytes_written / count, count / cpu, count / (cpu + wire), display
+
+    def check_panel_contents(frames):
+        """Replay the windows onto a shadow panel and compare with the last frame."""
+        bus = FakeI2C()
+        driver = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, bus)
+        display = PartialRefreshDisplay(driver)
+        panel = bytearray(WIDTH * HEIGHT // 8)
+        for image in frames:
+            display.image(image)
+            frame = bytes(driver.buffer[1:])
+            if display.last_frame is None:
+                panel[:] = frame
+            else:
+                for page, first, last in display.dirty_windows(frame):
+                    start = page * WIDTH
+                    panel[start + first:start + last + 1] = frame[start + first:start + last + 1]
+            display.show()
+        return bytes(panel) == bytes(driver.buffer[1:])
+
+    def static_screen_cpu(partial, ticks=300):
+        """exp2's number_display loop on an unchanged screen: draw + image + show per tick."""
+        bus = FakeI2C()
+        display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, bus)
+        if partial:
+            display = PartialRefreshDisplay(display)
+        bus.reset_counters()
+
+        start = time.process_time()
+        for _ in range(ticks):
+            image = Image.new("1", (WIDTH, HEIGHT))
+            draw = ImageDraw.Draw(image)
+            draw_large_digit(draw, 4, 10, 10, 8)
+            draw_plus_sign(draw, 54, 22, 6)
+            draw_large_digit(draw, 3, 86, 10, 8)
+            display.image(image)
+            display.show()
+        cpu = (time.process_time() - start) / ticks
+        return cpu, bus.bytes_written, display
+
+    before_cpu, before_bytes, _ = static_screen_cpu(partial=False)
+    after_cpu, after_bytes, display = static_screen_cpu(partial=True)
+    stats = display.get_stats()
+    print(f"static screen @30 FPS: {before_cpu * 1000:.2f} -> {after_cpu * 1000:.3f} ms CPU/tick "
+          f"({before_cpu * 30 * 100:.1f}% -> {after_cpu * 30 * 100:.2f}% of one core), "
+          f"{before_bytes} -> {after_bytes} bytes, {stats['skipped']} frames skipped")
+
+    def producer_latency(pipelined, frames):
+        """exp2-style loop at ~100 Hz on a simulated 400 kHz bus: how long does show() block?"""
+        display = PartialRefreshDisplay(
+            adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, FakeI2C(frequency=400000)))
+        if pipelined:
+            display = DisplayPipeline(display)
+
+        worst = 0.0
+        for image in frames:
+            start = time.perf_counter()
+            display.image(image)
+            display.show()
+            worst = max(worst, time.perf_counter() - start)
+            time.sleep(0.01)  # Button polling between frames
+
+        if pipelined:
+            display.shutdown()
+            stats = display.get_stats()
+            return worst, f"{stats['dropped']} dropped, age avg {stats['avg_age'] * 1000:.1f} ms"
+        return worst, "every frame sent inline"
+
+    frames = noise_frames(60)
+    for pipelined in (False, True):
+        worst, detail = producer_latency(pipelined, frames)
+        print(f"{'pipeline' if pipelined else 'direct  '}: show() blocks up to "
+              f"{worst * 1000:.2f} ms ({detail})")
+
+    for name, frames in (("equation", equation_frames(200)),
+                         ("result text", counter_frames(200)),
+                         ("full noise", noise_frames(200))):
+        full_bytes, _, full_fps, _ = run(frames, partial=False)
+        part_bytes, cpu_fps, part_fps, display = run(frames, partial=True)
+        stats = display.get_stats()
+        print(f"{name}: full {full_bytes:.0f} B/frame ({full_fps:.0f} FPS @400kHz) | "
+              f"partial {part_bytes:.0f} B/frame ({part_fps:.0f} FPS @400kHz, "
+              f"{cpu_fps:.0f} FPS CPU-only) | {stats['full']} full / {stats['partial']} partial | "
+              f"panel ok: {check_panel_contents(frames)}")
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Page Canvas Module
+Drawing straight into the SSD1306 page layout, without a PIL image per frame
+"""
+
+import collections
+
+from PIL import Image, ImageDraw
+
+# Byte with its bit order reversed (PIL packs the top pixel in the MSB, SSD1306 in the LSB)
+REVERSE_BITS = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+# Page sprites for masks and strings drawn on a canvas, built on first use. PIL
+# images are unhashable, so sprites are keyed by id() in a bounded LRU
+SPRITE_CACHE_SIZE = 256
+_sprite_cache = collections.OrderedDict()
+_text_cache = {}
+
+
+def image_to_pages(image):
+    """
+    Convert a 1-bit PIL image to SSD1306 page bytes
+
+    The SSD1306 stores 8 vertical pixels per byte (LSB on top), one page
+    of 8 rows after the other. Transposing the image turns every column
+    into a packed row, so the whole conversion runs inside PIL and bytes
+    methods instead of one Python call per pixel.
+
+    Args:
+        image (Image): 1-bit image whose height is a multiple of 8
+
+    Returns:
+        bytes: width * height // 8 bytes in page order
+    """
+    rows = image.size[1] // 8
+    column_major = image.transpose(Image.TRANSPOSE).tobytes()
+    return b"".join(column_major[page::rows] for page in range(rows)).translate(REVERSE_BITS)
+
+
+def pages_to_image(pages, width=128, height=64):
+    """
+    Convert SSD1306 page bytes back to a 1-bit PIL image (inverse of image_to_pages)
+
+    Args:
+        pages (bytes): width * height // 8 bytes in page order
+        width (int): Display width in pixels (default 128)
+        height (int): Display height in pixels (default 64)
+
+    Returns:
+        Image: 1-bit image of the frame
+    """
+    rows = height // 8
+    column_major = bytearray(width * rows)
+    for page in range(rows):
+        column_major[page::rows] = pages[page * width:(page + 1) * width]
+    transposed = Image.frombytes("1", (height, width), bytes(column_major.translate(REVERSE_BITS)))
+    return transposed.transpose(Image.TRANSPOSE)
+
+
+class PageSprite:
+    """
+    A 1-bit mask precompiled into page column bytes
+
+    Blitting at a y that is not a multiple of 8 spreads the mask over one
+    more page, so the column bytes are built once per vertical shift (0-7)
+    the first time that shift is used.
+    """
+
+    def __init__(self, mask):
+        """
+        Args:
+            mask (Image): 1-bit image whose lit pixels are drawn
+        """
+        self.mask = mask
+        self.width, self.height = mask.size
+        self.shifts = {}
+
+    def rows(self, shift):
+        """
+        Get the page rows of the mask moved down by shift pixels
+
+        Returns:
+            list: bytes of length width, one per page row
+        """
+        rows = self.shifts.get(shift)
+        if rows is None:
+            padded = Image.new("1", (self.width, -(-(self.height + shift) // 8) * 8))
+            padded.paste(self.mask, (0, shift))
+            pages = image_to_pages(padded)
+            rows = [pages[start:start + self.width]
+                    for start in range(0, len(pages), self.width)]
+            self.shifts[shift] = rows
+        return rows
+
+
+def get_sprite(mask):
+    """
+    Get the page sprite of a mask that is reused across frames (glyphs, sprites)
+
+    At most SPRITE_CACHE_SIZE sprites are kept, least recently used dropped
+    first, so one-off masks do not pile up. A cached sprite holds its mask,
+    and a hit must be that very mask, so an id reused by a new image after
+    eviction can never return stale pages.
+    """
+    key = id(mask)
+    cached = _sprite_cache.get(key)
+    if cached is not None and cached.mask is mask:
+        _sprite_cache.move_to_end(key)
+        return cached
+    cached = PageSprite(mask)
+    _sprite_cache[key] = cached
+    _sprite_cache.move_to_end(key)
+    if len(_sprite_cache) > SPRITE_CACHE_SIZE:
+        _sprite_cache.popitem(last=False)
+    return cached
+
+
+def get_text_mask(text):
+    """Render a string once with PIL's default font, positioned as draw.text((0, 0)) would."""
+    mask = _text_cache.get(text)
+    if mask is None:
+        probe = ImageDraw.Draw(Image.new("1", (1, 1)))
+        _, _, right, bottom = probe.textbbox((0, 0), text)
+        mask = Image.new("1", (max(right, 1), max(bottom, 1)))
+        ImageDraw.Draw(mask).text((0, 0), text, fill=255)
+        _text_cache[text] = mask
+    return mask
+
+
+class PageCanvas:
+    """
+    Frame held directly in SSD1306 page layout
+
+    Supports the subset of ImageDraw used by the hot screens (bitmap,
+    rectangle and text), so the digit_display helpers draw on it unchanged.
+    The finished buffer goes to the display with frame() and needs no
+    conversion. Other drawing (lines, points) stays on PIL images.
+    """
+
+    def __init__(self, width=128, height=64):
+        """
+        Args:
+            width (int): Display width in pixels (default 128)
+            height (int): Display height in pixels, a multiple of 8 (default 64)
+        """
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.buffer = bytearray(width * self.pages)
+        self.blank = bytes(len(self.buffer))
+
+    def begin(self):
+        """
+        Start a new frame
+
+        Returns:
+            PageCanvas: The cleared canvas, used as the draw context
+        """
+        self.buffer[:] = self.blank
+        return self
+
+    def _merge(self, start, end, bits, fill):
+        # OR (or clear) a run of column bytes as one integer
+        buffer = self.buffer
+        current = int.from_bytes(buffer[start:end], 'little')
+        merged = current | bits if fill else current & ~bits
+        buffer[start:end] = merged.to_bytes(end - start, 'little')
+
+    def bitmap(self, xy, mask, fill=255):
+        """Light (or clear, fill=0) the pixels set in a 1-bit mask at (x, y)."""
+        x, y = xy
+        sprite = get_sprite(mask)
+        x0 = max(x, 0)
+        x1 = min(x + sprite.width, self.width)
+        if x0 >= x1:
+            return
+
+        first_page = y // 8
+        for row, columns in enumerate(sprite.rows(y % 8)):
+            page = first_page + row
+            if 0 <= page < self.pages:
+                start = page * self.width + x0
+                bits = int.from_bytes(columns[x0 - x:x1 - x], 'little')
+                self._merge(start, start + x1 - x0, bits, fill)
+
+    def rectangle(self, xy, fill=255):
+        """Fill a rectangle given as [x0, y0, x1, y1] (inclusive, like ImageDraw)."""
+        if len(xy) == 2:
+            (x0, y0), (x1, y1) = xy
+        else:
+            x0, y0, x1, y1 = xy
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width - 1), min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+
+        count = x1 - x0 + 1
+        for page in range(y0 // 8, y1 // 8 + 1):
+            top = max(y0, page * 8) - page * 8
+            bottom = min(y1, page * 8 + 7) - page * 8
+            mask = ((1 << (bottom - top + 1)) - 1) << top
+            start = page * self.width + x0
+            self._merge(start, start + count, int.from_bytes(bytes((mask,)) * count, 'little'), fill)
+
+    def text(self, xy, text, fill=255):
+        """Draw a string with PIL's default font (rendered once per string)."""
+        self.bitmap(xy, get_text_mask(text), fill)
+
+    def load(self, pages):
+        """Copy a complete page-format frame (e.g. a prerendered one) into the canvas."""
+        self.buffer[:] = pages
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    import adafruit_ssd1306
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+    from modules.digit_display import draw_large_digit, draw_plus_sign
+    from modules.oled_display import FakeI2C
+
+    WIDTH, HEIGHT = 128, 64
+
+    def draw_equation(draw, left):
+        """exp2's equation screen."""
+        draw_large_digit(draw, left, 31, 20, size=4)
+        draw_plus_sign(draw, 53, 26, size=4)
+        draw_large_digit(draw, 7, 71, 20, size=4)
+
+    def draw_result(draw, result):
+        """exp2's result screen, with a fallback label and the equals sign."""
+        draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+        draw.text((0, 0), "CACHE", fill=255)
+        draw_large_digit(draw, 4, 49, 5, size=2)
+        draw_plus_sign(draw, 61, 8, size=2)
+        draw_large_digit(draw, 9, 71, 5, size=2)
+        draw.rectangle([56, 22, 72, 24], fill=255)
+        draw.rectangle([56, 26, 72, 28], fill=255)
+        draw_large_digit(draw, result // 10, 50, 34, size=3)
+        draw_large_digit(draw, result % 10, 66, 34, size=3)
+
+    def draw_exp1_result(draw, value):
+        """exp1's result screen: text only."""
+        draw.text((46, 5), "EXP. 1", fill=255)
+        draw.text((19, 25), "QUANTUM RESULT:", fill=255)
+        for offset_x in range(2):
+            for offset_y in range(2):
+                draw.text((58 + offset_x, 40 + offset_y), str(value), fill=255)
+        draw.text((52, 55), "BLUE" if value else "RED", fill=255)
+
+    def timed(fn, count=300):
+        start = time.perf_counter()
+        for i in range(count):
+            fn(i)
+        return (time.perf_counter() - start) / count * 1e6
+
+    driver = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, FakeI2C())
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    canvas = PageCanvas(WIDTH, HEIGHT)
+
+    for name, draw_screen in (("equation", lambda d, i: draw_equation(d, i % 10)),
+                              ("exp2 result", lambda d, i: draw_result(d, 10 + i % 9)),
+                              ("exp1 result", lambda d, i: draw_exp1_result(d, i % 2))):
+        def pil_driver(i):
+            draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+            draw_screen(draw, i)
+            driver.image(image)
+
+        def pil_fast(i):
+            draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+            draw_screen(draw, i)
+            driver.buffer[1:] = image_to_pages(image)
+
+        def page_canvas(i):
+            draw_screen(canvas.begin(), i)
+            driver.buffer[1:] = canvas.buffer
+
+        page_canvas(3)  # Build the sprites before timing
+        results = [timed(pil_driver, 30), timed(pil_fast), timed(page_canvas)]
+
+        # All three paths must leave the same bytes in the driver buffer
+        outputs = []
+        for path in (pil_driver, pil_fast, page_canvas):
+            path(3)
+            outputs.append(bytes(driver.buffer[1:]))
+        identical = outputs[0] == outputs[1] == outputs[2]
+
+        print(f"{name}: PIL + driver image() {results[0]:,.0f} us | PIL + image_to_pages "
+              f"{results[1]:,.0f} us | page canvas {results[2]:,.0f} us per frame "
+              f"(identical: {identical})")
+
+    # Conversion alone for a prerendered full frame (spinner)
+    noise = Image.frombytes("1", (WIDTH, HEIGHT), os.urandom(WIDTH * HEIGHT // 8))
+    pages = image_to_pages(noise)
+    convert_driver = timed(lambda i: driver.image(noise), 30)
+    convert_fast = timed(lambda i: image_to_pages(noise))
+    precomputed = timed(lambda i: driver.buffer.__setitem__(slice(1, None), pages))
+    driver.image(noise)
+    print(f"spinner frame: driver image() {convert_driver:,.0f} us | image_to_pages "
+          f"{convert_fast:,.1f} us | precomputed pages {precomputed:,.2f} us "
+          f"(identical: {bytes(driver.buffer[1:]) == pages})")
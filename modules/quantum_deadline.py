@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Quantum Deadline Module
+Runs quantum work under a latency budget with cached/classical fallback
+"""
+
+import threading
+import time
+
+# Where a served answer came from
+SOURCE_QUANTUM = 'quantum'
+SOURCE_CACHE = 'cache'
+SOURCE_CLASSICAL = 'classical'
+
+# Short labels for the OLED display
+SOURCE_LABELS = {
+    SOURCE_QUANTUM: 'QUANTUM',
+    SOURCE_CACHE: 'CACHE',
+    SOURCE_CLASSICAL: 'CLASSIC'
+}
+
+
+class DeadlineExecutor:
+    """
+    Execute quantum calls with a per-call latency budget
+
+    If the quantum result is not ready within the budget, a cached answer
+    (same key, earlier quantum run) or a classical answer is served instead
+    and clearly labeled by its source. The quantum run keeps going in the
+    background; when it finishes its result is cached and reconciled with
+    what was served.
+    """
+
+    def __init__(self, budget):
+        """
+        Args:
+            budget (float): Default latency budget per call in seconds
+        """
+        self.budget = budget
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'on_time': 0,           # Quantum result ready within budget
+            'misses': 0,            # Budget exceeded, fallback served
+            'errors': 0,            # Quantum run raised, fallback served
+            'served_cache': 0,
+            'served_classical': 0,
+            'overruns': 0,          # Late quantum runs that completed in background
+            'overrun_time': 0.0,    # Total seconds spent past the budget
+            'max_overrun': 0.0,
+            'mismatches': 0         # Late quantum result differed from served answer
+        }
+
+    def prime(self, key, value):
+        """Store a known quantum result so it can be served on a miss."""
+        with self.lock:
+            self.cache[key] = value
+
+    def run(self, quantum_fn, classical_fn, key=None, budget=None, on_reconcile=None):
+        """
+        Run quantum_fn, falling back if it misses the budget or fails
+
+        Args:
+            quantum_fn (callable): Quantum computation, called with no arguments
+            classical_fn (callable): Classical fallback, called with no arguments
+            key: Cache key for this computation (None disables the cache)
+            budget (float): Latency budget in seconds (default self.budget)
+            on_reconcile (callable): Called as on_reconcile(key, value, served, source)
+                when a late quantum result arrives
+
+        Returns:
+            tuple: (value, source) where source is SOURCE_QUANTUM, SOURCE_CACHE
+                or SOURCE_CLASSICAL
+        """
+        budget = self.budget if budget is None else budget
+        finished = threading.Event()
+        job = {'done': False, 'late': False, 'value': None, 'error': None,
+               'served': None, 'source': None, 'served_ready': False}
+        start_time = time.time()
+
+        def reconcile():
+            # Runs once, in whichever thread finishes last (late run or fallback)
+            if job['value'] != job['served']:
+                with self.lock:
+                    self.stats['mismatches'] += 1
+            print(f"⏱️  Late quantum result: {job['value']} "
+                  f"(served {job['served']} from {job['source']})")
+            if on_reconcile is not None:
+                on_reconcile(key, job['value'], job['served'], job['source'])
+
+        def worker():
+            try:
+                value = quantum_fn()
+                error = None
+            except Exception as e:
+                value = None
+                error = e
+
+            with self.lock:
+                job['done'] = True
+                job['value'] = value
+                job['error'] = error
+                late = job['late'] and error is None
+
+                if error is None and key is not None:
+                    self.cache[key] = value
+
+                if late:
+                    overrun = time.time() - start_time - budget
+                    self.stats['overruns'] += 1
+                    self.stats['overrun_time'] += overrun
+                    self.stats['max_overrun'] = max(self.stats['max_overrun'], overrun)
+
+                reconcile_here = late and job['served_ready']
+
+            finished.set()
+
+            if reconcile_here:
+                reconcile()
+
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+        finished.wait(budget)
+
+        with self.lock:
+            self.stats['calls'] += 1
+
+            if job['done'] and job['error'] is None:
+                self.stats['on_time'] += 1
+                return job['value'], SOURCE_QUANTUM
+
+            if job['done']:
+                self.stats['errors'] += 1
+                print(f"⚠️  Quantum circuit error: {job['error']}")
+            else:
+                job['late'] = True
+                self.stats['misses'] += 1
+                print(f"⏱️  Quantum run exceeded {budget:.2f}s budget, serving fallback")
+
+            if key is not None and key in self.cache:
+                value, source = self.cache[key], SOURCE_CACHE
+                self.stats['served_cache'] += 1
+            else:
+                value, source = None, SOURCE_CLASSICAL
+                self.stats['served_classical'] += 1
+
+            job['source'] = source
+
+        if source == SOURCE_CLASSICAL:
+            value = classical_fn()
+
+        with self.lock:
+            job['served'] = value
+            job['served_ready'] = True
+            # The late quantum run may have finished while the fallback was prepared
+            reconcile_here = job['late'] and job['done'] and job['error'] is None
+
+        if reconcile_here:
+            reconcile()
+
+        return value, source
+
+    def get_stats(self):
+        """Get a snapshot of the deadline counters."""
+        with self.lock:
+            stats = dict(self.stats)
+        stats['budget'] = self.budget
+        return stats
+
+    def print_stats(self):
+        """Print the deadline counters for budget tuning."""
+        stats = self.get_stats()
+        print(f"⏱️  Quantum deadline stats (budget {stats['budget']:.2f}s): "
+              f"{stats['on_time']}/{stats['calls']} on time, {stats['misses']} misses, "
+              f"{stats['errors']} errors")
+        print(f"   Served: {stats['served_cache']} cached, {stats['served_classical']} classical | "
+              f"Overruns: {stats['overruns']} (total {stats['overrun_time']:.2f}s, "
+              f"max {stats['max_overrun']:.2f}s), {stats['mismatches']} mismatches")
+
+
+if __name__ == "__main__":
+    import random
+
+    executor = DeadlineExecutor(budget=0.1)
+
+    def slow_quantum():
+        time.sleep(0.3)
+        return 42
+
+    print(executor.run(lambda: 42, lambda: 0, key='fast'))
+    print(executor.run(slow_quantum, lambda: random.randint(0, 1), key='slow'))
+    time.sleep(0.4)
+    print(executor.run(slow_quantum, lambda: random.randint(0, 1), key='slow'))
+    time.sleep(0.4)
+    executor.print_stats()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Quantum Scheduler Module
+Priority job scheduler for interactive vs. background circuit work
+"""
+
+import heapq
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import QUANTUM_CONFIG
+
+# Priority classes (lower value runs first)
+PRIORITY_INTERACTIVE = 0   # The user is waiting on it (button press)
+PRIORITY_SPECULATIVE = 1   # Precompute that will probably be needed soon
+PRIORITY_BACKGROUND = 2    # Verification, table warming, anything else
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_SPECULATIVE: 'speculative',
+    PRIORITY_BACKGROUND: 'background'
+}
+
+# Shared scheduler (created on first use)
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class CircuitScheduler:
+    """
+    Run circuit jobs one at a time on a dedicated worker thread
+
+    Jobs are ordered by priority class, then by submission order. A running
+    job is never interrupted (the simulator cannot be paused), but every job
+    boundary is a preemption point: a newly submitted interactive job runs
+    before any queued speculative or background job. Long background work
+    should therefore be split into several small jobs.
+
+    The queue is bounded. When it is full, a new job evicts the newest job
+    of a lower priority class (its future is cancelled); if there is none,
+    the new job is rejected with queue.Full.
+    """
+
+    def __init__(self, max_queue=16):
+        """
+        Args:
+            max_queue (int): Maximum number of jobs waiting to run
+        """
+        self.max_queue = max_queue
+        self.heap = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.running = True
+        self.worker = None
+        self.stats = {
+            priority: {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                       'evicted': 0, 'wait_time': 0.0, 'max_wait': 0.0,
+                       'run_time': 0.0, 'max_run': 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def submit(self, fn, priority=PRIORITY_INTERACTIVE):
+        """
+        Queue a job
+
+        Args:
+            fn (callable): Job to run, called with no arguments
+            priority (int): PRIORITY_INTERACTIVE, PRIORITY_SPECULATIVE or PRIORITY_BACKGROUND
+
+        Returns:
+            Future: Resolves to the job's return value
+        """
+        future = Future()
+
+        with self.condition:
+            if not self.running:
+                raise RuntimeError("Scheduler has been shut down")
+
+            if len(self.heap) >= self.max_queue:
+                lowest = max(self.heap)
+                if lowest[0] <= priority:
+                    self.stats[priority]['rejected'] += 1
+                    raise queue.Full(f"Circuit queue full ({self.max_queue} jobs)")
+
+                self.heap.remove(lowest)
+                heapq.heapify(self.heap)
+                lowest[4].cancel()
+                self.stats[lowest[0]]['evicted'] += 1
+
+            heapq.heappush(self.heap, (priority, next(self.sequence), time.perf_counter(), fn, future))
+            self.stats[priority]['submitted'] += 1
+
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run_jobs)
+                self.worker.daemon = True
+                self.worker.start()
+
+            self.condition.notify()
+
+        return future
+
+    def run(self, fn, priority=PRIORITY_INTERACTIVE):
+        """Submit a job and wait for its result."""
+        return self.submit(fn, priority).result()
+
+    def _run_jobs(self):
+        """Worker loop: always pick the highest-priority queued job."""
+        while True:
+            with self.condition:
+                while not self.heap and self.running:
+                    self.condition.wait()
+                if not self.heap:
+                    return
+                priority, _, submitted, fn, future = heapq.heappop(self.heap)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = fn()
+                failed = False
+            except BaseException as e:
+                future.set_exception(e)
+                failed = True
+            else:
+                future.set_result(result)
+            finished = time.perf_counter()
+
+            with self.condition:
+                stats = self.stats[priority]
+                stats['failed' if failed else 'completed'] += 1
+                stats['wait_time'] += started - submitted
+                stats['max_wait'] = max(stats['max_wait'], started - submitted)
+                stats['run_time'] += finished - started
+                stats['max_run'] = max(stats['max_run'], finished - started)
+
+    def get_stats(self):
+        """
+        Get per-class queue wait and run time
+
+        Returns:
+            dict: Stats keyed by class name, with average wait/run times added
+        """
+        with self.condition:
+            snapshot = {PRIORITY_NAMES[priority]: dict(stats)
+                        for priority, stats in self.stats.items()}
+            queued = len(self.heap)
+
+        for stats in snapshot.values():
+            done = stats['completed'] + stats['failed']
+            stats['avg_wait'] = stats['wait_time'] / done if done else 0.0
+            stats['avg_run'] = stats['run_time'] / done if done else 0.0
+        snapshot['queued'] = queued
+        return snapshot
+
+    def print_stats(self):
+        """Print per-class queue wait and run time."""
+        stats = self.get_stats()
+        print(f"🗂️  Circuit scheduler ({stats['queued']} queued):")
+        for name in PRIORITY_NAMES.values():
+            s = stats[name]
+            if s['submitted'] == 0:
+                continue
+            print(f"   {name:<12} {s['completed']}/{s['submitted']} done, "
+                  f"wait avg {s['avg_wait'] * 1000:.0f} ms (max {s['max_wait'] * 1000:.0f}), "
+                  f"run avg {s['avg_run'] * 1000:.0f} ms (max {s['max_run'] * 1000:.0f}), "
+                  f"{s['rejected']} rejected, {s['evicted']} evicted")
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; queued jobs still run before the worker exits."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+            worker = self.worker
+        if wait and worker is not None:
+            worker.join()
+
+
+def get_scheduler():
+    """Get the shared circuit scheduler for this process."""
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CircuitScheduler(QUANTUM_CONFIG['SCHEDULER_QUEUE'])
+    return _scheduler
+
+
+def run_circuit_job(fn, priority=PRIORITY_INTERACTIVE):
+    """Run a job on the shared scheduler and wait for its result."""
+    return get_scheduler().run(fn, priority)
+
+
+if __name__ == "__main__":
+    scheduler = CircuitScheduler(max_queue=4)
+    order = []
+
+    def job(name, duration=0.05):
+        def run():
+            time.sleep(duration)
+            order.append(name)
+            return name
+        return run
+
+    # Background work is queued first, then the user presses a button
+    futures = [scheduler.submit(job(f"bg{i}"), PRIORITY_BACKGROUND) for i in range(3)]
+    time.sleep(0.01)
+    futures.append(scheduler.submit(job("spec"), PRIORITY_SPECULATIVE))
+    futures.append(scheduler.submit(job("click"), PRIORITY_INTERACTIVE))
+    futures.append(scheduler.submit(job("click2"), PRIORITY_INTERACTIVE))  # Evicts a background job
+
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Job dropped: {type(e).__name__}")
+
+    print(f"Run order: {order}")
+    scheduler.print_stats()
+    scheduler.shutdown()
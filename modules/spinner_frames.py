@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Spinner Frames Module
+Prerendered full-screen frames for the atom loading animation
+"""
+
+from PIL import Image, ImageDraw
+
+def compose_spinner_frames(sprites, width=128, height=64, header_text=None, y_offset=0):
+    """
+    Compose every animation frame into a complete display image once
+
+    Each frame holds the optional header text and the centered sprite, so
+    the animation loop only has to pick a frame and hand it to the display
+    instead of redrawing the sprite pixel by pixel.
+
+    Args:
+        sprites (list): 1-bit PIL images, one per animation frame
+        width (int): Display width in pixels (default 128)
+        height (int): Display height in pixels (default 64)
+        header_text (str): Text drawn centered at the top (default none)
+        y_offset (int): Vertical shift of the sprite from center (default 0)
+
+    Returns:
+        list: 1-bit PIL images ready for display.image()
+    """
+    frames = []
+    cache = {}
+
+    for sprite in sprites:
+        # Frames duplicated to reach the frame count share one image
+        if id(sprite) in cache:
+            frames.append(cache[id(sprite)])
+            continue
+
+        image = Image.new("1", (width, height))
+        draw = ImageDraw.Draw(image)
+
+        if header_text:
+            text_width = len(header_text) * 6  # Approximate character width
+            draw.text(((width - text_width) // 2, 5), header_text, fill=255)
+
+        # Only lit sprite pixels are drawn, so overlapping text is kept
+        frame_width, frame_height = sprite.size
+        x = (width - frame_width) // 2
+        y = ((height - frame_height) // 2) + y_offset
+        draw.bitmap((x, y), sprite, fill=255)
+
+        cache[id(sprite)] = image
+        frames.append(image)
+
+    return frames
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    WIDTH, HEIGHT = 128, 64
+    SPRITE_SIZE = 64
+    FRAMES = 30
+    sprite_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'icons', 'atom.bmp')
+
+    # Load the sprite sheet the same way exp1/exp2 do
+    sheet = Image.open(sprite_path).convert('1')
+    display_size = int(HEIGHT * 0.95)
+    sprites = []
+    for i in range(min(FRAMES, sheet.size[0] // SPRITE_SIZE)):
+        frame = sheet.crop((i * SPRITE_SIZE, 0, (i + 1) * SPRITE_SIZE, SPRITE_SIZE))
+        sprites.append(frame.resize((display_size, display_size), Image.NEAREST))
+
+    def draw_per_pixel(draw, frame, header_text, y_offset):
+        """Original per-frame path: clear, header text, one draw.point per lit pixel."""
+        draw.rectangle([0, 0, WIDTH, HEIGHT], fill=0)
+        if header_text:
+            draw.text(((WIDTH - len(header_text) * 6) // 2, 5), header_text, fill=255)
+        sprite = sprites[frame % len(sprites)]
+        frame_width, frame_height = sprite.size
+        center_x = (WIDTH - frame_width) // 2
+        center_y = ((HEIGHT - frame_height) // 2) + y_offset
+        frame_pixels = list(sprite.getdata())
+        for y in range(frame_height):
+            for x in range(frame_width):
+                if frame_pixels[y * frame_width + x]:
+                    draw_x = center_x + x
+                    draw_y = center_y + y
+                    if 0 <= draw_x < WIDTH and 0 <= draw_y < HEIGHT:
+                        draw.point((draw_x, draw_y), fill=255)
+
+    for name, header_text, y_offset in (("exp1", "EXP. 1", 10), ("exp2", None, 0)):
+        image = Image.new("1", (WIDTH, HEIGHT))
+        draw = ImageDraw.Draw(image)
+        count = 300
+
+        # Both loops end by serializing the frame, standing in for the display hand-off
+        start = time.perf_counter()
+        for frame in range(count):
+            draw_per_pixel(draw, frame, header_text, y_offset)
+            image.tobytes()
+        before_fps = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        prerendered = compose_spinner_frames(sprites, WIDTH, HEIGHT, header_text, y_offset)
+        compose_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for frame in range(count):
+            prerendered[frame % len(prerendered)].tobytes()
+        after_fps = count / (time.perf_counter() - start)
+
+        # Prerendered frames must match the per-pixel output exactly
+        draw_per_pixel(draw, 7, header_text, y_offset)
+        identical = image.tobytes() == prerendered[7].tobytes()
+
+        print(f"{name}: per-pixel {before_fps:,.0f} FPS | prerendered {after_fps:,.0f} FPS "
+              f"(compose once: {compose_ms:.1f} ms, identical: {identical})")
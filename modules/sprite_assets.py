@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Sprite Assets Module
+Compiled atom animation asset with memory-mapped loading and BMP fallback
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import ANIMATION_CONFIG, OLED_CONFIG
+from modules.page_canvas import image_to_pages
+from modules.spinner_frames import compose_spinner_frames
+
+# Asset file layout (little endian):
+#   header   magic, version, build key (SHA-1 of source + build parameters),
+#            sprite width/height, frame count, unique sprite count,
+#            display width/height, layout count
+#   order    frame count x uint16: unique sprite shown in each frame
+#   sprites  unique count x packed 1-bit rows (PIL "1" raw layout)
+#   layouts  per layout: 16-byte name, then unique count x SSD1306 page frames
+ASSET_MAGIC = b'QSPR'
+ASSET_VERSION = 1
+HEADER = struct.Struct('<4sH20sHHHHHHH')
+LAYOUT_NAME = struct.Struct('<16s')
+
+# Full-screen spinner variants: (header text, vertical sprite offset)
+SPINNER_LAYOUTS = {
+    'exp1': ("EXP. 1", 10),   # Title above the atom
+    'exp2': (None, 0),
+}
+
+# Mapped asset files stay open for the life of the process
+_asset_maps = []
+
+
+def load_sprite_sheet(path, sprite_size, frames, display_size):
+    """
+    Cut and scale the animation frames out of the sprite sheet bitmap
+
+    Args:
+        path (str): Sprite sheet BMP, frames side by side
+        sprite_size (tuple): (width, height) of one frame in the sheet
+        frames (int): Number of frames wanted (frames repeat if the sheet has fewer)
+        display_size (int): Width and height of a scaled frame
+
+    Returns:
+        list: 1-bit PIL images, repeated frames share one image
+    """
+    sprite_sheet = Image.open(path)
+
+    # Convert to 1-bit (monochrome) if not already
+    if sprite_sheet.mode != '1':
+        sprite_sheet = sprite_sheet.convert('1')
+
+    frame_width, frame_height = sprite_size
+    available_frames = min(frames, sprite_sheet.size[0] // frame_width)
+
+    sprites = []
+    for i in range(available_frames):
+        frame_box = (i * frame_width, 0, (i + 1) * frame_width, frame_height)
+        frame = sprite_sheet.crop(frame_box)
+        sprites.append(frame.resize((display_size, display_size), Image.NEAREST))
+
+    # If we have fewer frames than requested, cycle through the ones we have
+    original_count = len(sprites)
+    while 0 < original_count and len(sprites) < frames:
+        sprites.append(sprites[len(sprites) % original_count])
+
+    return sprites
+
+
+def build_key(source_path, sprite_size, frames, display_size, width, height):
+    """SHA-1 over the sprite sheet bytes and every parameter baked into the asset."""
+    digest = hashlib.sha1()
+    with open(source_path, 'rb') as source:
+        digest.update(source.read())
+    parameters = (ASSET_VERSION, tuple(sprite_size), frames, display_size, width, height,
+                  sorted(SPINNER_LAYOUTS.items()))
+    digest.update(repr(parameters).encode())
+    return digest.digest()
+
+
+def current_build(width=None, height=None):
+    """Source path and build parameters from the hardware configuration."""
+    width = OLED_CONFIG['WIDTH'] if width is None else width
+    height = OLED_CONFIG['HEIGHT'] if height is None else height
+    return {
+        'source_path': ANIMATION_CONFIG['ATOM_ICON_PATH'],
+        'sprite_size': tuple(ANIMATION_CONFIG['SPRITE_SIZE']),
+        'frames': ANIMATION_CONFIG['FRAMES'],
+        'display_size': int(height * 0.95),  # 95% of display height (60 pixels on a 64-pixel display)
+        'width': width,
+        'height': height
+    }
+
+
+def build_sprite_asset(asset_path=None, width=None, height=None):
+    """
+    Compile the atom sprite sheet into a ready-to-blit asset file
+
+    Args:
+        asset_path (str): Output file (default ANIMATION_CONFIG['ATOM_ASSET_PATH'])
+        width (int): Display width (default OLED_CONFIG['WIDTH'])
+        height (int): Display height (default OLED_CONFIG['HEIGHT'])
+
+    Returns:
+        int: Size of the written asset in bytes
+    """
+    asset_path = ANIMATION_CONFIG['ATOM_ASSET_PATH'] if asset_path is None else asset_path
+    build = current_build(width, height)
+    sprites = load_sprite_sheet(build['source_path'], build['sprite_size'],
+                                build['frames'], build['display_size'])
+
+    # Repeated frames share one image, so they are stored once
+    unique = []
+    index = {}
+    order = []
+    for sprite in sprites:
+        if id(sprite) not in index:
+            index[id(sprite)] = len(unique)
+            unique.append(sprite)
+        order.append(index[id(sprite)])
+
+    chunks = [HEADER.pack(ASSET_MAGIC, ASSET_VERSION, build_key(**build),
+                          build['display_size'], build['display_size'], len(order),
+                          len(unique), build['width'], build['height'], len(SPINNER_LAYOUTS))]
+    chunks.append(struct.pack(f'<{len(order)}H', *order))
+    chunks.extend(sprite.tobytes() for sprite in unique)
+
+    for name, (header_text, y_offset) in SPINNER_LAYOUTS.items():
+        chunks.append(LAYOUT_NAME.pack(name.encode()))
+        frames = compose_spinner_frames(unique, build['width'], build['height'], header_text, y_offset)
+        chunks.extend(image_to_pages(frame) for frame in frames)
+
+    data = b''.join(chunks)
+    os.makedirs(os.path.dirname(asset_path) or '.', exist_ok=True)
+    # Write then rename, so a running experiment never maps a half-written file
+    temp_path = asset_path + '.tmp'
+    with open(temp_path, 'wb') as asset:
+        asset.write(data)
+    os.replace(temp_path, asset_path)
+    return len(data)
+
+
+def load_compiled_spinner(layout, asset_path=None, width=None, height=None):
+    """
+    Map the compiled asset and return one layout's frames
+
+    Args:
+        layout (str): Key of SPINNER_LAYOUTS
+        asset_path (str): Asset file (default ANIMATION_CONFIG['ATOM_ASSET_PATH'])
+        width (int): Display width (default OLED_CONFIG['WIDTH'])
+        height (int): Display height (default OLED_CONFIG['HEIGHT'])
+
+    Returns:
+        tuple: (sprites, page_frames) or None if the asset is missing or stale
+    """
+    asset_path = ANIMATION_CONFIG['ATOM_ASSET_PATH'] if asset_path is None else asset_path
+    if not os.path.exists(asset_path) or os.path.getsize(asset_path) < HEADER.size:
+        return None
+
+    build = current_build(width, height)
+    with open(asset_path, 'rb') as asset:
+        data = mmap.mmap(asset.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = None
+    try:
+        (magic, version, key, sprite_width, sprite_height, frame_count, unique_count,
+         asset_width, asset_height, layout_count) = HEADER.unpack_from(data, 0)
+        if (magic != ASSET_MAGIC or version != ASSET_VERSION
+                or key != build_key(**build)):
+            data.close()
+            return None
+
+        # A truncated file (interrupted build or copy) is rejected before any slicing
+        sprite_bytes = (sprite_width + 7) // 8 * sprite_height
+        page_bytes = asset_width * asset_height // 8
+        expected = (HEADER.size + 2 * frame_count + unique_count * sprite_bytes
+                    + layout_count * (LAYOUT_NAME.size + unique_count * page_bytes))
+        if len(data) < expected:
+            data.close()
+            return None
+
+        view = memoryview(data)
+        offset = HEADER.size
+        order = struct.unpack_from(f'<{frame_count}H', data, offset)
+        offset += 2 * frame_count
+        if any(index >= unique_count for index in order):
+            raise ValueError("frame order refers to a missing sprite")
+
+        unique = []
+        for _ in range(unique_count):
+            unique.append(Image.frombytes("1", (sprite_width, sprite_height),
+                                          bytes(view[offset:offset + sprite_bytes])))
+            offset += sprite_bytes
+
+        for _ in range(layout_count):
+            name = LAYOUT_NAME.unpack_from(data, offset)[0].rstrip(b'\0').decode()
+            offset += LAYOUT_NAME.size
+            if name == layout:
+                # Page frames are slices of the mapping: nothing is copied
+                pages = [view[offset + i * page_bytes:offset + (i + 1) * page_bytes]
+                         for i in range(unique_count)]
+                _asset_maps.append(data)
+                return [unique[i] for i in order], [pages[i] for i in order]
+            offset += unique_count * page_bytes
+    except (struct.error, ValueError):
+        # Corrupt asset: fall back to the sprite sheet
+        pass
+
+    if view is not None:
+        view.release()
+    data.close()
+    return None
+
+
+def load_spinner_animation(layout, width=None, height=None):
+    """
+    Load the atom animation, preferring the compiled asset
+
+    Falls back to cutting the sprite sheet BMP (the slow path) when the
+    asset is missing or was built from a different sheet or configuration.
+
+    Args:
+        layout (str): Key of SPINNER_LAYOUTS ('exp1' or 'exp2')
+        width (int): Display width (default OLED_CONFIG['WIDTH'])
+        height (int): Display height (default OLED_CONFIG['HEIGHT'])
+
+    Returns:
+        tuple: (sprites, page_frames), both one entry per animation frame
+    """
+    compiled = load_compiled_spinner(layout, width=width, height=height)
+    if compiled is not None:
+        return compiled
+
+    print("⚠️  Compiled atom asset missing or stale, loading the sprite sheet "
+          "(run scripts/build_assets.py)")
+    build = current_build(width, height)
+    sprites = load_sprite_sheet(build['source_path'], build['sprite_size'],
+                                build['frames'], build['display_size'])
+    header_text, y_offset = SPINNER_LAYOUTS[layout]
+    frames = compose_spinner_frames(sprites, build['width'], build['height'], header_text, y_offset)
+    return sprites, [image_to_pages(frame) for frame in frames]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    os.chdir(os.path.join(os.path.dirname(__file__), '..'))
+    asset_path = os.path.join(tempfile.mkdtemp(), 'atom.spr')
+    ANIMATION_CONFIG['ATOM_ASSET_PATH'] = asset_path
+
+    start = time.perf_counter()
+    size = build_sprite_asset()
+    print(f"Built {asset_path}: {size:,} bytes in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for layout in SPINNER_LAYOUTS:
+        start = time.perf_counter()
+        sprites, pages = load_compiled_spinner(layout)
+        mapped_ms = (time.perf_counter() - start) * 1000
+
+        # Original startup path: cut, scale and compose from the BMP
+        start = time.perf_counter()
+        build = current_build()
+        bmp_sprites = load_sprite_sheet(build['source_path'], build['sprite_size'],
+                                        build['frames'], build['display_size'])
+        header_text, y_offset = SPINNER_LAYOUTS[layout]
+        bmp_pages = [image_to_pages(frame) for frame in compose_spinner_frames(
+            bmp_sprites, build['width'], build['height'], header_text, y_offset)]
+        bmp_ms = (time.perf_counter() - start) * 1000
+
+        identical = (len(pages) == len(bmp_pages)
+                     and all(bytes(a) == b for a, b in zip(pages, bmp_pages))
+                     and all(a.tobytes() == b.tobytes() for a, b in zip(sprites, bmp_sprites)))
+        print(f"{layout}: BMP path {bmp_ms:.1f} ms | mapped asset {mapped_ms:.2f} ms "
+              f"| {len(pages)} frames, identical: {identical}")
+
+    # A truncated asset is rejected for every layout, so the BMP fallback runs
+    truncated_path = os.path.join(os.path.dirname(asset_path), 'truncated.spr')
+    with open(asset_path, 'rb') as source, open(truncated_path, 'wb') as target:
+        target.write(source.read()[:size // 2])
+    rejected = all(load_compiled_spinner(layout, asset_path=truncated_path) is None
+                   for layout in SPINNER_LAYOUTS)
+    print(f"Truncated asset rejected: {rejected}")
+
+    # A changed build parameter makes the asset stale
+    ANIMATION_CONFIG['FRAMES'] += 1
+    print(f"Stale after config change: {load_compiled_spinner('exp1') is None}")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Virtual OLED Module
+Headless SSD1306 backend that records frames, with PNG/GIF export and simulated I2C timing
+"""
+
+import collections
+import os
+import sys
+import time
+
+import adafruit_ssd1306
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.hardware_config import OLED_CONFIG
+from modules.oled_display import FakeI2C
+from modules.page_canvas import pages_to_image
+
+# Argument bytes that follow each SSD1306 command (commands not listed take none)
+COMMAND_ARGS = {
+    0x20: 1,  # Memory addressing mode
+    0x21: 2,  # Column address window
+    0x22: 2,  # Page address window
+    0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5,  # Scroll setup
+    0x81: 1,  # Contrast
+    0x8D: 1,  # Charge pump
+    0xA3: 2,  # Vertical scroll area
+    0xA8: 1,  # Multiplex ratio
+    0xAD: 1,  # IREF select
+    0xD3: 1,  # Display offset
+    0xD5: 1,  # Clock divide
+    0xD9: 1,  # Precharge
+    0xDA: 1,  # COM pin configuration
+    0xDB: 1,  # VCOM deselect level
+}
+
+
+class VirtualPanelI2C(FakeI2C):
+    """
+    Fake I2C bus with an emulated SSD1306 controller behind it
+
+    Decodes the command and data bytes the driver sends, including the
+    column/page address windows used by PartialRefreshDisplay, into a copy
+    of the controller's display RAM. The RAM is what a real panel would
+    show, so recorded frames catch addressing mistakes as well.
+    """
+
+    def __init__(self, pages=8, address=0x3C, frequency=None):
+        """
+        Args:
+            pages (int): Display RAM pages (height // 8)
+            address (int): Device address reported by scan()
+            frequency (int): Simulated I2C clock in Hz (default none: no delay)
+        """
+        super().__init__(address, frequency)
+        self.pages = pages
+        self.gddram = bytearray(128 * pages)
+        self.powered = False
+        self.horizontal = True  # Horizontal addressing (the driver's default) vs page mode
+        self.col_window = (0, 127)
+        self.page_window = (0, pages - 1)
+        self.column = 0
+        self.page = 0
+        self.command = None  # Command still waiting for argument bytes
+        self.args = []
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        super().writeto(address, buffer, start=start, end=end)
+        end = len(buffer) if end is None else end
+        data = bytes(buffer[start:end])
+        if not data:
+            return
+        if data[0] == 0x40:
+            self._write_data(data[1:])
+        else:
+            # Command stream: 0x80 (or 0x00) control byte, then command/argument bytes
+            for byte in data[1:]:
+                self._command_byte(byte)
+
+    def _command_byte(self, byte):
+        if self.command is None:
+            self.command = byte
+            self.args = []
+        else:
+            self.args.append(byte)
+        if len(self.args) < COMMAND_ARGS.get(self.command, 0):
+            return
+
+        command, args = self.command, self.args
+        self.command = None
+        if command == 0x20:
+            self.horizontal = args[0] == 0x00
+        elif command == 0x21:
+            self.col_window = (args[0] & 0x7F, args[1] & 0x7F)
+            self.column = self.col_window[0]
+        elif command == 0x22:
+            self.page_window = (args[0] % self.pages, args[1] % self.pages)
+            self.page = self.page_window[0]
+        elif command in (0xAE, 0xAF):
+            self.powered = command == 0xAF
+        elif not self.horizontal and 0xB0 <= command <= 0xB7:
+            self.page = (command - 0xB0) % self.pages
+        elif not self.horizontal and command <= 0x0F:
+            self.column = (self.column & 0xF0) | command
+        elif not self.horizontal and 0x10 <= command <= 0x1F:
+            self.column = (self.column & 0x0F) | ((command & 0x0F) << 4)
+
+    def _write_data(self, data):
+        gddram = self.gddram
+        if not self.horizontal:
+            # Page mode: the column stops at the end of the page
+            count = min(len(data), 128 - self.column)
+            start = self.page * 128 + self.column
+            gddram[start:start + count] = data[:count]
+            self.column = min(self.column + count, 127)
+            return
+
+        first_col, last_col = self.col_window
+        first_page, last_page = self.page_window
+        while data:
+            # Copy up to the end of the window row, then wrap to the next page of the window
+            count = min(len(data), last_col - self.column + 1)
+            start = self.page * 128 + self.column
+            gddram[start:start + count] = data[:count]
+            data = data[count:]
+            self.column += count
+            if self.column > last_col:
+                self.column = first_col
+                self.page = first_page if self.page >= last_page else self.page + 1
+
+
+class VirtualOLED(adafruit_ssd1306.SSD1306_I2C):
+    """
+    SSD1306_I2C running on a virtual panel, for headless runs
+
+    The real driver does the drawing and sends its usual I2C traffic, so
+    everything built on it (PartialRefreshDisplay, DisplayPipeline, the
+    digit_display helpers) behaves exactly as on hardware. Every panel
+    update is recorded as (timestamp, page bytes) from the emulated display
+    RAM. Frames can be written out as PNG snapshots as they arrive, or saved
+    afterwards as PNGs or an animated GIF.
+    """
+
+    def __init__(self, width=128, height=64, frequency=None, max_frames=None,
+                 snapshot_dir=None):
+        """
+        Args:
+            width (int): Display width in pixels (default 128)
+            height (int): Display height in pixels (default 64)
+            frequency (int): Simulated I2C clock in Hz, None for full speed
+            max_frames (int): Recorded frames kept, oldest dropped first (default unbounded)
+            snapshot_dir (str): Write every recorded frame there as a PNG (default off)
+        """
+        self.bus = VirtualPanelI2C(pages=height // 8, frequency=frequency)
+        self.frames = collections.deque(maxlen=max_frames)
+        self.frame_count = 0
+        self.snapshot_dir = snapshot_dir
+        if snapshot_dir:
+            os.makedirs(snapshot_dir, exist_ok=True)
+        self.recording = False  # The driver's init sequence is not a frame
+        super().__init__(width, height, self.bus)
+        self.panel_col_offset = (128 - width) // 2 if width != 128 else 0
+        self.recording = True
+
+    def show(self):
+        """Send the framebuffer to the virtual panel and record the result."""
+        super().show()
+        self.refreshed()
+
+    def refreshed(self):
+        """Record what the panel shows now (PartialRefreshDisplay calls this after its windows)."""
+        if not self.recording:
+            return
+        frame = self.panel_frame()
+        self.frames.append((time.perf_counter(), frame))
+        self.frame_count += 1
+        if self.snapshot_dir:
+            path = os.path.join(self.snapshot_dir, f"frame_{self.frame_count:06d}.png")
+            pages_to_image(frame, self.width, self.height).save(path)
+
+    def panel_frame(self):
+        """
+        Get the visible part of the panel RAM
+
+        Returns:
+            bytes: width * height // 8 bytes in page order
+        """
+        gddram = self.bus.gddram
+        start = self.panel_col_offset
+        return b"".join(gddram[page * 128 + start:page * 128 + start + self.width]
+                        for page in range(self.height // 8))
+
+    def frame_image(self, index=-1):
+        """Recorded frame as a 1-bit PIL image (default the latest)."""
+        return pages_to_image(self.frames[index][1], self.width, self.height)
+
+    def save_png(self, path, index=-1, scale=1):
+        """Save one recorded frame as a PNG, optionally scaled up for viewing."""
+        image = self.frame_image(index)
+        if scale != 1:
+            image = image.resize((self.width * scale, self.height * scale))
+        image.save(path)
+
+    def save_gif(self, path, scale=2):
+        """
+        Save the recorded frames as an animated GIF with their real timing
+
+        Args:
+            path (str): Output file
+            scale (int): Pixel scale factor (default 2)
+
+        Returns:
+            int: Number of frames written
+        """
+        if not self.frames:
+            return 0
+        times = [stamp for stamp, _ in self.frames]
+        # GIF delays are in 10 ms steps, and most viewers clamp anything shorter than 20 ms
+        durations = [max(20, round((later - earlier) * 1000))
+                     for earlier, later in zip(times, times[1:])] + [1000]
+        size = (self.width * scale, self.height * scale)
+        images = [pages_to_image(frame, self.width, self.height).resize(size).convert("L")
+                  for _, frame in self.frames]
+        images[0].save(path, save_all=True, append_images=images[1:],
+                       duration=durations, loop=0)
+        return len(images)
+
+    def print_stats(self):
+        """Print recorded frames and bus traffic."""
+        bus = self.bus
+        print(f"🖥️  Virtual OLED: {self.frame_count} frames recorded, "
+              f"{bus.transactions} I2C transactions, {bus.bytes_written:,} bytes "
+              f"({bus.bus_time() * 1000:.0f} ms at 400 kHz)")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from PIL import Image
+
+    from modules.digit_display import show_exp_x_display
+    from modules.oled_display import PartialRefreshDisplay
+    from modules.digit_display import draw_large_digit, draw_plus_sign
+    from modules.page_canvas import PageCanvas, image_to_pages
+
+    WIDTH, HEIGHT = OLED_CONFIG['WIDTH'], OLED_CONFIG['HEIGHT']
+    output = tempfile.mkdtemp()
+    # Splash cache files from show_exp_x_display go to the temp dir, not the repo's assets
+    OLED_CONFIG['SPLASH_CACHE_DIR'] = os.path.join(output, 'splash')
+
+    def equation_screens(display, count):
+        """exp2's equation screen, one digit changing per frame: partial windows."""
+        canvas = PageCanvas(WIDTH, HEIGHT)
+        expected = []
+        for i in range(count):
+            draw = canvas.begin()
+            draw_large_digit(draw, i % 10, 31, 20, size=4)
+            draw_plus_sign(draw, 53, 26, size=4)
+            draw_large_digit(draw, 7, 71, 20, size=4)
+            display.frame(canvas.buffer)
+            display.show()
+            expected.append(bytes(canvas.buffer))
+        return expected
+
+    # Panel contents must match every frame, through partial windows and full refreshes
+    oled = VirtualOLED(WIDTH, HEIGHT)
+    display = PartialRefreshDisplay(oled)
+    show_exp_x_display(display, 2, WIDTH, HEIGHT)
+    expected = [bytes(oled.buffer[1:])] + equation_screens(display, 30)
+    noise = Image.frombytes("1", (WIDTH, HEIGHT), os.urandom(WIDTH * HEIGHT // 8))
+    display.image(noise)
+    display.show()
+    expected.append(image_to_pages(noise))
+    recorded = [frame for _, frame in oled.frames]
+    print(f"Recorded {len(recorded)} frames, panel matches framebuffer: {recorded == expected}")
+
+    # Render + refresh rate at full speed vs simulated 400 kHz / 1 MHz buses
+    for frequency in (None, 400000, 1000000):
+        oled = VirtualOLED(WIDTH, HEIGHT, frequency=frequency)
+        display = PartialRefreshDisplay(oled)
+        start = time.perf_counter()
+        equation_screens(display, 200)
+        elapsed = time.perf_counter() - start
+        label = f"{frequency // 1000} kHz" if frequency else "full speed"
+        print(f"{label:>10}: {oled.frame_count} frames in {elapsed * 1000:.0f} ms "
+              f"({oled.frame_count / elapsed:,.0f} FPS)")
+
+    gif_path = os.path.join(output, 'equation.gif')
+    png_path = os.path.join(output, 'last.png')
+    count = oled.save_gif(gif_path)
+    oled.save_png(png_path, scale=4)
+    print(f"Saved {count}-frame GIF to {gif_path} and a snapshot to {png_path}")
+    oled.print_stats()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Virtual Strip Module
+Headless Adafruit_NeoPixel stand-in that records every frame, with simulated WS2812B timing
+"""
+
+import collections
+import ctypes
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.led_strip import RESET_TIME
+
+
+class VirtualStrip:
+    """
+    Adafruit_NeoPixel with the LEDs replaced by a recording
+
+    Takes the same constructor arguments and offers the same calls as
+    rpi_ws281x's strip (begin, numPixels, setPixelColor, getPixelColor,
+    setBrightness, show), so LEDStrip, the LED engine and the experiments
+    run on it unchanged. Every show() is recorded as (timestamp, frame),
+    with the frame as the strip would receive it: a copy of the LED array
+    with the driver brightness applied.
+
+    With simulate_timing, show() behaves like ws2811_render(): it first
+    waits for the previous frame's transfer (24 bits per LED at freq_hz,
+    plus the reset latch) to finish, then returns while the new one is
+    "on the wire". Pacing and throughput measured on a PC then match the
+    strip's limits.
+    """
+
+    def __init__(self, num, pin=18, freq_hz=800000, dma=10, invert=False, brightness=255,
+                 channel=0, strip_type=None, gamma=None, simulate_timing=False, max_frames=None):
+        """
+        Args:
+            num (int): Number of LEDs
+            pin, dma, invert, channel, strip_type, gamma: Accepted like
+                Adafruit_NeoPixel, and kept for reference
+            freq_hz (int): Data rate, used for the simulated transfer time
+            brightness (int): Driver brightness 0-255 (default 255)
+            simulate_timing (bool): Block show() like a real transfer (default False)
+            max_frames (int): Recorded frames kept, oldest dropped first (default unbounded)
+        """
+        self.num = num
+        self.pin = pin
+        self.freq_hz = freq_hz
+        self.channel = channel
+        self.brightness = brightness
+        self.leds = (ctypes.c_uint32 * num)()
+        self.colors = np.frombuffer(self.leds, dtype=np.uint32)
+        self.simulate_timing = simulate_timing
+        self.transfer_time = num * 24 / freq_hz + RESET_TIME
+        self.busy_until = 0.0
+        self.frames = collections.deque(maxlen=max_frames)
+        self.begun = False
+        self.stats = {'shows': 0, 'wait_time': 0.0}
+
+    def begin(self):
+        self.begun = True
+
+    def numPixels(self):
+        return self.num
+
+    def setPixelColor(self, n, color):
+        self.leds[n] = color
+
+    def setPixelColorRGB(self, n, red, green, blue, white=0):
+        self.leds[n] = (white << 24) | (red << 16) | (green << 8) | blue
+
+    def getPixelColor(self, n):
+        return self.leds[n]
+
+    def getPixels(self):
+        return self.leds
+
+    def setBrightness(self, brightness):
+        self.brightness = brightness
+
+    def getBrightness(self):
+        return self.brightness
+
+    def buffer_address(self):
+        """Address of the LED array, for LEDStrip's bulk writes."""
+        return ctypes.addressof(self.leds)
+
+    def show(self):
+        """Record the frame; with simulated timing, wait out the previous transfer first."""
+        if not self.begun:
+            raise RuntimeError("VirtualStrip.show() called before begin()")
+        now = time.perf_counter()
+        if self.simulate_timing and now < self.busy_until:
+            time.sleep(self.busy_until - now)
+            self.stats['wait_time'] += time.perf_counter() - now
+            now = time.perf_counter()
+        self.busy_until = now + self.transfer_time
+        self.frames.append((now, self.wire_frame()))
+        self.stats['shows'] += 1
+
+    def wire_frame(self):
+        """
+        LED colors as sent, with the driver brightness applied like rpi_ws281x does
+
+        Returns:
+            ndarray: num uint32 Color() values
+        """
+        if self.brightness == 255:
+            return self.colors.copy()
+        scale = self.brightness + 1
+        channels = self.colors.view(np.uint8).astype(np.uint16)
+        return ((channels * scale) >> 8).astype(np.uint8).view(np.uint32)
+
+    def frame_times(self):
+        """Timestamps of the recorded frames (perf_counter seconds)."""
+        return np.array([stamp for stamp, _ in self.frames])
+
+    def frame_intervals(self):
+        """Seconds between consecutive recorded frames."""
+        return np.diff(self.frame_times())
+
+    def last_frame(self):
+        """Most recent recorded frame (None before the first show())."""
+        return self.frames[-1][1] if self.frames else None
+
+    def save_timeline(self, path, scale=4):
+        """
+        Save the recording as an image: one row per frame, one column per LED
+
+        Args:
+            path (str): Output file (PNG)
+            scale (int): Pixel scale factor (default 4)
+
+        Returns:
+            int: Number of frames written
+        """
+        from PIL import Image
+
+        if not self.frames:
+            return 0
+        colors = np.stack([frame for _, frame in self.frames])
+        rgb = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=-1)
+        image = Image.fromarray(rgb.astype(np.uint8), "RGB")
+        image.resize((image.width * scale, image.height * scale), Image.NEAREST).save(path)
+        return len(self.frames)
+
+    def print_stats(self):
+        """Print recorded frames, frame rate and time spent waiting on the simulated wire."""
+        shows = self.stats['shows']
+        intervals = self.frame_intervals()
+        rate = 1.0 / intervals.mean() if len(intervals) else 0.0
+        print(f"💡 Virtual strip (channel {self.channel}, {self.num} LEDs): {shows} frames recorded, "
+              f"{rate:.1f} FPS average, {self.stats['wait_time'] * 1000:.0f} ms waiting on transfers")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from modules.led_engine import LEDEngine
+    from modules.led_frames import BLUE
+    from modules.led_strip import LEDStrip
+
+    # Correctness: what reached the strip, frame by frame
+    driver = VirtualStrip(60, brightness=128)
+    strip = LEDStrip(driver)
+    strip.begin()
+    strip.fill(BLUE)
+    print(f"Driver brightness 128 applied to recorded frames: {driver.last_frame()[0] == 0x000080}")
+
+    # Pacing: the engine's 20 FPS wave as the strip receives it
+    driver = VirtualStrip(60)
+    strip = LEDStrip(driver)
+    strip.begin()
+    engine = LEDEngine(strip)
+    engine.start()
+    engine.play('wave')
+    time.sleep(1.0)
+    engine.shutdown(clear=False)
+    intervals = driver.frame_intervals()[1:] * 1000
+    print(f"Wave pacing: {len(intervals) + 1} frames, interval {intervals.mean():.1f} ms "
+          f"(min {intervals.min():.1f}, max {intervals.max():.1f}, target 50.0)")
+
+    # Throughput: back-to-back shows with the WS2812B transfer simulated
+    print("Back-to-back show() rate with simulated transfer time:")
+    for count in (60, 300, 1200):
+        driver = VirtualStrip(count, simulate_timing=True)
+        driver.begin()
+        start = time.perf_counter()
+        for step in range(100):
+            driver.setPixelColor(step % count, 0xFF0000)
+            driver.show()
+        elapsed = time.perf_counter() - start
+        print(f"  {count:>5} LEDs: {100 / elapsed:6.0f} FPS (wire limit {1 / driver.transfer_time:6.0f})")
+
+    path = os.path.join(tempfile.mkdtemp(), 'timeline.png')
+    print(f"Saved {driver.save_timeline(path)}-frame timeline to {path}")
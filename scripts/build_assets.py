@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Build Assets Script
+Compiles the atom sprite sheet into the memory-mapped animation asset
+"""
+
+import os
+import sys
+
+# Run from the project root so the configured asset paths resolve
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_DIR)
+os.chdir(PROJECT_DIR)
+
+from modules.hardware_config import ANIMATION_CONFIG
+from modules.sprite_assets import build_sprite_asset
+
+if __name__ == "__main__":
+    size = build_sprite_asset()
+    print(f"✅ Built {ANIMATION_CONFIG['ATOM_ASSET_PATH']} ({size:,} bytes) "
+          f"from {ANIMATION_CONFIG['ATOM_ICON_PATH']}")
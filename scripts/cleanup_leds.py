@@ -12,27 +12,18 @@ def cleanup_leds():
     """Turn off all LEDs and clean up GPIO."""
     try:
         import RPi.GPIO as GPIO
-        from rpi_ws281x import *
+        
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        from modules.led_layout import create_layout
         
         print("🧹 Cleaning up LEDs and GPIO...")
         
-        # LED Strip Configuration
-        LED_COUNT = 60
-        LED_PIN = 18
-        LED_FREQ_HZ = 800000
-        LED_DMA = 10
-        LED_BRIGHTNESS = 200
-        LED_INVERT = False
-        LED_CHANNEL = 0
-        
-        # Initialize LED strip
-        strip = Adafruit_NeoPixel(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
-        strip.begin()
-        
-        # Turn off all LEDs
-        for i in range(strip.numPixels()):
-            strip.setPixelColor(i, Color(0, 0, 0))
-        strip.show()
+        # Initialize every configured LED strip (hardware_config.LED_CONFIG)
+        leds = create_layout()
+        leds.begin()
+        
+        # Turn off all LEDs (one bulk buffer write per strip)
+        leds.fill(0)
         
         print("✅ All LEDs turned off")
         
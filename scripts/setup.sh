@@ -84,6 +84,13 @@ main() {
         exit 1
     fi
     
+    # Compile the sprite sheet into the memory-mapped animation asset
+    print_status "🎞️  Building animation assets..."
+    ./venv/bin/python scripts/build_assets.py
+    if [ $? -ne 0 ]; then
+        print_warning "Asset build failed. Experiments will load the sprite sheet directly."
+    fi
+    
     # Show final status
     print_status "📊 Final Status:"
     echo "  • Virtual environment: $(pwd)/venv"